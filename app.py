@@ -1,15 +1,26 @@
 import dash
 import dash_bootstrap_components as dbc
 from dash import html
+from metrics import instrument
+from profiling import profiling
+from static import cache_headers
 from styles import NAV_LINK_STYLE
+from url_state import routes
 
+# Cada página define su layout como función: se construye al visitarla y no
+# al arrancar, y los módulos pesados (SciPy) se importan en el primer uso.
 app = dash.Dash(
     __name__,
     use_pages=True,
     external_stylesheets=[dbc.themes.LUX],
-    suppress_callback_exceptions=True
+    suppress_callback_exceptions=True,
+    compress=True
 )
 server = app.server
+instrument(server)
+profiling(server)
+cache_headers(server)
+routes(server)
 
 header = html.Div([
     html.Div(
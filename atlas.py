@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Atlas precalculado de trayectorias de Lotka-Volterra para la página 07.
+#
+# Con τ = αt, u = δx/γ y v = βy/α el sistema queda
+#
+#     du/dτ = u (1 - v),   dv/dτ = ρ v (u - 1),   ρ = γ/α
+#
+# así que la trayectoria solo depende de (ρ, u₀, v₀): las cuatro tasas y las
+# dos condiciones iniciales se reducen a tres números, y t, x, y se recuperan
+# escalando. Las órbitas son cerradas, de periodo T(ρ, u₀, v₀): basta guardar
+# un periodo, muestreado en PHASES fases equiespaciadas, para cualquier tₘₐₓ.
+#
+# `python atlas.py` integra offline una rejilla en (ln ρ, ln u₀, ln v₀) y la
+# guarda en ATLAS_DIR como arreglos .npy que load() abre con mmap: los workers
+# comparten las páginas a través de la caché del sistema operativo y cada
+# consulta solo lee el bloque de 4 × 4 × 4 órbitas alrededor del punto. Sin el
+# directorio, lookup() devuelve None y la página integra como siempre.
+#
+# La consulta interpola ln u y ln v (suaves incluso en órbitas grandes) con
+# Lagrange cúbico en cada eje y en la fase. Estimación de error, en ln x y ln y
+# (≈ error relativo de x e y):
+#
+# * la construcción integra también el centro de cada celda y guarda el error
+#   de la interpolación allí (el máximo del polinomio de error en la celda) y
+#   el error relativo del periodo;
+# * el error del periodo desplaza la fase τ ΔT / T² al llegar a τ = α tₘₐₓ:
+#   se multiplica por la velocidad máxima sobre la órbita.
+#
+# Si la suma, por SAFETY, supera la tolerancia o el punto cae fuera de la
+# rejilla, lookup() devuelve None y la página vuelve a solve_ivp.
+#
+# El atlas sustituye a una integración concreta, la de la página con
+# SOLVER_OPTIONS, y atlas.json guarda esas opciones: si quien consulta pide
+# otras (los benchmarks las endurecen), lookup() también devuelve None.
+
+ATLAS_DIR = os.environ.get('ATLAS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'atlas'))
+
+# Caja alrededor de los valores por defecto (α = 1, β = 0.1, γ = 1.5, δ = 0.075,
+# x₀ = 40, y₀ = 9: ρ = 1.5, u₀ = 2, v₀ = 0.9). Con un número impar de nodos en
+# u₀ y v₀ el equilibrio (1, 1) es un nodo
+RHO_RANGE = (0.5, 4.0)
+U_RANGE = (1 / 3, 3.0)
+V_RANGE = (1 / 3, 3.0)
+NODES = (17, 19, 19)
+PHASES = 256
+
+# 0,1 % en x e y: invisible en las gráficas. Con esta rejilla el error real
+# mediano ronda 1e-4 y la estimación queda entre 1,5 y 10 veces por encima
+TOLERANCE = 1e-3
+SAFETY = 2.0
+
+BUILD_OPTIONS = {'method': 'DOP853', 'rtol': 1e-11, 'atol': 1e-12}
+# Las de pages/07_modelo_depredador-presa.py
+SOLVER_OPTIONS = {'method': 'RK45', 'rtol': 1e-6}
+
+_atlas = None
+_atlas_lock = threading.Lock()
+
+
+def orbit(rho, p0, q0, phases=PHASES):
+    # Un periodo del sistema adimensional en (p, q) = (ln u, ln v), muestreado
+    # en fases k / phases. El periodo se detecta con el ángulo acumulado
+    # alrededor del equilibrio (0, 0), que crece de forma monótona: las órbitas
+    # son curvas de nivel convexas de H = ρ (e^p - p) + e^q - q
+    from scipy.integrate import solve_ivp
+
+    if p0 == 0 and q0 == 0:
+        return 2 * np.pi / np.sqrt(rho), np.zeros((2, phases))
+
+    def fun(t, z):
+        p, q, _ = z
+        dp = -np.expm1(q)
+        dq = rho * np.expm1(p)
+        return [dp, dq, (p * dq - q * dp) / (p * p + q * q)]
+
+    def turn(t, z):
+        return z[2] - 2 * np.pi
+
+    turn.terminal = True
+    turn.direction = 1
+    solution = solve_ivp(fun, [0, 1e4], [p0, q0, 0.0], dense_output=True, events=turn, **BUILD_OPTIONS)
+    period = solution.t_events[0][0]
+    return period, solution.sol(np.arange(phases) * period / phases)[:2]
+
+
+def _lagrange(x):
+    # Pesos de Lagrange en los nodos 0, 1, 2, 3 para la posición x: (4,) + x.shape
+    return np.stack([
+        np.prod([(x - m) / (k - m) for m in range(4) if m != k], axis=0) for k in range(4)
+    ])
+
+
+def _phase(z, s):
+    # z: (2, P) en fases k / P de una órbita cerrada; s: fases en [0, 1)
+    phases = z.shape[1]
+    position = s * phases
+    index = np.floor(position).astype(int)
+    weights = _lagrange(position - index + 1)
+    stencil = (index[None, :] + np.arange(-1, 3)[:, None]) % phases
+    return np.einsum('kn,ckn->cn', weights, z[:, stencil])
+
+
+def _axes(meta):
+    low = np.log([meta['rho'][0], meta['u'][0], meta['v'][0]])
+    high = np.log([meta['rho'][1], meta['u'][1], meta['v'][1]])
+    nodes = np.array(meta['nodes'])
+    return low, (high - low) / (nodes - 1), nodes
+
+
+def _interpolate(orbits, periods, low, step, nodes, point):
+    # Órbita (2, P) y periodo en `point` = (ln ρ, ln u₀, ln v₀); None fuera de
+    # la rejilla. En los bordes el bloque de 4 nodos se desplaza hacia dentro
+    position = (point - low) / step
+    if np.any(position < -1e-9) or np.any(position > nodes - 1 + 1e-9):
+        return None
+    position = np.clip(position, 0, nodes - 1)
+    cell = np.minimum(position.astype(int), nodes - 2)
+    start = np.clip(cell - 1, 0, nodes - 4)
+    weights = [_lagrange(x) for x in position - start]
+    block = tuple(slice(s, s + 4) for s in start)
+    z = np.einsum('a,b,c,abcij->ij', *weights, orbits[block].astype(float))
+    period = float(np.einsum('a,b,c,abc->', *weights, periods[block]))
+    return z, period, tuple(cell)
+
+
+class Orbit:
+    # Misma interfaz que simulation.Trajectory para la página: x(t), sample()
+    def __init__(self, z, period, alpha, scale, t_max, error):
+        self.success = True
+        self.message = 'Interpolado del atlas'
+        self.shape = (2,)
+        self.t = np.array([0.0, t_max])
+        self.t_max = t_max
+        self.error = error
+        self._z = z
+        self._period = period
+        self._alpha = alpha
+        self._scale = np.asarray(scale, dtype=float)
+
+    def __call__(self, t):
+        t = np.clip(np.asarray(t, dtype=float), self.t[0], self.t_max)
+        phase = np.mod(self._alpha * t.ravel() / self._period, 1.0)
+        values = self._scale[:, None] * np.exp(_phase(self._z, phase))
+        return values.reshape(self.shape + t.shape)
+
+    def sample(self, n_points, t_start=None, t_end=None):
+        t = np.linspace(self.t[0] if t_start is None else t_start, self.t_max if t_end is None else t_end, n_points)
+        return t, self(t)
+
+
+class Atlas:
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'atlas.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.low, self.step, self.nodes = _axes(self.meta)
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+            for name in ('orbits', 'periods', 'cell_error', 'cell_period_error')
+        }
+        self.orbits = arrays['orbits']
+        self.periods = arrays['periods']
+        self.cell_error = arrays['cell_error']
+        self.cell_period_error = arrays['cell_period_error']
+
+    def query(self, x0, y0, alpha, beta, gamma, delta, t_max):
+        point = np.log([gamma / alpha, delta * x0 / gamma, beta * y0 / alpha])
+        found = _interpolate(self.orbits, self.periods, self.low, self.step, self.nodes, point)
+        if found is None:
+            return None
+        z, period, cell = found
+        speed = np.abs(np.diff(z, axis=1, append=z[:, :1])).max() * z.shape[1]
+        drift = alpha * t_max / period * float(self.cell_period_error[cell]) * speed
+        error = SAFETY * (float(self.cell_error[cell]) + drift)
+        return Orbit(z, period, alpha, (gamma / delta, alpha / beta), t_max, error)
+
+
+def load(directory=None):
+    # Una vez por proceso; si falta el atlas no se vuelve a intentar. Abierto
+    # antes del fork (prefork.warm_up), el mapeo se hereda tal cual
+    global _atlas
+    with _atlas_lock:
+        if _atlas is None:
+            try:
+                _atlas = Atlas(directory or ATLAS_DIR)
+            except (OSError, ValueError, KeyError):
+                _atlas = False
+        return _atlas or None
+
+
+def lookup(x0, y0, alpha, beta, gamma, delta, t_max, solver_options, tolerance=TOLERANCE):
+    atlas = load()
+    if atlas is None or solver_options != atlas.meta.get('solver_options'):
+        return None
+    trajectory = atlas.query(x0, y0, alpha, beta, gamma, delta, t_max)
+    if trajectory is None or trajectory.error > tolerance:
+        return None
+    return trajectory
+
+
+# --- Construcción (offline) ---
+
+def _grid(meta):
+    low, step, nodes = _axes(meta)
+    return [low[i] + step[i] * np.arange(nodes[i]) for i in range(3)]
+
+
+def _build_nodes(meta, i):
+    # Todas las órbitas con el i-ésimo ρ
+    log_rho, log_u, log_v = _grid(meta)
+    shape = (len(log_u), len(log_v))
+    periods = np.empty(shape)
+    orbits = np.empty(shape + (2, meta['phases']), dtype=np.float32)
+    for j, p0 in enumerate(log_u):
+        for k, q0 in enumerate(log_v):
+            periods[j, k], orbits[j, k] = orbit(np.exp(log_rho[i]), p0, q0, meta['phases'])
+    return periods, orbits
+
+
+def _build_cells(meta, directory, i):
+    # Error de la interpolación en el centro de cada celda con el i-ésimo ρ,
+    # en las fases intermedias (k + 1/2) / P, las peores para la fase
+    low, step, nodes = _axes(meta)
+    orbits = np.load(os.path.join(directory, 'orbits.npy'), mmap_mode='r')
+    periods = np.load(os.path.join(directory, 'periods.npy'), mmap_mode='r')
+    phases = meta['phases']
+    middle = (np.arange(phases) + 0.5) / phases
+    shape = tuple(nodes[1:] - 1)
+    error = np.empty(shape)
+    period_error = np.empty(shape)
+    for j in range(shape[0]):
+        for k in range(shape[1]):
+            point = low + step * (np.array([i, j, k]) + 0.5)
+            z, period, _ = _interpolate(orbits, periods, low, step, nodes, point)
+            true_period, true_z = orbit(np.exp(point[0]), point[1], point[2], 2 * phases)
+            error[j, k] = np.abs(_phase(z, middle) - true_z[:, 1::2]).max()
+            period_error[j, k] = abs(period - true_period) / true_period
+    return error, period_error
+
+
+def build(directory=ATLAS_DIR, workers=None):
+    meta = {
+        'rho': list(RHO_RANGE), 'u': list(U_RANGE), 'v': list(V_RANGE),
+        'nodes': list(NODES), 'phases': PHASES, 'options': BUILD_OPTIONS,
+        'solver_options': SOLVER_OPTIONS,
+    }
+    os.makedirs(directory, exist_ok=True)
+    # Sin atlas.json el directorio no se considera válido: se escribe al final
+    meta_path = os.path.join(directory, 'atlas.json')
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    n_rho, n_u, n_v = NODES
+    orbits = np.lib.format.open_memmap(
+        os.path.join(directory, 'orbits.npy'), mode='w+', dtype=np.float32, shape=(n_rho, n_u, n_v, 2, PHASES)
+    )
+    periods = np.lib.format.open_memmap(
+        os.path.join(directory, 'periods.npy'), mode='w+', dtype=float, shape=(n_rho, n_u, n_v)
+    )
+    cell_error = np.empty((n_rho - 1, n_u - 1, n_v - 1))
+    cell_period_error = np.empty_like(cell_error)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, (slice_periods, slice_orbits) in enumerate(pool.map(_build_nodes, [meta] * n_rho, range(n_rho))):
+            periods[i], orbits[i] = slice_periods, slice_orbits
+        orbits.flush()
+        periods.flush()
+        del orbits, periods
+        cells = pool.map(_build_cells, [meta] * (n_rho - 1), [directory] * (n_rho - 1), range(n_rho - 1))
+        for i, (error, period_error) in enumerate(cells):
+            cell_error[i], cell_period_error[i] = error, period_error
+
+    np.save(os.path.join(directory, 'cell_error.npy'), cell_error)
+    np.save(os.path.join(directory, 'cell_period_error.npy'), cell_period_error)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return cell_error, cell_period_error
+
+
+def check(samples, seed=0):
+    # Puntos al azar en la caja: error estimado frente al real (solve_ivp con
+    # tolerancias estrictas), en ln x y ln y
+    from simulation import integrate
+
+    rng = np.random.default_rng(seed)
+    atlas = load()
+    rows = []
+    for _ in range(samples):
+        alpha = rng.uniform(0.7, 1.4)
+        beta, delta = rng.uniform(0.06, 0.14), rng.uniform(0.05, 0.1)
+        gamma = alpha * np.exp(rng.uniform(*np.log(RHO_RANGE)))
+        x0 = gamma / delta * np.exp(rng.uniform(*np.log(U_RANGE)))
+        y0 = alpha / beta * np.exp(rng.uniform(*np.log(V_RANGE)))
+        t_max = rng.uniform(5, 60)
+        approx = atlas.query(x0, y0, alpha, beta, gamma, delta, t_max)
+        exact = integrate('lotka_volterra', [x0, y0], t_max, (alpha, beta, gamma, delta), method='DOP853', rtol=1e-11, atol=1e-12)
+        t = np.linspace(0, t_max, 500)
+        actual = np.abs(np.log(approx(t)) - np.log(exact(t))).max()
+        rows.append((approx.error, actual))
+    return np.array(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Construye el atlas de trayectorias de Lotka-Volterra.')
+    parser.add_argument('--dir', default=ATLAS_DIR, help='directorio de salida')
+    parser.add_argument('--workers', type=int, default=None, help='procesos (por defecto, uno por núcleo)')
+    parser.add_argument('--check', type=int, default=0, metavar='N',
+                        help='compara después el error estimado con el real en N puntos al azar')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    cell_error, cell_period_error = build(args.dir, args.workers)
+    size = sum(os.path.getsize(os.path.join(args.dir, name)) for name in os.listdir(args.dir))
+    print(f'Atlas en {args.dir}: {np.prod(NODES)} órbitas, {size / 1e6:.1f} MB, '
+          f'{time.perf_counter() - start:.0f} s')
+    print(f'Error de interpolación por celda: mediana {np.median(cell_error):.2g}, máximo {cell_error.max():.2g}; '
+          f'periodo: máximo {cell_period_error.max():.2g}')
+
+    if args.check:
+        load(args.dir)
+        rows = check(args.check)
+        answered = rows[:, 0] <= TOLERANCE
+        print(f'{answered.sum()} de {len(rows)} consultas con error estimado <= {TOLERANCE:g}; '
+              f'error real máximo entre ellas {rows[answered, 1].max(initial=0):.2g}; '
+              f'estimado < real en {(rows[:, 0] < rows[:, 1]).sum()}')
+
+
+if __name__ == '__main__':
+    main()
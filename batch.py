@@ -0,0 +1,350 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from kernels import log_exponential, log_gompertz, log_logistic, log_richards, to_linear
+from stability import MODELS
+
+# Ejecución por lotes de escenarios, sin Dash ni Plotly: los mismos núcleos que
+# las páginas (kernels para las soluciones cerradas, simulation.integrate para
+# las EDOs) sobre un pool de procesos, con resultados en Parquet.
+#
+#     python batch.py escenarios.jsonl -o resultados/ [--workers 4] [--chunk-size 50]
+#
+# Cada escenario es un objeto JSON (una línea en .jsonl, o una lista en .json):
+#
+#     {"id": "lv-base", "model": "lotka_volterra", "z0": [40, 9], "t_max": 15,
+#      "params": {"alpha": 1.0, "beta": 0.1, "gamma": 1.5, "delta": 0.075},
+#      "n_points": 200, "options": {"rtol": 1e-8}}
+#
+# `model` es una clave de stability.MODELS y `params` lleva sus parámetros por
+# nombre; `z0` es el estado inicial (P₀ en los modelos de crecimiento).
+# `n_points` y `options` (del integrador) son opcionales.
+#
+# Los escenarios se reparten en bloques; cada bloque es una tarea del pool y
+# escribe sus dos archivos en el directorio de salida:
+#
+# * trajectories/part-NNNNN.parquet: formato largo (scenario, model, t,
+#   variable, value);
+# * summary/part-NNNNN.parquet: una fila por escenario con el estado (ok o
+#   failed), el mensaje, el estado final, los eventos y la duración.
+#
+# manifest.json registra los bloques terminados. Si el proceso se interrumpe o
+# un worker muere, volver a lanzar la misma orden retoma solo los bloques que
+# faltan, y también los del manifiesto a los que les falta alguno de sus dos
+# archivos (borrados a mano, por ejemplo); un escenario inválido o cuya integración falla queda como failed en
+# el resumen sin detener su bloque. pyarrow se importa solo al escribir.
+
+# Las mismas tolerancias que las páginas de cada modelo
+SOLVER_OPTIONS = {
+    'lotka_volterra': {'method': 'RK45', 'rtol': 1e-6},
+    'competencia': {'method': 'LSODA', 'rtol': 1e-6},
+    'allee': {'method': 'LSODA', 'rtol': 1e-6},
+}
+
+CLOSED_FORM = {
+    'exponencial': log_exponential,
+    'logistico': log_logistic,
+    'gompertz': log_gompertz,
+    'richards': log_richards,
+}
+
+VARIABLES = {
+    'exponencial': ('P',),
+    'logistico': ('P',),
+    'gompertz': ('P',),
+    'richards': ('P',),
+    'lotka_volterra': ('x', 'y'),
+    'competencia': ('n1', 'n2'),
+    'allee': ('N',),
+}
+
+CHUNK_SIZE = 50
+N_POINTS = 200
+MANIFEST = 'manifest.json'
+
+
+def load_scenarios(path):
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            scenarios = [json.loads(line) for line in f if line.strip()]
+        else:
+            scenarios = json.load(f)
+    if isinstance(scenarios, dict):
+        scenarios = scenarios['scenarios']
+    for index, scenario in enumerate(scenarios):
+        scenario.setdefault('id', str(index))
+    ids = [str(scenario['id']) for scenario in scenarios]
+    if len(set(ids)) != len(ids):
+        raise ValueError('Los id de los escenarios deben ser únicos')
+    return scenarios
+
+
+def validate(scenario, n_points=N_POINTS):
+    # Escenario normalizado, o ValueError con el motivo
+    model = scenario.get('model')
+    if model not in VARIABLES:
+        raise ValueError(f"Modelo desconocido: {model!r}")
+    names = MODELS[model]['params']
+    params = scenario.get('params') or {}
+    missing = [name for name in names if name not in params]
+    if missing:
+        raise ValueError(f"Faltan parámetros: {', '.join(missing)}")
+    values = [float(params[name]) for name in names]
+    z0 = [float(v) for v in np.atleast_1d(scenario.get('z0', []))]
+    if len(z0) != len(VARIABLES[model]):
+        raise ValueError(f"z0 debe tener {len(VARIABLES[model])} valores")
+    t_max = float(scenario.get('t_max', 0))
+    points = int(scenario.get('n_points', n_points))
+
+    # Las mismas condiciones que validan las páginas
+    positive = z0 + [t_max] + [v for name, v in zip(names, values) if name not in ('alpha12', 'alpha21')]
+    if not all(np.isfinite(positive)) or min(positive) <= 0:
+        raise ValueError('Estado inicial, t_max y parámetros deben ser > 0')
+    if model == 'competencia' and min(values[4:]) < 0:
+        raise ValueError('Los coeficientes de competencia deben ser ≥ 0')
+    if model == 'allee' and values[1] >= values[2]:
+        raise ValueError('El umbral a debe ser menor que la capacidad de carga k')
+    if points < 2:
+        raise ValueError('n_points debe ser ≥ 2')
+
+    options = dict(SOLVER_OPTIONS.get(model, {}), **(scenario.get('options') or {}))
+    return {
+        'id': str(scenario['id']), 'model': model, 'params': tuple(values), 'z0': z0,
+        't_max': t_max, 'n_points': points, 'options': options,
+    }
+
+
+def _closed_form(group):
+    # Escenarios del mismo modelo y n_points en una sola evaluación del núcleo:
+    # una fila por escenario, una columna por instante
+    model = group[0]['model']
+    columns = np.array([[s['z0'][0], *s['params']] for s in group]).T[..., None]
+    t = np.linspace(0, 1, group[0]['n_points'])[None, :] * np.array([s['t_max'] for s in group])[:, None]
+    values = to_linear(CLOSED_FORM[model](*columns, t))
+    return [(t[i], values[i][None, :], {}, '') for i in range(len(group))]
+
+
+def _ode(scenario):
+    from simulation import integrate
+
+    events = tuple(MODELS[scenario['model']].get('events', ()))
+    trajectory = integrate(
+        scenario['model'], scenario['z0'], scenario['t_max'], scenario['params'],
+        events=events, **scenario['options']
+    )
+    if not trajectory.success:
+        raise RuntimeError(trajectory.message)
+    t, values = trajectory.sample(scenario['n_points'])
+    crossings = {
+        name: float(times[0]) for name, (times, _) in trajectory.events.items() if times.size
+    }
+    return t, values, crossings, trajectory.message
+
+
+def run_chunk(index, scenarios, directory, n_points=N_POINTS):
+    start = time.perf_counter()
+    results = {}
+    valid = []
+    for scenario in scenarios:
+        try:
+            valid.append(validate(scenario, n_points))
+        except (ValueError, TypeError) as e:
+            results[str(scenario.get('id'))] = (scenario.get('model'), None, e, 0.0)
+
+    groups = {}
+    for scenario in valid:
+        if scenario['model'] in CLOSED_FORM:
+            groups.setdefault((scenario['model'], scenario['n_points']), []).append(scenario)
+        else:
+            began = time.perf_counter()
+            try:
+                outcome = _ode(scenario)
+            except Exception as e:
+                outcome = e
+            results[scenario['id']] = (scenario['model'], scenario, outcome, time.perf_counter() - began)
+    for group in groups.values():
+        began = time.perf_counter()
+        outcomes = _closed_form(group)
+        elapsed = (time.perf_counter() - began) / len(group)
+        for scenario, outcome in zip(group, outcomes):
+            results[scenario['id']] = (scenario['model'], scenario, outcome, elapsed)
+
+    # En el orden del archivo de escenarios
+    order = [str(scenario.get('id')) for scenario in scenarios]
+    rows = write_chunk(directory, index, [(key,) + results[key] for key in order])
+    failed = sum(isinstance(results[key][2], Exception) for key in order)
+    return {
+        'index': index, 'scenarios': len(scenarios), 'failed': failed,
+        'rows': rows, 'seconds': time.perf_counter() - start,
+    }
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit('Escribir Parquet requiere pyarrow: pip install pyarrow')
+    return pyarrow, pyarrow.parquet
+
+
+def _write_table(pa, pq, columns, path):
+    # Se escribe aparte y se renombra: un bloque interrumpido no deja un archivo a medias
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pq.write_table(pa.table(columns), path + '.tmp')
+    os.replace(path + '.tmp', path)
+
+
+def _part(index):
+    return f'part-{index:05d}.parquet'
+
+
+def write_chunk(directory, index, results):
+    pa, pq = _parquet()
+    trajectories = {'scenario': [], 'model': [], 't': [], 'variable': [], 'value': []}
+    summary = {
+        'scenario': [], 'model': [], 'status': [], 'message': [],
+        'final': [], 'events': [], 'duration_s': [],
+    }
+    for scenario_id, model, scenario, outcome, seconds in results:
+        failed = isinstance(outcome, Exception)
+        summary['scenario'].append(scenario_id)
+        summary['model'].append(model)
+        summary['status'].append('failed' if failed else 'ok')
+        summary['message'].append(str(outcome) if failed else outcome[3])
+        summary['duration_s'].append(seconds)
+        if failed:
+            summary['final'].append(None)
+            summary['events'].append(None)
+            continue
+        t, values, crossings, _ = outcome
+        summary['final'].append([float(v) for v in values[:, -1]])
+        summary['events'].append(json.dumps(crossings) if crossings else None)
+        for name, series in zip(VARIABLES[model], values):
+            trajectories['scenario'].append(np.full(len(t), scenario_id, dtype=object))
+            trajectories['model'].append(np.full(len(t), model, dtype=object))
+            trajectories['t'].append(t)
+            trajectories['variable'].append(np.full(len(t), name, dtype=object))
+            trajectories['value'].append(series)
+
+    if trajectories['t']:
+        columns = {name: np.concatenate(parts) for name, parts in trajectories.items()}
+    else:
+        columns = {
+            'scenario': pa.array([], pa.string()), 'model': pa.array([], pa.string()), 't': np.empty(0),
+            'variable': pa.array([], pa.string()), 'value': np.empty(0),
+        }
+    name = _part(index)
+    _write_table(pa, pq, columns, os.path.join(directory, 'trajectories', name))
+    # Tipos explícitos: un bloque en el que todo falla tiene el mismo esquema
+    for key in ('scenario', 'model', 'status', 'message', 'events'):
+        summary[key] = pa.array(summary[key], pa.string())
+    summary['final'] = pa.array(summary['final'], pa.list_(pa.float64()))
+    summary['duration_s'] = pa.array(summary['duration_s'], pa.float64())
+    _write_table(pa, pq, summary, os.path.join(directory, 'summary', name))
+    return len(columns['t'])
+
+
+def fingerprint(path, chunk_size, n_points):
+    # Un manifiesto solo vale para el mismo archivo y el mismo reparto en bloques
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(f'{chunk_size}:{n_points}'.encode())
+    return digest.hexdigest()
+
+
+def _load_manifest(directory, key, fresh):
+    path = os.path.join(directory, MANIFEST)
+    if fresh or not os.path.exists(path):
+        return {'fingerprint': key, 'chunks': {}}
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('fingerprint') != key:
+        raise SystemExit(
+            f'{path} corresponde a otro archivo de escenarios o a otro --chunk-size; '
+            'usa --fresh para empezar de cero u otro directorio de salida'
+        )
+    return manifest
+
+
+def _save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _finished(directory, manifest, index):
+    return str(index) in manifest['chunks'] and all(
+        os.path.exists(os.path.join(directory, kind, _part(index))) for kind in ('trajectories', 'summary')
+    )
+
+
+def run(path, directory, workers=None, chunk_size=CHUNK_SIZE, n_points=N_POINTS, fresh=False, log=print):
+    scenarios = load_scenarios(path)
+    chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+    os.makedirs(directory, exist_ok=True)
+    manifest = _load_manifest(directory, fingerprint(path, chunk_size, n_points), fresh)
+    manifest['total'] = len(chunks)
+    pending = [i for i in range(len(chunks)) if not _finished(directory, manifest, i)]
+    for i in pending:
+        manifest['chunks'].pop(str(i), None)
+    if len(pending) < len(chunks):
+        log(f'Retomando: {len(chunks) - len(pending)} de {len(chunks)} bloques ya terminados')
+
+    errors = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_chunk, i, chunks[i], directory, n_points): i for i in pending}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # Un worker murió (memoria, señal): lo que falta se retoma en la próxima ejecución
+                log(f'Bloque {i + 1}/{len(chunks)}: el worker terminó de forma inesperada')
+                errors += 1
+                continue
+            except Exception as e:
+                log(f'Bloque {i + 1}/{len(chunks)}: {type(e).__name__}: {e}')
+                errors += 1
+                continue
+            manifest['chunks'][str(i)] = result
+            _save_manifest(directory, manifest)
+            log(f"Bloque {i + 1}/{len(chunks)}: {result['scenarios']} escenarios "
+                f"({result['failed']} fallidos), {result['rows']} filas en {result['seconds']:.2f} s")
+
+    done = manifest['chunks'].values()
+    failed = sum(result['failed'] for result in done)
+    log(f"{len(manifest['chunks'])} de {len(chunks)} bloques terminados; "
+        f"{sum(result['scenarios'] for result in done)} escenarios, {failed} fallidos")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ejecuta escenarios de los modelos por lotes y guarda Parquet.')
+    parser.add_argument('scenarios', help='archivo .jsonl o .json con los escenarios')
+    parser.add_argument('-o', '--output', required=True, help='directorio de salida (se retoma si ya existe)')
+    parser.add_argument('--workers', type=int, default=None, help='procesos (por defecto, uno por núcleo)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='escenarios por bloque')
+    parser.add_argument('--n-points', type=int, default=N_POINTS,
+                        help='instantes por trayectoria si el escenario no lo indica')
+    parser.add_argument('--fresh', action='store_true', help='ignora el manifiesto y empieza de cero')
+    args = parser.parse_args(argv)
+
+    _parquet()  # falla antes de lanzar los workers si falta pyarrow
+    errors = run(args.scenarios, args.output, args.workers, args.chunk_size, args.n_points, args.fresh)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""Benchmarks de latencia de los callbacks de cada página de modelo.
+
+Cada caso se mide de dos formas:
+
+* directo: llamando a la función ``update_*`` del módulo de la página;
+* HTTP: enviando la misma petición a ``/_dash-update-component`` con el
+  cliente de pruebas de Flask (incluye el despacho y la serialización de Dash).
+
+Se reportan p50/p95 en milisegundos, bytes de la respuesta y memoria reservada
+(pico y bloques, con tracemalloc en una pasada aparte para no distorsionar los
+tiempos).
+
+El atlas de atlas.py se desactiva en todos los casos salvo en los
+``predprey-atlas-*``, que miden a propósito la interpolación y se omiten si no
+hay un atlas en ``ATLAS_DIR``.
+
+Uso (desde la raíz del repositorio):
+
+    python benchmarks/bench_callbacks.py                 # solo reporta
+    python benchmarks/bench_callbacks.py --save          # guarda la línea base
+    python benchmarks/bench_callbacks.py --check         # falla si hay regresión
+    python benchmarks/bench_callbacks.py -k predprey -n 50
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from statistics import quantiles
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# (nombre, módulo de la página, callback, valores de entrada y de State en orden, opciones del integrador)
+CASES = [
+    ('exp-default', 'pages.03_exponencial', 'update_exponential_graph', [10, 0.2, 10, 5, []]),
+    ('exp-overflow', 'pages.03_exponencial', 'update_exponential_graph', [10, 50, 1000, 900, []]),
+    ('exp-log-axis', 'pages.03_exponencial', 'update_exponential_graph', [10, 0.2, 10, 5, ['log']]),
+    ('log-default', 'pages.04_logistico', 'update_logistic_graph', [10, 0.15, 150, 60, 20, []]),
+    ('log-long-tmax', 'pages.04_logistico', 'update_logistic_graph', [10, 0.15, 150, 1e6, 20, []]),
+    ('log-extreme-r', 'pages.04_logistico', 'update_logistic_graph', [10, 500, 150, 60, 20, []]),
+    ('gompertz-default', 'pages.05_modelo_gomperz', 'update_gompertz_graph', [10, 100, 0.3, 20, 10, []]),
+    ('gompertz-extreme-r', 'pages.05_modelo_gomperz', 'update_gompertz_graph', [1e-3, 100, 500, 1e4, 10, []]),
+    ('richards-default', 'pages.06_modelo_richards', 'update_richards_graph', [10, 100, 0.2, 0.8, 30, 15, []]),
+    ('richards-tiny-nu', 'pages.06_modelo_richards', 'update_richards_graph', [10, 100, 0.2, 1e-6, 30, 15, []]),
+    ('richards-huge-nu', 'pages.06_modelo_richards', 'update_richards_graph', [10, 100, 0.2, 500, 30, 15, []]),
+    ('predprey-default', 'pages.07_modelo_depredador-presa', 'update_predprey_graph',
+     [40, 9, 1.0, 0.1, 1.5, 0.075, 15, [], 5, None]),
+    ('predprey-long-tmax', 'pages.07_modelo_depredador-presa', 'update_predprey_graph',
+     [40, 9, 1.0, 0.1, 1.5, 0.075, 500, [], 5, None]),
+    ('predprey-tight-tol', 'pages.07_modelo_depredador-presa', 'update_predprey_graph',
+     [40, 9, 1.0, 0.1, 1.5, 0.075, 100, [], 5, None], {'method': 'RK45', 'rtol': 1e-10, 'atol': 1e-12}),
+    ('predprey-live-start', 'pages.07_modelo_depredador-presa', 'update_predprey_graph',
+     [40, 9, 1.0, 0.1, 1.5, 0.075, 5000, ['live'], 5, None]),
+    ('predprey-stiff', 'pages.07_modelo_depredador-presa', 'update_predprey_graph',
+     [400, 1, 5.0, 0.1, 5.0, 0.075, 50, [], 5, None]),
+    ('predprey-atlas-default', 'pages.07_modelo_depredador-presa', 'update_predprey_graph',
+     [40, 9, 1.0, 0.1, 1.5, 0.075, 15, [], 5, None]),
+    ('predprey-atlas-tmax-60', 'pages.07_modelo_depredador-presa', 'update_predprey_graph',
+     [40, 9, 1.0, 0.1, 1.5, 0.075, 60, [], 5, None]),
+    ('comp-default', 'pages.10_modelo_competencia', 'update_competition_graph',
+     [10, 1.0, 100, 15, 0.8, 80, 0.5, 0.6, 50]),
+    ('comp-stiff', 'pages.10_modelo_competencia', 'update_competition_graph',
+     [10, 50, 100, 15, 40, 80, 0.5, 0.6, 1000]),
+    ('comp-outcome-map', 'pages.10_modelo_competencia', 'update_competition_outcome_graph',
+     [1.0, 100, 0.8, 80, 0.5, 0.6]),
+    ('allee-default', 'pages.11_modelo_allee', 'update_allee_graph', [25, 0.5, 20, 100, 40]),
+    ('allee-stiff', 'pages.11_modelo_allee', 'update_allee_graph', [25, 50, 20, 100, 1000]),
+    ('sens-local', 'pages.12_sensibilidad', 'update_local_sensitivity_graph',
+     ['Richards', 10, 0.15, 150, 0.8, 60, 20, 'elasticity']),
+    ('sens-sobol-default', 'pages.12_sensibilidad', 'update_sobol_graph',
+     ['Logístico', 10, 0.15, 150, 0.8, 60, 20, 20, 8192]),
+    ('sens-sobol-max', 'pages.12_sensibilidad', 'update_sobol_graph',
+     ['Richards', 10, 0.15, 150, 0.8, 60, 20, 20, 16384]),
+    ('logmap-default', 'pages.08_mapa_logistico', 'update_bifurcation_graph', [2.5, 4, 500, 300, None, None]),
+    ('compare-default', 'pages.09_comparacion_modelos', 'update_comparison_graph',
+     [10, 0.3, 100, 0.5, 30, "0.1, 0.5, 0.9"]),
+]
+
+# Solo estos casos consultan el atlas de atlas.py (y se omiten si no hay uno en
+# ATLAS_DIR); en el resto se desactiva, para que los resultados no dependan de
+# que exista en la máquina
+ATLAS_PREFIX = 'predprey-atlas-'
+
+
+def load_app():
+    import app
+
+    client = app.server.test_client()
+    client.get('/')  # registra los callbacks en app.callback_map
+    return app, client
+
+
+def find_callback(app, name):
+    for output, spec in app.app.callback_map.items():
+        if getattr(spec.get('callback'), '__name__', None) == name:
+            return output, spec
+    raise KeyError(f'No hay un callback llamado {name}')
+
+
+def build_payload(output, spec, values):
+    declared = spec['output'] if isinstance(spec['output'], list) else [spec['output']]
+    outputs = [{'id': o.component_id, 'property': o.component_property} for o in declared]
+    inputs = [dict(item, value=value) for item, value in zip(spec['inputs'], values)]
+    state = [dict(item, value=value) for item, value in zip(spec['state'], values[len(inputs):])]
+    return {
+        'output': output,
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': inputs,
+        'changedPropIds': [f"{inputs[0]['id']}.{inputs[0]['property']}"],
+        'state': state,
+    }
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        return samples[0], samples[0]
+    cuts = quantiles(samples, n=100, method='inclusive')
+    return cuts[49], cuts[94]
+
+
+def run_case(app, client, case, repeat):
+    import atlas
+    import sensitivity
+    import simulation
+
+    def clear_caches():
+        simulation.clear()
+        sensitivity.sobol_indices.cache_clear()
+
+    name, module_name, function_name, values = case[:4]
+    solver_options = case[4] if len(case) > 4 else None
+    module = sys.modules[module_name]
+    func = getattr(module, function_name)
+    output, spec = find_callback(app, function_name)
+    payload = build_payload(output, spec, values)
+
+    saved_options = getattr(module, 'SOLVER_OPTIONS', None)
+    if solver_options is not None:
+        module.SOLVER_OPTIONS = solver_options
+    saved_atlas = atlas._atlas
+    try:
+        if not name.startswith(ATLAS_PREFIX):
+            atlas._atlas = False
+        elif not isinstance(module.solve(*values[:7]), atlas.Orbit):
+            raise RuntimeError(f'{name}: el atlas no responde a esta consulta')
+        func(*values)  # calentamiento: cachés, validadores de Plotly
+        direct = []
+        for _ in range(repeat):
+            # Se mide el cálculo, no la caché de trayectorias ni la de Sobol
+            clear_caches()
+            start = time.perf_counter()
+            func(*values)
+            direct.append((time.perf_counter() - start) * 1000)
+
+        http, payload_bytes = [], 0
+        for _ in range(repeat):
+            clear_caches()
+            start = time.perf_counter()
+            response = client.post('/_dash-update-component', json=payload)
+            http.append((time.perf_counter() - start) * 1000)
+            payload_bytes = len(response.data)
+            if response.status_code not in (200, 204):
+                raise RuntimeError(f'{name}: HTTP {response.status_code}')
+
+        clear_caches()
+        tracemalloc.start()
+        func(*values)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    finally:
+        if solver_options is not None:
+            module.SOLVER_OPTIONS = saved_options
+        atlas._atlas = saved_atlas
+
+    direct_p50, direct_p95 = percentiles(direct)
+    http_p50, http_p95 = percentiles(http)
+    return {
+        'direct_p50_ms': direct_p50,
+        'direct_p95_ms': direct_p95,
+        'http_p50_ms': http_p50,
+        'http_p95_ms': http_p95,
+        'payload_bytes': payload_bytes,
+        'alloc_peak_bytes': peak,
+        'alloc_blocks': blocks,
+    }
+
+
+def compare(name, result, baseline, tolerance, slack_ms):
+    problems = []
+    for key in ('direct_p95_ms', 'http_p95_ms'):
+        limit = baseline[key] * tolerance + slack_ms
+        if result[key] > limit:
+            problems.append(f'{name}: {key} {result[key]:.2f} > {limit:.2f} (base {baseline[key]:.2f})')
+    for key in ('payload_bytes', 'alloc_peak_bytes'):
+        limit = baseline[key] * tolerance
+        if result[key] > limit:
+            problems.append(f'{name}: {key} {result[key]:,} > {limit:,.0f} (base {baseline[key]:,})')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--repeat', type=int, default=20, help='repeticiones por caso')
+    parser.add_argument('-k', '--filter', default='', help='solo casos cuyo nombre contenga este texto')
+    parser.add_argument('--save', action='store_true', help='guardar los resultados como línea base')
+    parser.add_argument('--check', action='store_true', help='comparar con la línea base y fallar si empeora')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='factor permitido sobre la línea base')
+    parser.add_argument('--slack-ms', type=float, default=2.0, help='margen absoluto para latencias pequeñas')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    app, client = load_app()
+    cases = [case for case in CASES if args.filter in case[0]]
+
+    import atlas
+
+    if atlas.load() is None and any(case[0].startswith(ATLAS_PREFIX) for case in cases):
+        print(f'Sin atlas en {atlas.ATLAS_DIR}: se omiten los casos {ATLAS_PREFIX}* (python atlas.py)')
+        cases = [case for case in cases if not case[0].startswith(ATLAS_PREFIX)]
+
+    header = f"{'caso':<22}{'dir p50':>9}{'dir p95':>9}{'http p50':>10}{'http p95':>10}{'bytes':>11}{'pico mem':>11}{'bloques':>9}"
+    print(header)
+    print('-' * len(header))
+    results = {}
+    for case in cases:
+        result = results[case[0]] = run_case(app, client, case, args.repeat)
+        print(f"{case[0]:<22}{result['direct_p50_ms']:>9.2f}{result['direct_p95_ms']:>9.2f}"
+              f"{result['http_p50_ms']:>10.2f}{result['http_p95_ms']:>10.2f}{result['payload_bytes']:>11,}"
+              f"{result['alloc_peak_bytes']:>11,}{result['alloc_blocks']:>9,}")
+
+    status = 0
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f'\nNo existe la línea base {args.baseline}; ejecuta primero con --save')
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)['cases']
+        problems = []
+        for name, result in results.items():
+            if name in baseline:
+                problems.extend(compare(name, result, baseline[name], args.tolerance, args.slack_ms))
+        if problems:
+            print('\nRegresiones:')
+            print('\n'.join(f'  {problem}' for problem in problems))
+            status = 1
+        else:
+            print('\nSin regresiones respecto a la línea base.')
+
+    if args.save:
+        saved = {'cases': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved = json.load(f)
+        saved['cases'].update(results)
+        saved['python'] = sys.version.split()[0]
+        with open(args.baseline, 'w') as f:
+            json.dump(saved, f, indent=2, sort_keys=True)
+        print(f'\nLínea base guardada en {args.baseline}')
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Reporte de tiempo de arranque de ``app`` a partir de ``python -X importtime``.
+
+Ejecuta ``import app`` en procesos nuevos, resume los módulos más costosos
+(acumulado y propio) y comprueba que los módulos pesados que deben cargarse
+de forma diferida (SciPy) no se importen al arrancar.
+
+Uso (desde la raíz del repositorio):
+
+    python benchmarks/importtime.py                  # reporte
+    python benchmarks/importtime.py --save           # guarda la línea base local
+    python benchmarks/importtime.py --check          # falla si el arranque empeora
+    python benchmarks/importtime.py --max-ms 1500    # presupuesto absoluto
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'importtime_baseline.json')
+
+# Módulos que no deben cargarse al importar app
+DEFERRED_MODULES = ('scipy',)
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure_once():
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append((name, int(own) / 1000, int(cumulative) / 1000, (len(indent) - 1) // 2))
+    return wall * 1000, modules
+
+
+def summarize(runs):
+    walls = [wall for wall, _ in runs]
+    by_name = {}
+    for _, modules in runs:
+        for name, own, cumulative, depth in modules:
+            entry = by_name.setdefault(name, {'own': [], 'cumulative': [], 'depth': depth})
+            entry['own'].append(own)
+            entry['cumulative'].append(cumulative)
+    stats = {
+        name: {'own': median(entry['own']), 'cumulative': median(entry['cumulative']), 'depth': entry['depth']}
+        for name, entry in by_name.items()
+    }
+    return median(walls), stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--save', action='store_true', help='guardar como línea base')
+    parser.add_argument('--check', action='store_true', help='comparar con la línea base')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='factor permitido sobre la línea base')
+    parser.add_argument('--max-ms', type=float, help='presupuesto absoluto para import app (ms)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(args.runs)]
+    wall, stats = summarize(runs)
+    app_ms = stats.get('app', {}).get('cumulative', float('nan'))
+
+    print(f'import app: {app_ms:.0f} ms (importtime)   proceso completo: {wall:.0f} ms   mediana de {args.runs}')
+
+    print(f"\n{'paquetes importados por app':<40}{'acumulado ms':>14}")
+    top_level = sorted(
+        ((name, entry) for name, entry in stats.items() if entry['depth'] == 1),
+        key=lambda item: -item[1]['cumulative']
+    )
+    for name, entry in top_level[:args.top]:
+        print(f"{name:<40}{entry['cumulative']:>14.1f}")
+
+    print(f"\n{'módulos con mayor tiempo propio':<40}{'propio ms':>14}")
+    for name, entry in sorted(stats.items(), key=lambda item: -item[1]['own'])[:args.top]:
+        print(f"{name:<40}{entry['own']:>14.1f}")
+
+    problems = []
+    loaded = sorted({name.split('.')[0] for name in stats} & set(DEFERRED_MODULES))
+    if loaded:
+        problems.append(f"se importan al arrancar módulos diferidos: {', '.join(loaded)}")
+    if args.max_ms is not None and app_ms > args.max_ms:
+        problems.append(f'import app tarda {app_ms:.0f} ms > presupuesto {args.max_ms:.0f} ms')
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f'\nNo existe la línea base {args.baseline}; ejecuta primero con --save')
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        limit = baseline['app_ms'] * args.tolerance
+        if app_ms > limit:
+            problems.append(f"import app tarda {app_ms:.0f} ms > {limit:.0f} ms (base {baseline['app_ms']:.0f} ms)")
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({'app_ms': app_ms, 'wall_ms': wall, 'python': sys.version.split()[0]}, f, indent=2)
+        print(f'\nLínea base guardada en {args.baseline}')
+
+    if problems:
+        print('\nRegresiones:')
+        print('\n'.join(f'  {problem}' for problem in problems))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
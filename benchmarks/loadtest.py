@@ -0,0 +1,435 @@
+"""Generador de carga local que reproduce trazas de interacción realistas.
+
+Levanta una instancia de gunicorn con ``app:server`` en un puerto local (o usa
+una ya existente con ``--url``) y lanza usuarios virtuales concurrentes. Cada
+usuario abre una página, dispara los callbacks iniciales como lo haría el
+navegador y luego reproduce una traza de pulsaciones: cada cambio de valor
+envía a ``/_dash-update-component`` los callbacks que dependen de ese campo,
+con el estado actual de todos los campos de la página.
+
+Al final se reporta el rendimiento (peticiones/s), la latencia p50/p95/p99
+por callback y la saturación de los workers de gunicorn, medida a partir del
+tiempo de CPU de cada proceso en /proc. Solo necesita Linux y la librería
+estándar; no usa servicios externos.
+
+Uso (desde la raíz del repositorio):
+
+    python benchmarks/loadtest.py --users 30 --duration 30
+    python benchmarks/loadtest.py --users 60 --workers 4 --threads 2
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000 --users 10
+    python benchmarks/loadtest.py --dump-traces trazas.json   # editar y luego --traces trazas.json
+
+Formato de una traza (JSON, lista de trazas):
+
+    {"name": "predprey-typing", "path": "/07-modelo-depredador-presa", "weight": 3,
+     "steps": [{"id": "predprey-delta-input", "value": 0.08, "think_ms": 150}, ...]}
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from statistics import quantiles
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PREDPREY_PATH = '/07-modelo-depredador-presa'
+LOGISTIC_PATH = '/04-logistico'
+
+
+def typing(component_id, text, think_ms=120):
+    # Un paso por pulsación: el campo numérico emite el valor de cada prefijo
+    # válido (y None mientras está vacío tras seleccionar y borrar)
+    steps = [{'id': component_id, 'value': None, 'think_ms': think_ms}]
+    for end in range(1, len(text) + 1):
+        try:
+            value = float(text[:end])
+        except ValueError:
+            continue
+        steps.append({'id': component_id, 'value': value, 'think_ms': think_ms})
+    return steps
+
+
+def scrub(component_id, start, stop, step, think_ms=40):
+    count = int(round((stop - start) / step)) + 1
+    return [{'id': component_id, 'value': round(start + i * step, 6), 'think_ms': think_ms}
+            for i in range(count)]
+
+
+def builtin_traces():
+    return [
+        {
+            'name': 'predprey-typing',
+            'path': PREDPREY_PATH,
+            'weight': 3,
+            'steps': (typing('predprey-delta-input', '0.08') + typing('predprey-alpha-input', '1.2')
+                      + typing('predprey-beta-input', '0.05') + typing('predprey-time-max-input', '40')),
+        },
+        {
+            'name': 'predprey-scrub-tmax',
+            'path': PREDPREY_PATH,
+            'weight': 2,
+            'steps': scrub('predprey-time-max-input', 10, 40, 0.5),
+        },
+        {
+            'name': 'logistic-scrub-teval',
+            'path': LOGISTIC_PATH,
+            'weight': 1,
+            'steps': scrub('log-time-input', 0, 60, 0.5),
+        },
+    ]
+
+
+class Client:
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.connection = None
+
+    def post(self, path, payload):
+        body = json.dumps(payload).encode()
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request('POST', path, body, {'Content-Type': 'application/json'})
+                response = self.connection.getresponse()
+                data = response.read()
+                if response.getheader('Connection', '').lower() == 'close':
+                    self.connection.close()
+                    self.connection = None
+                return response.status, data
+            except (http.client.HTTPException, OSError):
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+    def get(self, path):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+
+def find_component_values(node, values):
+    # Recorre el layout serializado y guarda el valor inicial de cada componente con id
+    if isinstance(node, list):
+        for child in node:
+            find_component_values(child, values)
+    elif isinstance(node, dict):
+        props = node.get('props')
+        if isinstance(props, dict):
+            if isinstance(props.get('id'), str):
+                values[props['id']] = props
+            find_component_values(props.get('children'), values)
+            for key, value in props.items():
+                if key != 'children' and isinstance(value, (dict, list)):
+                    find_component_values(value, values)
+
+
+class PageModel:
+    # Estado inicial de una página y los callbacks del servidor que dependen de sus campos
+    def __init__(self, client, dependencies, path):
+        status, data = client.post('/_dash-update-component', {
+            'output': '.._pages_content.children..._pages_store.data..',
+            'outputs': [{'id': '_pages_content', 'property': 'children'},
+                        {'id': '_pages_store', 'property': 'data'}],
+            'inputs': [{'id': '_pages_location', 'property': 'pathname', 'value': path},
+                       {'id': '_pages_location', 'property': 'search', 'value': ''}],
+            'changedPropIds': ['_pages_location.pathname'],
+            'state': [],
+        })
+        if status != 200:
+            raise RuntimeError(f'No se pudo cargar {path}: HTTP {status}')
+        self.components = {}
+        find_component_values(json.loads(data)['response']['_pages_content']['children'], self.components)
+
+        self.callbacks = []
+        for dependency in dependencies:
+            if dependency.get('clientside_function') or dependency['output'].startswith('.._pages'):
+                continue
+            ids = {item['id'] for item in dependency['inputs'] + dependency['state']}
+            if isinstance(next(iter(ids), None), str) and ids <= set(self.components):
+                self.callbacks.append(dependency)
+
+    def initial_state(self):
+        return {(cid, 'value'): props.get('value') for cid, props in self.components.items()}
+
+    def payload(self, dependency, state, changed):
+        def items(group):
+            return [dict(item, value=state.get((item['id'], item['property']))) for item in dependency[group]]
+
+        output = dependency['output']
+        outputs = [{'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1]}
+                   for part in output.strip('.').split('...')]
+        return {
+            'output': output,
+            'outputs': outputs if output.startswith('..') else outputs[0],
+            'inputs': items('inputs'),
+            'state': items('state'),
+            'changedPropIds': [f'{changed[0]}.{changed[1]}'] if changed else [],
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = 0
+
+    def add(self, name, seconds, status, size):
+        with self.lock:
+            if status in (200, 204):
+                self.latencies[name].append(seconds)
+                self.bytes += size
+            else:
+                self.errors[name] += 1
+
+
+def callback_label(output):
+    return output.strip('.').split('...')[0].rsplit('.', 1)[0]
+
+
+def virtual_user(base_url, pages, traces, recorder, stop_at, seed, timeout):
+    rng = random.Random(seed)
+    client = Client(base_url, timeout)
+    weights = [trace.get('weight', 1) for trace in traces]
+
+    def fire(page, dependency, state, changed):
+        start = time.perf_counter()
+        try:
+            status, data = client.post('/_dash-update-component', page.payload(dependency, state, changed))
+        except (OSError, http.client.HTTPException):
+            status, data = 599, b''
+        recorder.add(callback_label(dependency['output']), time.perf_counter() - start, status, len(data))
+
+    while time.monotonic() < stop_at:
+        trace = rng.choices(traces, weights)[0]
+        page = pages[trace['path']]
+        state = page.initial_state()
+        for dependency in page.callbacks:
+            if not dependency.get('prevent_initial_call'):
+                fire(page, dependency, state, None)
+
+        for step in trace['steps']:
+            if time.monotonic() >= stop_at:
+                return
+            key = (step['id'], step.get('property', 'value'))
+            state[key] = step['value']
+            for dependency in page.callbacks:
+                if any((item['id'], item['property']) == key for item in dependency['inputs']):
+                    fire(page, dependency, state, key)
+            time.sleep(step.get('think_ms', 0) / 1000 * rng.uniform(0.5, 1.5))
+
+
+def worker_pids(master_pid):
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            children.append(int(entry))
+    return children
+
+
+def cpu_seconds(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def sample_workers(master_pid, stop_event, samples, interval=0.25):
+    previous = {}
+    previous_time = time.monotonic()
+    while not stop_event.wait(interval):
+        now = time.monotonic()
+        usage = {}
+        for pid in worker_pids(master_pid):
+            seconds = cpu_seconds(pid)
+            if seconds is not None and pid in previous:
+                usage[pid] = (seconds - previous[pid]) / (now - previous_time)
+            if seconds is not None:
+                previous[pid] = seconds
+        previous_time = now
+        if usage:
+            samples.append(usage)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(args):
+    port = free_port()
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+               '--workers', str(args.workers), '--threads', str(args.threads),
+               '--log-level', 'warning']
+    if args.config:
+        command += ['--config', args.config]
+    command.append('app:server')
+    # gunicorn.conf.py se carga siempre desde ROOT; sin GUNICORN_ACCESS_LOG no
+    # escribe una línea por petición en la salida del informe
+    env = {name: value for name, value in os.environ.items() if name != 'GUNICORN_ACCESS_LOG'}
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+
+    base_url = f'http://127.0.0.1:{port}'
+    client = Client(base_url, timeout=2)
+    deadline = time.monotonic() + args.boot_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('gunicorn terminó antes de quedar listo')
+        try:
+            if client.get('/_dash-dependencies')[0] == 200:
+                return process, base_url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError('gunicorn no respondió a tiempo')
+
+
+def percentile_row(values):
+    values = sorted(values)
+    if len(values) < 2:
+        value = values[0] * 1000 if values else float('nan')
+        return value, value, value, value
+    cuts = quantiles(values, n=100, method='inclusive')
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000, values[-1] * 1000
+
+
+def report(recorder, elapsed, samples, users):
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    total = len(all_latencies)
+    errors = sum(recorder.errors.values())
+    print(f'\nUsuarios: {users}   Duración: {elapsed:.1f} s   Peticiones: {total}   Errores: {errors}')
+    print(f'Rendimiento: {total / elapsed:.1f} pet/s   Transferido: {recorder.bytes / 1e6:.1f} MB')
+
+    header = f"{'callback':<32}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'máx ms':>10}{'errores':>9}"
+    print('\n' + header)
+    print('-' * len(header))
+    for name in sorted(set(recorder.latencies) | set(recorder.errors)):
+        values = recorder.latencies.get(name, [])
+        p50, p95, p99, worst = percentile_row(values)
+        print(f'{name:<32}{len(values):>7}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{worst:>10.1f}{recorder.errors.get(name, 0):>9}')
+    p50, p95, p99, worst = percentile_row(all_latencies)
+    print(f"{'TOTAL':<32}{total:>7}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{worst:>10.1f}{errors:>9}")
+
+    summary = {
+        'users': users, 'elapsed_s': elapsed, 'requests': total, 'errors': errors,
+        'throughput_rps': total / elapsed, 'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99,
+    }
+    if samples:
+        per_worker = defaultdict(list)
+        for sample in samples:
+            for pid, usage in sample.items():
+                per_worker[pid].append(usage)
+        # Un worker síncrono está saturado cuando su CPU se acerca al 100 %
+        saturated = sum(1 for sample in samples if all(value > 0.9 for value in sample.values()))
+        print(f'\nWorkers: {len(per_worker)}   Muestras con todos los workers saturados (>90 % CPU): '
+              f'{100 * saturated / len(samples):.0f} %')
+        for pid, values in sorted(per_worker.items()):
+            print(f'  pid {pid}: CPU media {100 * sum(values) / len(values):5.1f} %   máx {100 * max(values):5.1f} %')
+        summary['saturated_fraction'] = saturated / len(samples)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20, help='usuarios virtuales concurrentes')
+    parser.add_argument('--duration', type=float, default=20.0, help='segundos de carga')
+    parser.add_argument('--ramp', type=float, default=0.0, help='segundos para arrancar a todos los usuarios')
+    parser.add_argument('--url', help='servidor ya en marcha (si no, se lanza gunicorn)')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--config', help='archivo de configuración de gunicorn')
+    parser.add_argument('--boot-timeout', type=float, default=60.0)
+    parser.add_argument('--timeout', type=float, default=60.0, help='timeout por petición (s)')
+    parser.add_argument('--traces', help='archivo JSON con trazas grabadas')
+    parser.add_argument('--dump-traces', help='escribir las trazas incluidas en este archivo y salir')
+    parser.add_argument('--json', help='guardar el resumen en este archivo')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.dump_traces:
+        with open(args.dump_traces, 'w') as f:
+            json.dump(builtin_traces(), f, indent=2, ensure_ascii=False)
+        return 0
+
+    traces = builtin_traces()
+    if args.traces:
+        with open(args.traces) as f:
+            traces = json.load(f)
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process, base_url = start_gunicorn(args)
+
+    try:
+        client = Client(base_url, args.timeout)
+        dependencies = json.loads(client.get('/_dash-dependencies')[1])
+        pages = {path: PageModel(client, dependencies, path) for path in {trace['path'] for trace in traces}}
+
+        recorder = Recorder()
+        samples, stop_event = [], threading.Event()
+        sampler = None
+        if process is not None:
+            sampler = threading.Thread(target=sample_workers, args=(process.pid, stop_event, samples), daemon=True)
+            sampler.start()
+
+        start = time.monotonic()
+        stop_at = start + args.duration
+        users = []
+        for index in range(args.users):
+            thread = threading.Thread(
+                target=virtual_user,
+                args=(base_url, pages, traces, recorder, stop_at, args.seed + index, args.timeout),
+                daemon=True,
+            )
+            users.append(thread)
+            thread.start()
+            if args.ramp:
+                time.sleep(args.ramp / args.users)
+        for thread in users:
+            thread.join()
+        elapsed = time.monotonic() - start
+        stop_event.set()
+        if sampler is not None:
+            sampler.join()
+
+        summary = report(recorder, elapsed, samples, args.users)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(summary, f, indent=2)
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=30)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+
+from dash import get_asset_url
+
+# Las ecuaciones de cada página se sirven como SVG locales en assets/equations,
+# que se versionan con el repositorio. `python equations.py` las renderiza sin
+# red con ziamath (LaTeX a SVG en Python puro, glifos STIX como trazos: el SVG
+# no depende de ninguna fuente) y reescribe manifest.json; ziamath está en
+# requirements-build.txt. El nombre de cada archivo es el hash de su
+# contenido, así que se pueden cachear para siempre (ver static.py).
+#
+# No hay servicio remoto de respaldo: sin manifest.json, o con una ecuación que
+# no está en él, equation_src() lanza un error que pide volver a generarlas.
+#
+# En las páginas:
+#
+#     html.Img(src=equation_src(r"\frac{dP}{dt}=rP"), ...)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+EQUATIONS_DIR = os.path.join(ROOT, 'assets', 'equations')
+MANIFEST_PATH = os.path.join(EQUATIONS_DIR, 'manifest.json')
+
+_used = set()
+_collecting = False
+
+
+class MissingEquation(LookupError):
+    pass
+
+
+def _load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return None
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+_manifest = _load_manifest()
+
+
+def equation_src(latex):
+    _used.add(latex)
+    if _collecting:
+        return ''
+    if _manifest is None:
+        raise MissingEquation(f'No existe {MANIFEST_PATH}: genera las ecuaciones con `python equations.py`')
+    filename = _manifest.get(latex)
+    if filename is None:
+        raise MissingEquation(f'La ecuación {latex!r} no está en {MANIFEST_PATH}: vuelve a ejecutar `python equations.py`')
+    return get_asset_url(f'equations/{filename}')
+
+
+def collect():
+    # Construye el layout de cada página para registrar sus ecuaciones
+    global _collecting
+    import dash
+
+    import app  # noqa: F401  registra las páginas
+
+    _collecting = True
+    try:
+        for page in dash.page_registry.values():
+            if callable(page['layout']):
+                page['layout']()
+    finally:
+        _collecting = False
+    return sorted(_used)
+
+
+def render(latex):
+    import ziamath
+
+    return ziamath.Latex(latex).svg().encode()
+
+
+def build():
+    os.makedirs(EQUATIONS_DIR, exist_ok=True)
+    manifest = {}
+    for latex in collect():
+        svg = render(latex)
+        filename = hashlib.sha256(svg).hexdigest()[:16] + '.svg'
+        with open(os.path.join(EQUATIONS_DIR, filename), 'wb') as f:
+            f.write(svg)
+        manifest[latex] = filename
+        print(f'{filename}  {latex}')
+
+    # Los SVG que ya no usa ninguna página se eliminan
+    for name in os.listdir(EQUATIONS_DIR):
+        if name.endswith('.svg') and name not in manifest.values():
+            os.remove(os.path.join(EQUATIONS_DIR, name))
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    print(f'{len(manifest)} ecuaciones en {EQUATIONS_DIR}')
+    return manifest
+
+
+if __name__ == '__main__':
+    # Las páginas importan el módulo `equations`, no `__main__`: el registro
+    # de ecuaciones usadas vive allí
+    import equations
+
+    equations.build()
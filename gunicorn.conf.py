@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+
+# Configuración de producción para gunicorn (`gunicorn -c gunicorn.conf.py app:server`).
+#
+# preload_app importa app en el proceso maestro antes de crear los workers. El
+# hook when_ready además precalienta todo lo que se comparte en solo lectura:
+# SciPy, plantillas de Plotly, los mapas de callbacks de Dash y las cachés
+# (curvas, bifurcación, equilibrios) con los valores por defecto de cada
+# página. Después congela el GC (prefork.freeze) para que esas páginas de
+# memoria sigan compartidas por copy-on-write.
+#
+# Mediciones con 2 workers en una máquina de 1 CPU, Python 3.11, tras visitar
+# cada página cuatro veces (PSS reparte lo compartido entre procesos):
+#
+#                                   RSS/worker   PSS/worker   /07 (grafo, p50)
+#   sin preload (Procfile anterior)  143-150 MB     64-72 MB       55-90 ms
+#   este archivo (preload + warm-up) 136-150 MB     57-71 MB       50-90 ms
+#
+# En una sola CPU la diferencia de memoria queda dentro del ruido: al tocar
+# los objetos los workers copian buena parte de las páginas compartidas.
+# La ganancia está en los reinicios: con preload, un worker nuevo (por
+# max_requests o tras una caída) es un fork que ya tiene importados app,
+# SciPy y las cachés, en lugar de volver a importar todo (~1 s con la CPU
+# ocupada) y atender lentas sus primeras peticiones.
+#
+# Los callbacks son CPU-bound (NumPy, solve_ivp, serialización JSON) y
+# mantienen el GIL casi todo el tiempo. Por eso hay un worker por núcleo y 2
+# hilos por worker, que bastan para solapar la E/S de red y el keep-alive.
+# El pool de procesos de Sobol (sensitivity.py) recibe los núcleos que sobran
+# entre los workers, al menos 1: con un worker por núcleo se calcula en serie.
+# Variables de entorno: WEB_CONCURRENCY, GUNICORN_THREADS, SENSITIVITY_WORKERS,
+# GUNICORN_ACCESS_LOG, GUNICORN_LOG_LEVEL y PORT.
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, multiprocessing.cpu_count())))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+
+# Se lee al importar sensitivity, después de cargar esta configuración
+os.environ.setdefault('SENSITIVITY_WORKERS', str(max(1, multiprocessing.cpu_count() // workers)))
+worker_class = 'gthread'
+
+preload_app = True
+
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+# Reciclar workers de vez en cuando acota el crecimiento de las cachés lru y
+# de la fragmentación del heap; el jitter evita que todos reinicien a la vez
+max_requests = 2000
+max_requests_jitter = 200
+
+# Una línea por petición solo si GUNICORN_ACCESS_LOG indica un destino ('-' es
+# stdout; el Procfile lo activa). gunicorn carga este archivo desde el
+# directorio de trabajo aunque no se pase --config, así que por defecto queda
+# apagado: benchmarks/loadtest.py no inunda su informe con el registro
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    import app
+    import prefork
+
+    warmed = prefork.warm_up(app.app)
+    prefork.freeze()
+    server.log.info('Precalentados %d callbacks antes de crear los workers', warmed)
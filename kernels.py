@@ -0,0 +1,120 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Núcleos de los modelos de crecimiento con solución cerrada, evaluados en
+# escala logarítmica: devuelven ln P(t) y se mantienen finitos y precisos en
+# todo el dominio válido (P₀ > 0, K > 0, r > 0, ν > 0), incluso cuando P(t)
+# no cabe en un float o cuando ν es muy pequeño.
+
+LN10 = np.log(10.0)
+
+
+def _log_denominator(x, s):
+    # ln(1 + B e^(-s)) con B = e^x - 1, para x = ν ln(K/P₀) y s = rνt.
+    # Si B > 0 se suma en escala log con B = e^x (1 - e^(-x)). Si B < 0 basta
+    # log1p mientras B e^(-s) no se acerque a -1; cerca de -1 se usa
+    # 1 + B e^(-s) = (1 - e^(-s)) + e^(x - s), suma de positivos sin cancelación.
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log_b = x + np.log(-np.expm1(-np.abs(x)))
+        growing = np.logaddexp(0.0, log_b - s)
+        product = np.expm1(np.minimum(x, 0.0)) * np.exp(-s)
+        declining = np.where(
+            product > -0.5,
+            np.log1p(product),
+            np.logaddexp(np.log(-np.expm1(-s)), x - s)
+        )
+    return np.where(x > 0, growing, np.where(x < 0, declining, 0.0))
+
+
+def log_exponential(p0, r, t):
+    p0, r, t = np.broadcast_arrays(*map(np.asarray, (p0, r, t)))
+    return np.log(p0) + r * t
+
+
+def log_logistic(p0, r, k, t):
+    p0, r, k, t = np.broadcast_arrays(*map(np.asarray, (p0, r, k, t)))
+    # P(t) = K / (1 + A e^(-rt)) con A = (K - P₀)/P₀ = e^(ln(K/P₀)) - 1
+    return np.log(k) - _log_denominator(np.log(k) - np.log(p0), r * t)
+
+
+def log_gompertz(p0, r, k, t):
+    p0, r, k, t = np.broadcast_arrays(*map(np.asarray, (p0, r, k, t)))
+    # ln P(t) = ln K - ln(K/P₀) e^(-rt): sin la exponencial anidada
+    return np.log(k) - (np.log(k) - np.log(p0)) * np.exp(-r * t)
+
+
+def log_richards(p0, r, k, nu, t):
+    p0, r, k, nu, t = np.broadcast_arrays(*map(np.asarray, (p0, r, k, nu, t)))
+    # P(t) = K / [1 + B e^(-rνt)]^(1/ν) con B = (K/P₀)^ν - 1 = expm1(ν ln(K/P₀))
+    x = nu * (np.log(k) - np.log(p0))
+    return np.log(k) - _log_denominator(x, r * nu * t) / nu
+
+
+def to_linear(log_p):
+    # P(t) en escala lineal; +inf solo si el valor no es representable
+    with np.errstate(over='ignore'):
+        return np.exp(log_p)
+
+
+def format_population(log_p):
+    log_p = float(log_p)
+    if log_p < np.log(1e15):
+        return f"{np.exp(log_p):.2f}"
+    exponent = np.floor(log_p / LN10)
+    mantissa = 10 ** (log_p / LN10 - exponent)
+    return f"{mantissa:.4f} × 10^{int(exponent)}"
+
+
+# Comparación de modelos: cada curva depende solo de sus propios parámetros,
+# así que la caché se indexa por modelo y un cambio en ν (por ejemplo) solo
+# recalcula la curva de Richards.
+MODEL_PARAMETERS = {
+    'Exponencial': ('p0', 'r'),
+    'Logístico': ('p0', 'r', 'k'),
+    'Gompertz': ('p0', 'r', 'k'),
+    'Richards': ('p0', 'r', 'k', 'nu'),
+}
+
+_KERNELS = {
+    'Exponencial': log_exponential,
+    'Logístico': log_logistic,
+    'Gompertz': log_gompertz,
+    'Richards': log_richards,
+}
+
+
+@lru_cache(maxsize=128)
+def _cached_curve(model, values, t_max, n_points):
+    t = np.linspace(0, t_max, n_points)
+    log_p = _KERNELS[model](*values, t)
+    log_p.setflags(write=False)
+    return log_p
+
+
+def compare_models(params, t_max, n_points=400, models=tuple(MODEL_PARAMETERS)):
+    t = np.linspace(0, t_max, n_points)
+    curves = {
+        model: _cached_curve(
+            model, tuple(float(params[name]) for name in MODEL_PARAMETERS[model]),
+            float(t_max), n_points
+        )
+        for model in models
+    }
+    return t, curves
+
+
+def time_to_fraction(model, fractions, p0, r, k, nu=1.0):
+    # Tiempo en que P(t) = f·K, invirtiendo la solución cerrada; NaN si la
+    # curva nunca alcanza (o ya superó en t = 0) esa fracción
+    f = np.asarray(fractions, dtype=float)
+    log_ratio = np.log(k) - np.log(p0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if model == 'Exponencial':
+            t = (np.log(f) + log_ratio) / r
+        elif model == 'Gompertz':
+            t = (np.log(log_ratio) - np.log(-np.log(f))) / r
+        else:
+            nu = 1.0 if model == 'Logístico' else nu
+            t = (np.log(np.expm1(nu * log_ratio)) - np.log(np.expm1(-nu * np.log(f)))) / (r * nu)
+    return np.where(np.isfinite(t) & (t >= 0), t, np.nan)
@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from flask import Response, g, has_request_context, request
+
+# Instrumentación de callbacks: cada petición a /_dash-update-component se
+# divide en fases (validation, compute, figure, serialization) que se exponen
+# en la cabecera Server-Timing y se acumulan en histogramas para /metrics.
+# Las métricas son por proceso: con varios workers de gunicorn cada uno
+# reporta las suyas (etiqueta "pid").
+#
+# Uso dentro de un callback:
+#
+#     @callback(...)
+#     @timed
+#     def update_x_graph(...):
+#         ...validación...
+#         checkpoint('validation')
+#         ...cálculo...
+#         checkpoint('compute')
+#         ...figura...
+#         checkpoint('figure')
+#         return fig
+#
+# Fuera de una petición (llamadas directas, scripts) ambas funciones no hacen nada.
+
+DISPATCH_PATH = '/_dash-update-component'
+
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else f'{bound:g}'
+            yield f'{name}_bucket{{{labels},le="{le}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.total:.9g}'
+        yield f'{name}_count{{{labels}}} {cumulative}'
+
+
+_lock = threading.Lock()
+_phase_seconds = {}
+_response_bytes = {}
+_request_bytes = {}
+
+
+def _observe(store, key, buckets, value):
+    with _lock:
+        histogram = store.get(key)
+        if histogram is None:
+            histogram = store[key] = Histogram(buckets)
+        histogram.observe(value)
+
+
+def timed(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not has_request_context():
+            return func(*args, **kwargs)
+        g.callback_name = func.__name__
+        g.last_mark = g.callback_start = time.perf_counter()
+        g.phases = {}
+        try:
+            return func(*args, **kwargs)
+        finally:
+            g.callback_end = time.perf_counter()
+    return wrapper
+
+
+def checkpoint(phase):
+    if not has_request_context() or 'last_mark' not in g:
+        return
+    now = time.perf_counter()
+    g.phases[phase] = g.phases.get(phase, 0.0) + now - g.last_mark
+    g.last_mark = now
+
+
+def _before_request():
+    if request.path == DISPATCH_PATH:
+        g.request_start = time.perf_counter()
+
+
+def _after_request(response):
+    if 'request_start' not in g or 'callback_end' not in g:
+        return response
+
+    end = time.perf_counter()
+    phases = dict(g.phases)
+    phases['dispatch'] = g.callback_start - g.request_start
+    # Lo que no se marcó dentro del callback se atribuye al propio callback
+    phases['callback'] = max(g.callback_end - g.last_mark, 0.0)
+    phases['serialization'] = end - g.callback_end
+    phases['total'] = end - g.request_start
+
+    name = g.callback_name
+    for phase, seconds in phases.items():
+        _observe(_phase_seconds, (name, phase), TIME_BUCKETS, seconds)
+    _observe(_response_bytes, name, SIZE_BUCKETS, response.calculate_content_length() or 0)
+    _observe(_request_bytes, name, SIZE_BUCKETS, request.content_length or 0)
+
+    response.headers['Server-Timing'] = ', '.join(
+        f'{phase};dur={seconds * 1000:.2f}' for phase, seconds in phases.items()
+    )
+    return response
+
+
+def reset():
+    with _lock:
+        for store in (_phase_seconds, _response_bytes, _request_bytes):
+            store.clear()
+
+
+def render_metrics():
+    pid = os.getpid()
+    lines = []
+    with _lock:
+        for name, store, description in (
+            ('dash_callback_phase_seconds', _phase_seconds, 'Duración de cada fase de un callback.'),
+            ('dash_callback_response_bytes', _response_bytes, 'Tamaño de la respuesta JSON de un callback.'),
+            ('dash_callback_request_bytes', _request_bytes, 'Tamaño del cuerpo de la petición de un callback.'),
+        ):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} histogram')
+            for key, histogram in sorted(store.items()):
+                if isinstance(key, tuple):
+                    labels = f'pid="{pid}",callback="{key[0]}",phase="{key[1]}"'
+                else:
+                    labels = f'pid="{pid}",callback="{key}"'
+                lines.extend(histogram.lines(name, labels))
+    return '\n'.join(lines) + '\n'
+
+
+def instrument(server):
+    server.before_request(_before_request)
+    server.after_request(_after_request)
+
+    @server.route('/metrics')
+    def metrics():
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+    return server
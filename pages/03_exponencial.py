@@ -3,107 +3,111 @@ from dash import dcc, html, Input, Output, callback
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import numpy as np
+from equations import equation_src
+from metrics import checkpoint, timed
+from kernels import LN10, format_population, to_linear, log_exponential
+from stability import describe
 from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
 
 dash.register_page(__name__, name='Modelo Exponencial')
 
-page_content = dbc.Card(
-    dbc.CardBody([
-        html.H2("Modelo de Crecimiento Exponencial", className="card-title text-center mb-4"),
-        html.P(
-            "Este modelo describe un proceso donde la tasa de cambio de una cantidad es directamente proporcional a su valor actual. Cuanto más grande es, más rápido crece.",
-            className="text-center"
-        ),
-        html.Hr(),
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Ecuación Diferencial", className="card-title text-center"),
-                html.Div(
-                    html.Img(src=r"https://latex.codecogs.com/svg.latex?\frac{dP}{dt}=rP", 
-                             style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
-                ),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Solución de la E.D.O.", className="card-title text-center"),
-                html.Div(
-                    html.Img(src=r"https://latex.codecogs.com/svg.latex?P(t)=P_0e^{rt}", 
-                             style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
-                ),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("¿Cuándo se usa?", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **Finanzas:** Interés compuesto.
-                    * **Biología:** Crecimiento de bacterias.
-                    * **Epidemiología:** Propagación inicial.
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Puntos Críticos", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **P = 0:** Único punto de equilibrio, de carácter **inestable**.
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
-        
-        dbc.Row([
-            dbc.Col(
-                dbc.Card(dbc.CardBody([
-                    html.H5("Descripción de Variables", className="card-title text-center"),
-                    dcc.Markdown("""
-                        * **P(t):** Población en el tiempo t.
-                        * **P₀:** Población inicial (en t=0).
-                        * **r:** Tasa de crecimiento intrínseca.
-                        * **t:** Tiempo.
-                    """, style={'paddingLeft': '20px'})
-                ]), style=INFO_CARD_STYLE)
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Modelo de Crecimiento Exponencial", className="card-title text-center mb-4"),
+            html.P(
+                "Este modelo describe un proceso donde la tasa de cambio de una cantidad es directamente proporcional a su valor actual. Cuanto más grande es, más rápido crece.",
+                className="text-center"
             ),
-        ], className="mb-4"),
+            html.Hr(),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Ecuación Diferencial", className="card-title text-center"),
+                    html.Div(
+                        html.Img(src=equation_src(r"\frac{dP}{dt}=rP"), 
+                                 style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Solución de la E.D.O.", className="card-title text-center"),
+                    html.Div(
+                        html.Img(src=equation_src(r"P(t)=P_0e^{rt}"), 
+                                 style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("¿Cuándo se usa?", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Finanzas:** Interés compuesto.
+                        * **Biología:** Crecimiento de bacterias.
+                        * **Epidemiología:** Propagación inicial.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Puntos Críticos", className="card-title text-center"),
+                    dcc.Markdown(id='exp-critical-points', children="""
+                        * **P = 0:** Único punto de equilibrio, de carácter **inestable**.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+        
+            dbc.Row([
+                dbc.Col(
+                    dbc.Card(dbc.CardBody([
+                        html.H5("Descripción de Variables", className="card-title text-center"),
+                        dcc.Markdown("""
+                            * **P(t):** Población en el tiempo t.
+                            * **P₀:** Población inicial (en t=0).
+                            * **r:** Tasa de crecimiento intrínseca.
+                            * **t:** Tiempo.
+                        """, style={'paddingLeft': '20px'})
+                    ]), style=INFO_CARD_STYLE)
+                ),
+            ], className="mb-4"),
 
-        html.Hr(className="my-4"),
-        dbc.Row([
-            dbc.Col([
-                html.H4("Parámetros", className="text-center fw-bold mb-3"),
+            html.Hr(className="my-4"),
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
                 
-                dbc.Label("Población Inicial (P₀):", className="small"),
-                dcc.Input(id='exp-initial-pop-input', type='number', value=10, min=1, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Población Inicial (P₀):", className="small"),
+                    dcc.Input(id='exp-initial-pop-input', type='number', value=10, min=1, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                dbc.Label("Tasa de Crecimiento (r):", className="small"),
-                dcc.Input(id='exp-rate-input', type='number', value=0.2, min=0.01, step=0.01, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tasa de Crecimiento (r):", className="small"),
+                    dcc.Input(id='exp-rate-input', type='number', value=0.2, min=0.01, step=0.01, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
-                dcc.Input(id='exp-time-max-input', type='number', value=10, min=1, step=0.5, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
+                    dcc.Input(id='exp-time-max-input', type='number', value=10, min=1, step=0.5, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                dbc.Label("Tiempo a Evaluar (t):", className="small"),
-                dcc.Input(id='exp-time-input', type='number', value=5, min=0, step=0.1, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tiempo a Evaluar (t):", className="small"),
+                    dcc.Input(id='exp-time-input', type='number', value=5, min=0, step=0.1, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                html.Div(id='exp-pop-result', className="text-center fw-bold mt-3 text-primary"),
-            ], md=3),
-            dbc.Col(
-                dcc.Graph(id='exponential-graph', style={'height': '100%'}),
-                md=9
-            ),
-        ], align="center", className="mt-4"),
-    ]),
-    className="m-4",
-)
+                    dcc.Checklist(id='exp-log-scale-input',
+                                  options=[{'label': ' Escala logarítmica (log₁₀ P)', 'value': 'log'}],
+                                  value=[], className="small mb-3"),
 
-layout = html.Div([
-    html.Link(
-        rel='stylesheet',
-        href='https://fonts.googleapis.com/css2?family=Outfit:wght@100..900&display=swap'
-    ),
-    html.Div(
+                    html.Div(id='exp-pop-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
+                dbc.Col(
+                    dcc.Graph(id='exponential-graph', style={'height': '100%'}),
+                    md=9
+                ),
+            ], align="center", className="mt-4"),
+        ]),
+        className="m-4",
+    )
+
+    return URL_STATE.apply(html.Div(
         page_content,
         style={'fontFamily': 'Outfit, sans-serif'}
-    )
-])
+    ), kwargs)
 
 @callback(
     [Output('exponential-graph', 'figure'),
@@ -111,18 +115,29 @@ layout = html.Div([
     [Input('exp-initial-pop-input', 'value'),
      Input('exp-rate-input', 'value'),
      Input('exp-time-max-input', 'value'),
-     Input('exp-time-input', 'value')]
+     Input('exp-time-input', 'value'),
+     Input('exp-log-scale-input', 'value')]
 )
-def update_exponential_graph(p0, r, t_max, t_eval):
+@timed
+def update_exponential_graph(p0, r, t_max, t_eval, log_scale=()):
     if p0 is None or r is None or t_max is None or t_eval is None:
         return dash.no_update, ""
 
     t_eval = min(t_eval, t_max)
+    checkpoint('validation')
 
     t = np.linspace(0, t_max, 200)
-    P = p0 * np.exp(r * t)
+    log_P = log_exponential(p0, r, t)
+    log_P_eval = log_exponential(p0, r, t_eval)
 
-    P_eval = p0 * np.exp(r * t_eval)
+    # Si P(t) no cabe en un float se grafica log₁₀ P aunque no se haya pedido
+    P = to_linear(log_P)
+    use_log = bool(log_scale) or not np.all(np.isfinite(P))
+    if use_log:
+        P, P_eval = log_P / LN10, log_P_eval / LN10
+    else:
+        P_eval = to_linear(log_P_eval)
+    checkpoint('compute')
 
     fig = go.Figure()
 
@@ -136,7 +151,7 @@ def update_exponential_graph(p0, r, t_max, t_eval):
         x=[t_eval], y=[P_eval],
         mode='markers+text',
         marker=dict(color='red', size=10),
-        text=[f"P({t_eval}) = {P_eval:.2f}"],
+        text=[f"P({t_eval}) = {format_population(log_P_eval)}"],
         textposition="top center",
         name='Evaluación'
     ))
@@ -145,7 +160,7 @@ def update_exponential_graph(p0, r, t_max, t_eval):
         title_text="Crecimiento Exponencial: dP/dt = rP",
         title_x=0.5,
         xaxis_title="Tiempo (t)",
-        yaxis_title="Población (P)",
+        yaxis_title="log₁₀ Población" if use_log else "Población (P)",
         template="plotly_white",
         height=550,
         font=dict(family="Outfit, sans-serif"),
@@ -163,5 +178,27 @@ def update_exponential_graph(p0, r, t_max, t_eval):
     fig.update_xaxes(showline=True, linewidth=2, linecolor='red', gridcolor='lightgray', range=[0, t_max])
     fig.update_yaxes(showline=True, linewidth=2, linecolor='red', gridcolor='lightgray')
 
+    checkpoint('figure')
+
     # ✅ Corrección: se eliminan los ** para evitar que aparezcan literalmente
-    return fig, f" Población en t = {t_eval}: P(t) = {P_eval:.2f}"
\ No newline at end of file
+    return fig, f" Población en t = {t_eval}: P(t) = {format_population(log_P_eval)}"
+
+
+@callback(
+    Output('exp-critical-points', 'children'),
+    Input('exp-rate-input', 'value')
+)
+@timed
+def update_exponential_critical_points(r):
+    if r is None or r <= 0:
+        return dash.no_update
+    return describe('exponencial', (r,), 'P')
+
+
+URL_STATE = register(__name__, {
+    'p0': 'exp-initial-pop-input',
+    'r': 'exp-rate-input',
+    't_max': 'exp-time-max-input',
+    't': 'exp-time-input',
+    'scale': 'exp-log-scale-input',
+}, figure=lambda v: update_exponential_graph(v['p0'], v['r'], v['t_max'], v['t'], v['scale']))
@@ -3,122 +3,126 @@ from dash import dcc, html, Input, Output, callback
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import numpy as np
+from equations import equation_src
+from metrics import checkpoint, timed
+from kernels import LN10, format_population, to_linear, log_logistic
+from stability import describe
 from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
 
 dash.register_page(__name__, name='Modelo Logístico')
 
-page_content = dbc.Card(
-    dbc.CardBody([
-        html.H2("Modelo de Crecimiento Logístico", className="card-title text-center mb-4"),
-        html.P(
-            "El modelo logístico es una mejora realista del modelo exponencial. Introduce la 'capacidad de carga' (K), el tamaño máximo de población que un entorno puede sostener.",
-            className="text-center"
-        ),
-        html.Hr(),
-
-        # Ecuaciones
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Ecuación Diferencial", className="card-title text-center"),
-                html.Div(
-                    html.Img(src=r"https://latex.codecogs.com/svg.latex?\frac{dP}{dt}=rP(1-\frac{P}{K})", 
-                             style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
-                ),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Solución de la E.D.O.", className="card-title text-center"),
-                html.Div(
-                    html.Img(src=r"https://latex.codecogs.com/svg.latex?P(t)=\frac{K}{1+\left(\frac{K-P_0}{P_0}\right)e^{-rt}}", 
-                             style={'height': '60px', 'display': 'block', 'margin': '10px auto'}),
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Modelo de Crecimiento Logístico", className="card-title text-center mb-4"),
+            html.P(
+                "El modelo logístico es una mejora realista del modelo exponencial. Introduce la 'capacidad de carga' (K), el tamaño máximo de población que un entorno puede sostener.",
+                className="text-center"
+            ),
+            html.Hr(),
+
+            # Ecuaciones
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Ecuación Diferencial", className="card-title text-center"),
+                    html.Div(
+                        html.Img(src=equation_src(r"\frac{dP}{dt}=rP(1-\frac{P}{K})"), 
+                                 style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Solución de la E.D.O.", className="card-title text-center"),
+                    html.Div(
+                        html.Img(src=equation_src(r"P(t)=\frac{K}{1+\left(\frac{K-P_0}{P_0}\right)e^{-rt}}"), 
+                                 style={'height': '60px', 'display': 'block', 'margin': '10px auto'}),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+
+            # Uso y puntos críticos
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("¿Cuándo se usa?", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Ecología:** Crecimiento de poblaciones.
+                        * **Negocios:** Adopción de productos.
+                        * **Medicina:** Crecimiento de tumores.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Puntos Críticos", className="card-title text-center"),
+                    dcc.Markdown(id='log-critical-points', children="""
+                        * **P = 0:** Equilibrio **inestable**.  
+                        * **P = K:** Equilibrio **estable** (atractor).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+
+            # Variables
+            dbc.Row([
+                dbc.Col(
+                    dbc.Card(dbc.CardBody([
+                        html.H5("Descripción de Variables", className="card-title text-center"),
+                        dcc.Markdown("""
+                            * **P(t):** Población en el tiempo t.  
+                            * **P₀:** Población inicial (en t=0).  
+                            * **K:** Capacidad de carga del sistema.  
+                            * **r:** Tasa de crecimiento intrínseca.  
+                            * **t:** Tiempo.
+                        """, style={'paddingLeft': '20px'})
+                    ]), style=INFO_CARD_STYLE)
                 ),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
+            ], className="mb-4"),
 
-        # Uso y puntos críticos
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("¿Cuándo se usa?", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **Ecología:** Crecimiento de poblaciones.
-                    * **Negocios:** Adopción de productos.
-                    * **Medicina:** Crecimiento de tumores.
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Puntos Críticos", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **P = 0:** Equilibrio **inestable**.  
-                    * **P = K:** Equilibrio **estable** (atractor).
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
+            html.Hr(className="my-4"),
 
-        # Variables
-        dbc.Row([
-            dbc.Col(
-                dbc.Card(dbc.CardBody([
-                    html.H5("Descripción de Variables", className="card-title text-center"),
-                    dcc.Markdown("""
-                        * **P(t):** Población en el tiempo t.  
-                        * **P₀:** Población inicial (en t=0).  
-                        * **K:** Capacidad de carga del sistema.  
-                        * **r:** Tasa de crecimiento intrínseca.  
-                        * **t:** Tiempo.
-                    """, style={'paddingLeft': '20px'})
-                ]), style=INFO_CARD_STYLE)
-            ),
-        ], className="mb-4"),
+            # Parámetros y gráfico
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
 
-        html.Hr(className="my-4"),
+                    dbc.Label("Población Inicial (P₀):", className="small"),
+                    dcc.Input(id='log-initial-pop-input', type='number', value=10, min=1, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
 
-        # Parámetros y gráfico
-        dbc.Row([
-            dbc.Col([
-                html.H4("Parámetros", className="text-center fw-bold mb-3"),
+                    dbc.Label("Tasa de Crecimiento (r):", className="small"),
+                    dcc.Input(id='log-rate-input', type='number', value=0.15, min=0.01, step=0.01, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
 
-                dbc.Label("Población Inicial (P₀):", className="small"),
-                dcc.Input(id='log-initial-pop-input', type='number', value=10, min=1, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Capacidad de Carga (K):", className="small"),
+                    dcc.Input(id='log-capacity-input', type='number', value=150, min=10, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
 
-                dbc.Label("Tasa de Crecimiento (r):", className="small"),
-                dcc.Input(id='log-rate-input', type='number', value=0.15, min=0.01, step=0.01, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
+                    dcc.Input(id='log-time-max-input', type='number', value=60, min=1, step=0.5, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
 
-                dbc.Label("Capacidad de Carga (K):", className="small"),
-                dcc.Input(id='log-capacity-input', type='number', value=150, min=10, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tiempo a Evaluar (t):", className="small"),
+                    dcc.Input(id='log-time-input', type='number', value=20, min=0, step=0.5, 
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
 
-                dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
-                dcc.Input(id='log-time-max-input', type='number', value=60, min=1, step=0.5, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dcc.Checklist(id='log-log-scale-input',
+                                  options=[{'label': ' Escala logarítmica (log₁₀ P)', 'value': 'log'}],
+                                  value=[], className="small mb-3"),
 
-                dbc.Label("Tiempo a Evaluar (t):", className="small"),
-                dcc.Input(id='log-time-input', type='number', value=20, min=0, step=0.5, 
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    html.Div(id='log-pop-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
 
-                html.Div(id='log-pop-result', className="text-center fw-bold mt-3 text-primary"),
-            ], md=3),
-
-            dbc.Col(
-                dcc.Graph(id='logistic-graph', style={'height': '100%'}),
-                md=9
-            ),
-        ], align="center", className="mt-4"),
-    ]),
-    className="m-4",
-)
+                dbc.Col(
+                    dcc.Graph(id='logistic-graph', style={'height': '100%'}),
+                    md=9
+                ),
+            ], align="center", className="mt-4"),
+        ]),
+        className="m-4",
+    )
 
-layout = html.Div([
-    html.Link(
-        rel='stylesheet',
-        href='https://fonts.googleapis.com/css2?family=Outfit:wght@100..900&display=swap'
-    ),
-    html.Div(
+    return URL_STATE.apply(html.Div(
         page_content,
         style={'fontFamily': 'Outfit, sans-serif'}
-    )
-])
+    ), kwargs)
 
 # Callback con tiempo final y evaluación
 @callback(
@@ -128,9 +132,11 @@ layout = html.Div([
      Input('log-rate-input', 'value'),
      Input('log-capacity-input', 'value'),
      Input('log-time-max-input', 'value'),
-     Input('log-time-input', 'value')]
+     Input('log-time-input', 'value'),
+     Input('log-log-scale-input', 'value')]
 )
-def update_logistic_graph(p0, r, k, t_max, t_eval):
+@timed
+def update_logistic_graph(p0, r, k, t_max, t_eval, log_scale=()):
     if p0 is None or r is None or k is None or t_max is None or t_eval is None:
         return dash.no_update, ""
 
@@ -139,11 +145,18 @@ def update_logistic_graph(p0, r, k, t_max, t_eval):
 
     # Limitar el tiempo de evaluación
     t_eval = min(t_eval, t_max)
+    checkpoint('validation')
 
-    # Generar datos hasta t_max
+    # Generar datos hasta t_max (en escala logarítmica, sin desbordes)
     t = np.linspace(0, t_max, 400)
-    P = k / (1 + ((k - p0) / p0) * np.exp(-r * t))
-    P_eval = k / (1 + ((k - p0) / p0) * np.exp(-r * t_eval))
+    log_P = log_logistic(p0, r, k, t)
+    log_P_eval = log_logistic(p0, r, k, t_eval)
+
+    if log_scale:
+        P, P_eval, K_line = log_P / LN10, log_P_eval / LN10, np.log10(k)
+    else:
+        P, P_eval, K_line = to_linear(log_P), to_linear(log_P_eval), k
+    checkpoint('compute')
 
     fig = go.Figure()
 
@@ -156,7 +169,7 @@ def update_logistic_graph(p0, r, k, t_max, t_eval):
 
     # Línea de capacidad de carga
     fig.add_trace(go.Scatter(
-        x=[0, t_max], y=[k, k],
+        x=[0, t_max], y=[K_line, K_line],
         mode='lines',
         line=dict(color='red', width=2, dash='dash'),
         name='Capacidad de carga (K)'
@@ -167,7 +180,7 @@ def update_logistic_graph(p0, r, k, t_max, t_eval):
         x=[t_eval], y=[P_eval],
         mode='markers+text',
         marker=dict(color='green', size=10),
-        text=[f"P({t_eval}) = {P_eval:.2f}"],
+        text=[f"P({t_eval}) = {format_population(log_P_eval)}"],
         textposition="top center",
         name='Evaluación'
     ))
@@ -176,7 +189,7 @@ def update_logistic_graph(p0, r, k, t_max, t_eval):
         title_text="Crecimiento Logístico: dP/dt = rP(1 - P/K)",
         title_x=0.5,
         xaxis_title="Tiempo (t)",
-        yaxis_title="Población (P)",
+        yaxis_title="log₁₀ Población" if log_scale else "Población (P)",
         template="plotly_white",
         height=550,
         font=dict(family="Outfit, sans-serif"),
@@ -193,5 +206,28 @@ def update_logistic_graph(p0, r, k, t_max, t_eval):
 
     fig.update_xaxes(showline=True, linewidth=2, linecolor='red', gridcolor='lightgray', range=[0, t_max])
     fig.update_yaxes(showline=True, linewidth=2, linecolor='red', gridcolor='lightgray')
+    checkpoint('figure')
+
+    return fig, f" Población en t = {t_eval}: P(t) = {format_population(log_P_eval)}"
+
 
-    return fig, f" Población en t = {t_eval}: P(t) = {P_eval:.2f}"
+@callback(
+    Output('log-critical-points', 'children'),
+    [Input('log-rate-input', 'value'),
+     Input('log-capacity-input', 'value')]
+)
+@timed
+def update_logistic_critical_points(r, k):
+    if None in (r, k) or min(r, k) <= 0:
+        return dash.no_update
+    return describe('logistico', (r, k), 'P')
+
+
+URL_STATE = register(__name__, {
+    'p0': 'log-initial-pop-input',
+    'r': 'log-rate-input',
+    'K': 'log-capacity-input',
+    't_max': 'log-time-max-input',
+    't': 'log-time-input',
+    'scale': 'log-log-scale-input',
+}, figure=lambda v: update_logistic_graph(v['p0'], v['r'], v['K'], v['t_max'], v['t'], v['scale']))
@@ -3,122 +3,126 @@ from dash import dcc, html, Input, Output, callback
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import numpy as np
+from equations import equation_src
+from metrics import checkpoint, timed
+from kernels import LN10, format_population, to_linear, log_gompertz
+from stability import describe
 from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
 
 dash.register_page(__name__, name='Modelo de Gompertz')
 
-page_content = dbc.Card(
-    dbc.CardBody([
-        html.H2("Modelo de Crecimiento de Gompertz", className="card-title text-center mb-4"),
-        html.P(
-            "El modelo de Gompertz describe un crecimiento que comienza rápido, luego se desacelera y se estabiliza asintóticamente. Es común en tumores, envejecimiento y crecimiento de organismos.",
-            className="text-center"
-        ),
-        html.Hr(),
-
-        # Ecuaciones
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Ecuación Diferencial", className="card-title text-center"),
-                html.Div(
-                    html.Img(src=r"https://latex.codecogs.com/svg.latex?\frac{dP}{dt}=rP\ln\left(\frac{K}{P}\right)", 
-                             style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
-                ),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Solución de la E.D.O.", className="card-title text-center"),
-                html.Div(
-                    html.Img(src=r"https://latex.codecogs.com/svg.latex?P(t)=K\exp\left(-\ln\left(\frac{K}{P_0}\right)e^{-rt}\right)", 
-                             style={'height': '60px', 'display': 'block', 'margin': '10px auto'}),
-                ),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
-
-        # Usos y puntos críticos
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("¿Cuándo se usa?", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **Biología:** Crecimiento tumoral.
-                    * **Demografía:** Envejecimiento y mortalidad.
-                    * **Ecología:** Crecimiento de poblaciones con límite asintótico suave.
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Puntos Críticos", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **P = K:** Punto de equilibrio **estable**.
-                    * **P = 0:** No es físicamente alcanzable (solución nunca llega a 0).
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
-        
-        dbc.Row([
-            dbc.Col(
-                dbc.Card(dbc.CardBody([
-                    html.H5("Descripción de Variables", className="card-title text-center"),
-                    dcc.Markdown("""
-                        * **P(t):** Población en el tiempo t.
-                        * **P₀:** Población inicial (en t=0).
-                        * **K:** Capacidad de carga (máximo teórico).
-                        * **r:** Tasa de crecimiento intrínseca.
-                        * **t:** Tiempo.
-                    """, style={'paddingLeft': '20px'})
-                ]), style=INFO_CARD_STYLE)
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Modelo de Crecimiento de Gompertz", className="card-title text-center mb-4"),
+            html.P(
+                "El modelo de Gompertz describe un crecimiento que comienza rápido, luego se desacelera y se estabiliza asintóticamente. Es común en tumores, envejecimiento y crecimiento de organismos.",
+                className="text-center"
             ),
-        ], className="mb-4"),
+            html.Hr(),
+
+            # Ecuaciones
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Ecuación Diferencial", className="card-title text-center"),
+                    html.Div(
+                        html.Img(src=equation_src(r"\frac{dP}{dt}=rP\ln\left(\frac{K}{P}\right)"), 
+                                 style={'height': '50px', 'display': 'block', 'margin': '10px auto'}),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Solución de la E.D.O.", className="card-title text-center"),
+                    html.Div(
+                        html.Img(src=equation_src(r"P(t)=K\exp\left(-\ln\left(\frac{K}{P_0}\right)e^{-rt}\right)"), 
+                                 style={'height': '60px', 'display': 'block', 'margin': '10px auto'}),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+
+            # Usos y puntos críticos
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("¿Cuándo se usa?", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Biología:** Crecimiento tumoral.
+                        * **Demografía:** Envejecimiento y mortalidad.
+                        * **Ecología:** Crecimiento de poblaciones con límite asintótico suave.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Puntos Críticos", className="card-title text-center"),
+                    dcc.Markdown(id='gompertz-critical-points', children="""
+                        * **P = K:** Punto de equilibrio **estable**.
+                        * **P = 0:** No es físicamente alcanzable (solución nunca llega a 0).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+        
+            dbc.Row([
+                dbc.Col(
+                    dbc.Card(dbc.CardBody([
+                        html.H5("Descripción de Variables", className="card-title text-center"),
+                        dcc.Markdown("""
+                            * **P(t):** Población en el tiempo t.
+                            * **P₀:** Población inicial (en t=0).
+                            * **K:** Capacidad de carga (máximo teórico).
+                            * **r:** Tasa de crecimiento intrínseca.
+                            * **t:** Tiempo.
+                        """, style={'paddingLeft': '20px'})
+                    ]), style=INFO_CARD_STYLE)
+                ),
+            ], className="mb-4"),
 
-        html.Hr(className="my-4"),
+            html.Hr(className="my-4"),
 
-        # Parámetros + gráfica
-        dbc.Row([
-            dbc.Col([
-                html.H4("Parámetros", className="text-center fw-bold mb-3"),
+            # Parámetros + gráfica
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
                 
-                dbc.Label("Población Inicial (P₀):", className="small"),
-                dcc.Input(id='gompertz-initial-pop-input', type='number', value=10, min=0.1, step=0.1,
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Población Inicial (P₀):", className="small"),
+                    dcc.Input(id='gompertz-initial-pop-input', type='number', value=10, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                dbc.Label("Capacidad de Carga (K):", className="small"),
-                dcc.Input(id='gompertz-k-input', type='number', value=100, min=0.1, step=0.1,
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Capacidad de Carga (K):", className="small"),
+                    dcc.Input(id='gompertz-k-input', type='number', value=100, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                dbc.Label("Tasa de Crecimiento (r):", className="small"),
-                dcc.Input(id='gompertz-rate-input', type='number', value=0.3, min=0.01, step=0.01,
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tasa de Crecimiento (r):", className="small"),
+                    dcc.Input(id='gompertz-rate-input', type='number', value=0.3, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
-                dcc.Input(id='gompertz-time-max-input', type='number', value=20, min=1, step=0.5,
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
+                    dcc.Input(id='gompertz-time-max-input', type='number', value=20, min=1, step=0.5,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                dbc.Label("Tiempo a Evaluar (t):", className="small"),
-                dcc.Input(id='gompertz-time-input', type='number', value=10, min=0, step=0.1,
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tiempo a Evaluar (t):", className="small"),
+                    dcc.Input(id='gompertz-time-input', type='number', value=10, min=0, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
                 
-                html.Div(id='gompertz-pop-result', className="text-center fw-bold mt-3 text-primary"),
-            ], md=3),
+                    dcc.Checklist(id='gompertz-log-scale-input',
+                                  options=[{'label': ' Escala logarítmica (log₁₀ P)', 'value': 'log'}],
+                                  value=[], className="small mb-3"),
 
-            dbc.Col(
-                dcc.Graph(id='gompertz-graph', style={'height': '100%'}),
-                md=9
-            ),
-        ], align="center", className="mt-4"),
-    ]),
-    className="m-4",
-)
+                    html.Div(id='gompertz-pop-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
+
+                dbc.Col(
+                    dcc.Graph(id='gompertz-graph', style={'height': '100%'}),
+                    md=9
+                ),
+            ], align="center", className="mt-4"),
+        ]),
+        className="m-4",
+    )
 
-layout = html.Div([
-    html.Link(
-        rel='stylesheet',
-        href='https://fonts.googleapis.com/css2?family=Outfit:wght@100..900&display=swap'
-    ),
-    html.Div(
+    return URL_STATE.apply(html.Div(
         page_content,
         style={'fontFamily': 'Outfit, sans-serif'}
-    )
-])
+    ), kwargs)
 
 @callback(
     [Output('gompertz-graph', 'figure'),
@@ -127,9 +131,11 @@ layout = html.Div([
      Input('gompertz-k-input', 'value'),
      Input('gompertz-rate-input', 'value'),
      Input('gompertz-time-max-input', 'value'),
-     Input('gompertz-time-input', 'value')]
+     Input('gompertz-time-input', 'value'),
+     Input('gompertz-log-scale-input', 'value')]
 )
-def update_gompertz_graph(p0, k, r, t_max, t_eval):
+@timed
+def update_gompertz_graph(p0, k, r, t_max, t_eval, log_scale=()):
     if None in (p0, k, r, t_max, t_eval):
         return dash.no_update, ""
 
@@ -137,13 +143,18 @@ def update_gompertz_graph(p0, k, r, t_max, t_eval):
         return dash.no_update, "⚠️ Asegúrate de que 0 < P₀ ≤ K"
 
     t_eval = min(t_eval, t_max)
+    checkpoint('validation')
 
     t = np.linspace(0, t_max, 300)
-    
-    ln_ratio = np.log(k / p0)
-    P = k * np.exp(-ln_ratio * np.exp(-r * t))
 
-    P_eval = k * np.exp(-ln_ratio * np.exp(-r * t_eval))
+    log_P = log_gompertz(p0, r, k, t)
+    log_P_eval = log_gompertz(p0, r, k, t_eval)
+
+    if log_scale:
+        P, P_eval, K_line = log_P / LN10, log_P_eval / LN10, np.log10(k)
+    else:
+        P, P_eval, K_line = to_linear(log_P), to_linear(log_P_eval), k
+    checkpoint('compute')
 
     fig = go.Figure()
 
@@ -157,19 +168,19 @@ def update_gompertz_graph(p0, k, r, t_max, t_eval):
         x=[t_eval], y=[P_eval],
         mode='markers+text',
         marker=dict(color='red', size=10),
-        text=[f"P({t_eval}) = {P_eval:.2f}"],
+        text=[f"P({t_eval}) = {format_population(log_P_eval)}"],
         textposition="top center",
         name='Evaluación'
     ))
 
-    fig.add_hline(y=k, line_dash="dot", line_color="gray", annotation_text="K (capacidad)", 
+    fig.add_hline(y=K_line, line_dash="dot", line_color="gray", annotation_text="K (capacidad)", 
                   annotation_position="bottom right")
 
     fig.update_layout(
         title_text="Crecimiento de Gompertz: dP/dt = r P ln(K/P)",
         title_x=0.5,
         xaxis_title="Tiempo (t)",
-        yaxis_title="Población (P)",
+        yaxis_title="log₁₀ Población" if log_scale else "Población (P)",
         template="plotly_white",
         height=550,
         font=dict(family="Outfit, sans-serif"),
@@ -186,5 +197,29 @@ def update_gompertz_graph(p0, k, r, t_max, t_eval):
 
     fig.update_xaxes(showline=True, linewidth=2, linecolor='black', gridcolor='lightgray', range=[0, t_max])
     fig.update_yaxes(showline=True, linewidth=2, linecolor='black', gridcolor='lightgray')
+    checkpoint('figure')
+
+    return fig, f" Población en t = {t_eval}: P(t) = {format_population(log_P_eval)}"
 
-    return fig, f" Población en t = {t_eval}: P(t) = {P_eval:.2f}"
\ No newline at end of file
+
+@callback(
+    Output('gompertz-critical-points', 'children'),
+    [Input('gompertz-rate-input', 'value'),
+     Input('gompertz-k-input', 'value')]
+)
+@timed
+def update_gompertz_critical_points(r, k):
+    if None in (r, k) or min(r, k) <= 0:
+        return dash.no_update
+    # P = 0 queda fuera del análisis: ln(K/P) no está definido ahí
+    return describe('gompertz', (r, k), 'P') + "\n* **P = 0:** No es físicamente alcanzable (solución nunca llega a 0)."
+
+
+URL_STATE = register(__name__, {
+    'p0': 'gompertz-initial-pop-input',
+    'K': 'gompertz-k-input',
+    'r': 'gompertz-rate-input',
+    't_max': 'gompertz-time-max-input',
+    't': 'gompertz-time-input',
+    'scale': 'gompertz-log-scale-input',
+}, figure=lambda v: update_gompertz_graph(v['p0'], v['K'], v['r'], v['t_max'], v['t'], v['scale']))
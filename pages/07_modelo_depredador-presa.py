@@ -1,185 +1,228 @@
+import hashlib
+import json
+
 import dash 
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output, State, Patch, callback, clientside_callback
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import numpy as np
-from scipy.integrate import solve_ivp
+from atlas import lookup
+from equations import equation_src
+from metrics import checkpoint, timed
+from simulation import advance, integrate
+from stability import KIND_LABELS, analyze, describe, linearized_orbit
 from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
 
 dash.register_page(__name__, name='Modelo Presa–Depredador')
 
-page_content = dbc.Card(
-    dbc.CardBody([
-        html.H2("Modelo Presa–Depredador (Lotka-Volterra)", className="card-title text-center mb-4"),
-        html.P(
-            "Modelo clásico que describe la interacción cíclica entre dos especies: las presas crecen libremente, pero son consumidas por los depredadores, quienes a su vez dependen de ellas para sobrevivir.",
-            className="text-center"
-        ),
-        html.Hr(),
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Ecuaciones Diferenciales", className="card-title text-center"),
-                html.Div(
-                    html.Img(
-                        src=r"https://latex.codecogs.com/svg.latex?\begin{cases}\frac{dx}{dt}=\alpha x-\beta xy\\\frac{dy}{dt}=\delta xy-\gamma y\end{cases}",
-                        style={'height': '70px', 'display': 'block', 'margin': '10px auto'}
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Modelo Presa–Depredador (Lotka-Volterra)", className="card-title text-center mb-4"),
+            html.P(
+                "Modelo clásico que describe la interacción cíclica entre dos especies: las presas crecen libremente, pero son consumidas por los depredadores, quienes a su vez dependen de ellas para sobrevivir.",
+                className="text-center"
+            ),
+            html.Hr(),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Ecuaciones Diferenciales", className="card-title text-center"),
+                    html.Div(
+                        html.Img(
+                            src=equation_src(r"\begin{cases}\frac{dx}{dt}=\alpha x-\beta xy\\\frac{dy}{dt}=\delta xy-\gamma y\end{cases}"),
+                            style={'height': '70px', 'display': 'block', 'margin': '10px auto'}
+                        ),
                     ),
-                ),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Comportamiento", className="card-title text-center"),
-                dcc.Markdown("""
-                    * Las poblaciones oscilan **cíclicamente**.
-                    * El pico de presas **precede** al de depredadores.
-                    * Sin intervención, el sistema es **neutro estable** (ciclos perpetuos).
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
-        dbc.Row([
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("¿Cuándo se usa?", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **Ecología:** Dinámica de especies (liebres y linces).
-                    * **Epidemiología:** Modelos SIR simplificados.
-                    * **Economía:** Competencia entre mercados o tecnologías.
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-            dbc.Col(dbc.Card(dbc.CardBody([
-                html.H5("Puntos de Equilibrio", className="card-title text-center"),
-                dcc.Markdown("""
-                    * **(0, 0):** Extinción (inestable).
-                    * **(γ/δ, α/β):** Coexistencia (centro, neutro estable).
-                """, style={'paddingLeft': '20px'}),
-            ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
-        ]),
-        
-        dbc.Row([
-            dbc.Col(
-                dbc.Card(dbc.CardBody([
-                    html.H5("Descripción de Variables", className="card-title text-center"),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Comportamiento", className="card-title text-center"),
                     dcc.Markdown("""
-                        * **x(t):** Población de **presas** en el tiempo t.
-                        * **y(t):** Población de **depredadores** en el tiempo t.
-                        * **α:** Tasa de crecimiento natural de presas.
-                        * **β:** Tasa de encuentro/predación.
-                        * **γ:** Tasa de mortalidad de depredadores.
-                        * **δ:** Eficiencia de conversión (presas → depredadores).
-                    """, style={'paddingLeft': '20px'})
-                ]), style=INFO_CARD_STYLE)
-            ),
-        ], className="mb-4"),
+                        * Las poblaciones oscilan **cíclicamente**.
+                        * El pico de presas **precede** al de depredadores.
+                        * Sin intervención, el sistema es **neutro estable** (ciclos perpetuos).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("¿Cuándo se usa?", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Ecología:** Dinámica de especies (liebres y linces).
+                        * **Epidemiología:** Modelos SIR simplificados.
+                        * **Economía:** Competencia entre mercados o tecnologías.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Puntos de Equilibrio", className="card-title text-center"),
+                    dcc.Markdown(id='predprey-critical-points', children="""
+                        * **(0, 0):** Extinción (inestable).
+                        * **(γ/δ, α/β):** Coexistencia (centro, neutro estable).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+        
+            dbc.Row([
+                dbc.Col(
+                    dbc.Card(dbc.CardBody([
+                        html.H5("Descripción de Variables", className="card-title text-center"),
+                        dcc.Markdown("""
+                            * **x(t):** Población de **presas** en el tiempo t.
+                            * **y(t):** Población de **depredadores** en el tiempo t.
+                            * **α:** Tasa de crecimiento natural de presas.
+                            * **β:** Tasa de encuentro/predación.
+                            * **γ:** Tasa de mortalidad de depredadores.
+                            * **δ:** Eficiencia de conversión (presas → depredadores).
+                        """, style={'paddingLeft': '20px'})
+                    ]), style=INFO_CARD_STYLE)
+                ),
+            ], className="mb-4"),
 
-        html.Hr(className="my-4"),
-        dbc.Row([
-            dbc.Col([
-                html.H4("Parámetros", className="text-center fw-bold mb-3"),
+            html.Hr(className="my-4"),
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
                 
-                dbc.Label("Presas Iniciales (x₀):", className="small"),
-                dcc.Input(id='predprey-x0-input', type='number', value=40, min=0.1, step=0.1,
-                          style=INPUT_STYLE_COMPACT, className="mb-2"),
+                    dbc.Label("Presas Iniciales (x₀):", className="small"),
+                    dcc.Input(id='predprey-x0-input', type='number', value=40, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
                 
-                dbc.Label("Depredadores Iniciales (y₀):", className="small"),
-                dcc.Input(id='predprey-y0-input', type='number', value=9, min=0.1, step=0.1,
-                          style=INPUT_STYLE_COMPACT, className="mb-2"),
+                    dbc.Label("Depredadores Iniciales (y₀):", className="small"),
+                    dcc.Input(id='predprey-y0-input', type='number', value=9, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
                 
-                dbc.Label("α (crecimiento presas):", className="small"),
-                dcc.Input(id='predprey-alpha-input', type='number', value=1.0, min=0.01, step=0.01,
-                          style=INPUT_STYLE_COMPACT, className="mb-2"),
+                    dbc.Label("α (crecimiento presas):", className="small"),
+                    dcc.Input(id='predprey-alpha-input', type='number', value=1.0, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
                 
-                dbc.Label("β (tasa de predación):", className="small"),
-                dcc.Input(id='predprey-beta-input', type='number', value=0.1, min=0.001, step=0.001,
-                          style=INPUT_STYLE_COMPACT, className="mb-2"),
+                    dbc.Label("β (tasa de predación):", className="small"),
+                    dcc.Input(id='predprey-beta-input', type='number', value=0.1, min=0.001, step=0.001,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
                 
-                dbc.Label("γ (mortalidad depredadores):", className="small"),
-                dcc.Input(id='predprey-gamma-input', type='number', value=1.5, min=0.01, step=0.01,
-                          style=INPUT_STYLE_COMPACT, className="mb-2"),
+                    dbc.Label("γ (mortalidad depredadores):", className="small"),
+                    dcc.Input(id='predprey-gamma-input', type='number', value=1.5, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
                 
-                dbc.Label("δ (eficiencia conversión):", className="small"),
-                dcc.Input(id='predprey-delta-input', type='number', value=0.075, min=0.001, step=0.001,
-                          style=INPUT_STYLE_COMPACT, className="mb-2"),
+                    dbc.Label("δ (eficiencia conversión):", className="small"),
+                    dcc.Input(id='predprey-delta-input', type='number', value=0.075, min=0.001, step=0.001,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
                 
-                dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
-                dcc.Input(id='predprey-time-max-input', type='number', value=15, min=1, step=0.5,
-                          style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
+                    dcc.Input(id='predprey-time-max-input', type='number', value=15, min=1, step=0.5,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("Tiempo a Evaluar (t):", className="small"),
+                    dcc.Input(id='predprey-time-input', type='number', value=5, min=0, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dcc.Checklist(id='predprey-live-input',
+                                  options=[{'label': ' Simulación en vivo', 'value': 'live'}],
+                                  value=[], className="small mb-2"),
+                    dbc.Label("Ventana visible en vivo (t, vacío = todo):", className="small"),
+                    dcc.Input(id='predprey-window-input', type='number', value=None, min=1, step=1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+                    dcc.Interval(id='predprey-live-interval', interval=LIVE_INTERVAL_MS, disabled=True),
+                    dcc.Store(id='predprey-live-store'),
+                    dcc.Store(id='predprey-live-run-store'),
+                    dcc.Store(id='predprey-live-chunk-store'),
                 
-                html.Div(id='predprey-result', className="text-center fw-bold mt-3 text-primary"),
-            ], md=3),
-            dbc.Col([
-                dcc.Tabs([
-                    dcc.Tab(label='Poblaciones vs Tiempo', children=[
-                        dcc.Graph(id='predprey-time-graph', style={'height': '100%'})
-                    ]),
-                    dcc.Tab(label='Fase (Presas vs Depredadores)', children=[
-                        dcc.Graph(id='predprey-phase-graph', style={'height': '100%'})
+                    html.Div(id='predprey-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
+                dbc.Col([
+                    dcc.Tabs([
+                        dcc.Tab(label='Poblaciones vs Tiempo', children=[
+                            dcc.Graph(id='predprey-time-graph', style={'height': '100%'})
+                        ]),
+                        dcc.Tab(label='Fase (Presas vs Depredadores)', children=[
+                            dcc.Graph(id='predprey-phase-graph', style={'height': '100%'})
+                        ])
                     ])
-                ])
-            ], md=9),
-        ], align="start", className="mt-4"),
-    ]),
-    className="m-4",
-)
+                ], md=9),
+            ], align="start", className="mt-4"),
+        ]),
+        className="m-4",
+    )
 
-layout = html.Div([
-    html.Link(
-        rel='stylesheet',
-        href='https://fonts.googleapis.com/css2?family=Outfit:wght@100..900&display=swap'
-    ),
-    html.Div(
+    return URL_STATE.apply(html.Div(
         page_content,
         style={'fontFamily': 'Outfit, sans-serif'}
-    )
-])
+    ), kwargs)
+
+# Opciones del integrador; los benchmarks las endurecen para medir el peor caso.
+# El atlas solo responde con estas (ver atlas.SOLVER_OPTIONS)
+SOLVER_OPTIONS = {'method': 'RK45', 'rtol': 1e-6}
 
-def lotka_volterra(t, z, alpha, beta, gamma, delta):
-    x, y = z
-    dxdt = alpha * x - beta * x * y
-    dydt = delta * x * y - gamma * y
-    return [dxdt, dydt]
+# Modo en vivo: cada tramo integra como máximo LIVE_BUDGET_S segundos y el
+# navegador pide el siguiente cada LIVE_INTERVAL_MS. Se muestrean al menos
+# LIVE_SAMPLES_PER_UNIT puntos por unidad de tiempo.
+LIVE_BUDGET_S = 0.03
+LIVE_INTERVAL_MS = 100
+LIVE_SAMPLES_PER_UNIT = 20
 
 @callback(
     [Output('predprey-time-graph', 'figure'),
      Output('predprey-phase-graph', 'figure'),
-     Output('predprey-result', 'children')],
+     Output('predprey-result', 'children'),
+     Output('predprey-live-store', 'data'),
+     Output('predprey-live-interval', 'disabled'),
+     Output('predprey-live-run-store', 'data')],
     [Input('predprey-x0-input', 'value'),
      Input('predprey-y0-input', 'value'),
      Input('predprey-alpha-input', 'value'),
      Input('predprey-beta-input', 'value'),
      Input('predprey-gamma-input', 'value'),
      Input('predprey-delta-input', 'value'),
-     Input('predprey-time-max-input', 'value')]
+     Input('predprey-time-max-input', 'value'),
+     Input('predprey-live-input', 'value')],
+    [State('predprey-time-input', 'value'),
+     State('predprey-live-run-store', 'data')]
 )
-def update_predprey_graph(x0, y0, alpha, beta, gamma, delta, t_max):
+@timed
+def update_predprey_graph(x0, y0, alpha, beta, gamma, delta, t_max, live=(), t_eval=None, run=None):
+    # Cada llamada empieza una ejecución nueva: los tramos en vivo que sigan en
+    # vuelo de la anterior se descartan (ver advance_predprey_live)
+    run = live_run_id(run, [x0, y0, alpha, beta, gamma, delta, t_max, bool(live)])
     if None in (x0, y0, alpha, beta, gamma, delta, t_max):
-        return dash.no_update, dash.no_update, ""
+        return dash.no_update, dash.no_update, "", dash.no_update, True, run
 
     if any(v <= 0 for v in [x0, y0, alpha, beta, gamma, delta]):
-        return dash.no_update, dash.no_update, "⚠️ Todos los parámetros deben ser > 0"
+        return dash.no_update, dash.no_update, "⚠️ Todos los parámetros deben ser > 0", dash.no_update, True, run
 
-    t_eval = np.linspace(0, t_max, 500)
+    checkpoint('validation')
 
+    live_state = None
     try:
-        sol = solve_ivp(
-            lotka_volterra,
-            [0, t_max],
-            [x0, y0],
-            args=(alpha, beta, gamma, delta),
-            t_eval=t_eval,
-            method='RK45',
-            rtol=1e-6
-        )
+        if live:
+            # Solo el primer tramo: el resto llega con extendData desde advance_predprey_live
+            dt = live_sample_dt(t_max)
+            t, (x, y), progress = advance(
+                'lotka_volterra', {'t': 0.0, 'y': [x0, y0]}, t_max, dt,
+                (alpha, beta, gamma, delta), budget=LIVE_BUDGET_S, **SOLVER_OPTIONS
+            )
+            if not t.size:
+                # Ningún paso terminó dentro del presupuesto: las gráficas empiezan
+                # con la muestra 0 (el estado inicial) y el resto llega por tramos
+                t, x, y = np.array([0.0]), np.array([float(x0)]), np.array([float(y0)])
+                progress = dict(progress, index=1)
+            live_state = dict(progress, params=[alpha, beta, gamma, delta], t_max=t_max, dt=dt, run=run)
+            t_point = x_point = y_point = None
+        else:
+            trajectory = solve(x0, y0, alpha, beta, gamma, delta, t_max)
+            if not trajectory.success:
+                return dash.no_update, dash.no_update, "⚠️ La integración falló. Intenta con otros parámetros.", None, True, run
+            t, (x, y) = trajectory.sample(500)
+            t_point, x_point, y_point = marker(trajectory, t_eval, t_max)
     except Exception as e:
-        return dash.no_update, dash.no_update, f"⚠️ Error en integración: {str(e)}"
-
-    if not sol.success:
-        return dash.no_update, dash.no_update, "⚠️ La integración falló. Intenta con otros parámetros."
+        return dash.no_update, dash.no_update, f"⚠️ Error en integración: {str(e)}", None, True, run
 
-    t = sol.t
-    x = sol.y[0]
-    y = sol.y[1]
+    checkpoint('compute')
 
     fig_time = go.Figure()
     fig_time.add_trace(go.Scatter(x=t, y=x, mode='lines', name='Presas (x)', line=dict(color='green', width=2)))
     fig_time.add_trace(go.Scatter(x=t, y=y, mode='lines', name='Depredadores (y)', line=dict(color='red', width=2)))
+    fig_time.add_trace(go.Scatter(x=[t_point, t_point], y=[x_point, y_point], mode='markers',
+                                  marker=dict(color=['green', 'red'], size=10, symbol='circle-open', line=dict(width=2)),
+                                  name='t evaluado', hovertemplate="t = %{x:.3g}<br>%{y:.4g}<extra></extra>"))
     fig_time.update_layout(
         title="Poblaciones a lo largo del tiempo",
         xaxis_title="Tiempo (t)",
@@ -196,6 +239,38 @@ def update_predprey_graph(x0, y0, alpha, beta, gamma, delta, t_max):
     fig_phase = go.Figure()
     fig_phase.add_trace(go.Scatter(x=x, y=y, mode='lines', line=dict(color='purple', width=2)))
     fig_phase.add_trace(go.Scatter(x=[x[0]], y=[y[0]], mode='markers', marker=dict(color='blue', size=8), name='Inicio'))
+    fig_phase.add_trace(go.Scatter(x=[x_point], y=[y_point], mode='markers',
+                                   marker=dict(color='orange', size=10, symbol='diamond'), name='t evaluado'))
+
+    # Equilibrios calculados a partir de los parámetros y su comportamiento linealizado
+    equilibria, jacobians, eigenvalues, kinds = analyze('lotka_volterra', (alpha, beta, gamma, delta))
+    fig_phase.add_trace(go.Scatter(
+        x=equilibria[:, 0], y=equilibria[:, 1], mode='markers',
+        marker=dict(color='black', size=10, symbol='x'),
+        text=[KIND_LABELS[int(kind)] for kind in kinds],
+        hovertemplate="(%{x:.3g}, %{y:.3g})<br>%{text}<extra></extra>",
+        name='Equilibrios'
+    ))
+
+    # Alrededor de la coexistencia: órbita del sistema lineal desde (x₀, y₀), un periodo
+    omega = np.abs(eigenvalues[1].imag).max()
+    t_lin = np.linspace(0, 2 * np.pi / omega if omega > 0 else t_max, 200)
+    orbit = linearized_orbit(jacobians[1], equilibria[1], [x0 - equilibria[1][0], y0 - equilibria[1][1]], t_lin)
+    fig_phase.add_trace(go.Scatter(
+        x=orbit[:, 0], y=orbit[:, 1], mode='lines',
+        line=dict(color='gray', width=1, dash='dash'),
+        name='Linealización'
+    ))
+
+    # En el origen (punto silla): direcciones propias estable e inestable
+    values, vectors = np.linalg.eig(jacobians[0])
+    reach = 0.5 * max(x.max(), y.max())
+    for value, vector in zip(values.real, vectors.T.real):
+        fig_phase.add_trace(go.Scatter(
+            x=[0, reach * abs(vector[0])], y=[0, reach * abs(vector[1])], mode='lines',
+            line=dict(color='blue' if value < 0 else 'red', width=1, dash='dot'),
+            name='Dirección estable' if value < 0 else 'Dirección inestable'
+        ))
     fig_phase.update_layout(
         title="Diagrama de Fase: Presas vs Depredadores",
         xaxis_title="Presas (x)",
@@ -208,4 +283,190 @@ def update_predprey_graph(x0, y0, alpha, beta, gamma, delta, t_max):
     fig_phase.update_xaxes(showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
     fig_phase.update_yaxes(showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
 
-    return fig_time, fig_phase, f" Simulación completada hasta t = {t_max}"
\ No newline at end of file
+    checkpoint('figure')
+
+    if live_state is not None:
+        return fig_time, fig_phase, live_text(live_state), live_state, live_state['done'], run
+    return fig_time, fig_phase, result_text(t_max, t_point, x_point, y_point), None, True, run
+
+
+def solve(x0, y0, alpha, beta, gamma, delta, t_max):
+    # Dentro de la caja del atlas y con error estimado aceptable no se integra
+    trajectory = lookup(x0, y0, alpha, beta, gamma, delta, t_max, SOLVER_OPTIONS)
+    if trajectory is not None:
+        return trajectory
+    return integrate('lotka_volterra', [x0, y0], t_max, (alpha, beta, gamma, delta), **SOLVER_OPTIONS)
+
+
+def marker(trajectory, t_eval, t_max):
+    # El marcador se evalúa con el interpolante de la integración, sin integrar de nuevo
+    if t_eval is None or t_eval < 0:
+        return None, None, None
+    t_eval = min(t_eval, t_max)
+    x_point, y_point = trajectory(t_eval)
+    return t_eval, x_point, y_point
+
+
+def result_text(t_max, t_point, x_point, y_point):
+    text = f" Simulación completada hasta t = {t_max}"
+    if t_point is not None:
+        text += f" · x({t_point:g}) = {x_point:.4g}, y({t_point:g}) = {y_point:.4g}"
+    return text
+
+
+def live_sample_dt(t_max):
+    return t_max / max(500, t_max * LIVE_SAMPLES_PER_UNIT)
+
+
+def live_run_id(previous, params):
+    # Contador (dos ejecuciones con los mismos parámetros son distintas) y huella
+    # de los parámetros
+    count = int(previous.split(':')[0]) + 1 if previous else 1
+    digest = hashlib.sha256(json.dumps(params).encode()).hexdigest()[:12]
+    return f'{count}:{digest}'
+
+
+def live_text(live_state):
+    if live_state['done']:
+        return f" Simulación completada hasta t = {live_state['t_max']}"
+    return f" Simulando en vivo… t = {live_state['t']:.4g} / {live_state['t_max']}"
+
+
+# Cada tramo llega primero a predprey-live-chunk-store con el id de su ejecución.
+# Si los parámetros cambian mientras un tramo está en vuelo, el servidor no puede
+# saberlo (leyó el id al recibir la petición): el navegador compara el id del
+# tramo con el de la ejecución actual al recibirlo y descarta el que no coincide,
+# sin extender las gráficas nuevas ni devolver el estado viejo al store.
+APPLY_LIVE_CHUNK = """
+function(chunk, run) {
+    const skip = window.dash_clientside.no_update;
+    if (!chunk || chunk.run !== run) {
+        return [skip, skip, skip, skip, skip];
+    }
+    const state = chunk.state;
+    return [chunk.time || skip, chunk.phase || skip, state, !state || state.done, chunk.text];
+}
+"""
+
+
+@callback(
+    Output('predprey-live-chunk-store', 'data'),
+    Input('predprey-live-interval', 'n_intervals'),
+    [State('predprey-live-store', 'data'),
+     State('predprey-live-run-store', 'data'),
+     State('predprey-window-input', 'value')],
+    prevent_initial_call=True
+)
+@timed
+def advance_predprey_live(n_intervals, live_state, run, window):
+    if not live_state or live_state['done'] or live_state.get('run') != run:
+        return dash.no_update
+    checkpoint('validation')
+
+    # El estado del integrador viaja en el navegador: cualquier worker puede seguir
+    try:
+        t, (x, y), progress = advance(
+            'lotka_volterra', live_state, live_state['t_max'], live_state['dt'],
+            live_state['params'], budget=LIVE_BUDGET_S, **SOLVER_OPTIONS
+        )
+    except Exception as e:
+        return {'run': run, 'time': None, 'phase': None, 'state': None, 'text': f"⚠️ Error en integración: {str(e)}"}
+    live_state = dict(live_state, **progress)
+    checkpoint('compute')
+
+    # Con ventana, el navegador conserva solo los últimos puntos de cada traza
+    t, x, y = t.tolist(), x.tolist(), y.tolist()
+    max_points = int(np.ceil(window / live_state['dt'])) + 1 if window else None
+    time_data = [dict(x=[t, t], y=[x, y]), [0, 1]]
+    phase_data = [dict(x=[x], y=[y]), [0]]
+    if max_points:
+        time_data.append(max_points)
+        phase_data.append(max_points)
+    checkpoint('figure')
+
+    return {'run': run, 'time': time_data, 'phase': phase_data, 'state': live_state, 'text': live_text(live_state)}
+
+
+clientside_callback(
+    APPLY_LIVE_CHUNK,
+    [Output('predprey-time-graph', 'extendData'),
+     Output('predprey-phase-graph', 'extendData'),
+     Output('predprey-live-store', 'data', allow_duplicate=True),
+     Output('predprey-live-interval', 'disabled', allow_duplicate=True),
+     Output('predprey-result', 'children', allow_duplicate=True)],
+    Input('predprey-live-chunk-store', 'data'),
+    State('predprey-live-run-store', 'data'),
+    prevent_initial_call=True
+)
+
+
+# Los índices de las trazas del marcador en cada figura (ver update_predprey_graph)
+TIME_MARKER_TRACE = 2
+PHASE_MARKER_TRACE = 2
+
+@callback(
+    [Output('predprey-time-graph', 'figure', allow_duplicate=True),
+     Output('predprey-phase-graph', 'figure', allow_duplicate=True),
+     Output('predprey-result', 'children', allow_duplicate=True)],
+    Input('predprey-time-input', 'value'),
+    [State('predprey-live-input', 'value'),
+     State('predprey-x0-input', 'value'),
+     State('predprey-y0-input', 'value'),
+     State('predprey-alpha-input', 'value'),
+     State('predprey-beta-input', 'value'),
+     State('predprey-gamma-input', 'value'),
+     State('predprey-delta-input', 'value'),
+     State('predprey-time-max-input', 'value')],
+    prevent_initial_call=True
+)
+@timed
+def update_predprey_marker(t_eval, live, x0, y0, alpha, beta, gamma, delta, t_max):
+    # En vivo no hay trayectoria completa que consultar
+    if live or None in (t_eval, x0, y0, alpha, beta, gamma, delta, t_max) or t_eval < 0:
+        return dash.no_update, dash.no_update, dash.no_update
+    if any(v <= 0 for v in [x0, y0, alpha, beta, gamma, delta]):
+        return dash.no_update, dash.no_update, dash.no_update
+    checkpoint('validation')
+
+    # Con los mismos parámetros la integración ya está en caché
+    trajectory = solve(x0, y0, alpha, beta, gamma, delta, t_max)
+    if not trajectory.success:
+        return dash.no_update, dash.no_update, dash.no_update
+    t_point, x_point, y_point = marker(trajectory, t_eval, t_max)
+    checkpoint('compute')
+
+    time_patch = Patch()
+    time_patch['data'][TIME_MARKER_TRACE]['x'] = [t_point, t_point]
+    time_patch['data'][TIME_MARKER_TRACE]['y'] = [x_point, y_point]
+    phase_patch = Patch()
+    phase_patch['data'][PHASE_MARKER_TRACE]['x'] = [x_point]
+    phase_patch['data'][PHASE_MARKER_TRACE]['y'] = [y_point]
+    checkpoint('figure')
+
+    return time_patch, phase_patch, result_text(t_max, t_point, x_point, y_point)
+
+
+@callback(
+    Output('predprey-critical-points', 'children'),
+    [Input('predprey-alpha-input', 'value'),
+     Input('predprey-beta-input', 'value'),
+     Input('predprey-gamma-input', 'value'),
+     Input('predprey-delta-input', 'value')]
+)
+@timed
+def update_predprey_critical_points(alpha, beta, gamma, delta):
+    if None in (alpha, beta, gamma, delta) or min(alpha, beta, gamma, delta) <= 0:
+        return dash.no_update
+    return describe('lotka_volterra', (alpha, beta, gamma, delta), '(x, y)')
+
+
+URL_STATE = register(__name__, {
+    'x0': 'predprey-x0-input',
+    'y0': 'predprey-y0-input',
+    'alpha': 'predprey-alpha-input',
+    'beta': 'predprey-beta-input',
+    'gamma': 'predprey-gamma-input',
+    'delta': 'predprey-delta-input',
+    't_max': 'predprey-time-max-input',
+    't': 'predprey-time-input',
+}, figure=lambda v: update_predprey_graph(v['x0'], v['y0'], v['alpha'], v['beta'], v['gamma'], v['delta'], v['t_max'], (), v['t'])[:3])
@@ -0,0 +1,242 @@
+import dash
+from dash import dcc, html, Input, Output, State, callback, ctx
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+import numpy as np
+from bifurcation import bifurcation_density, iterate_logistic_map
+from equations import equation_src
+from metrics import checkpoint, timed
+from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
+
+dash.register_page(__name__, name='Mapa Logístico')
+
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Mapa Logístico y Diagrama de Bifurcación", className="card-title text-center mb-4"),
+            html.P(
+                "Versión discreta del modelo logístico: la población se actualiza por generaciones. Al aumentar r, el equilibrio se desdobla en ciclos de periodo 2, 4, 8, ... hasta llegar al caos.",
+                className="text-center"
+            ),
+            html.Hr(),
+
+            # Ecuaciones
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Ecuación en Diferencias", className="card-title text-center"),
+                    html.Div(
+                        html.Img(src=equation_src(r"x_{n+1}=rx_n(1-x_n)"),
+                                 style={'height': '40px', 'display': 'block', 'margin': '10px auto'}),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Puntos Fijos", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **x = 0:** Estable para 0 < r < 1.
+                        * **x = 1 − 1/r:** Estable para 1 < r < 3.
+                        * **r ≈ 3.5699:** Acumulación de duplicaciones de periodo (inicio del caos).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+
+            dbc.Row([
+                dbc.Col(
+                    dbc.Card(dbc.CardBody([
+                        html.H5("Descripción de Variables", className="card-title text-center"),
+                        dcc.Markdown("""
+                            * **xₙ:** Población relativa (fracción de la capacidad) en la generación n.
+                            * **r:** Tasa de crecimiento (0 ≤ r ≤ 4).
+                            * **Transitorio:** Iteraciones descartadas antes de registrar la órbita.
+                            * **Iteraciones:** Valores registrados por cada r en el diagrama.
+                        """, style={'paddingLeft': '20px'})
+                    ]), style=INFO_CARD_STYLE)
+                ),
+            ], className="mb-4"),
+
+            html.Hr(className="my-4"),
+
+            # Parámetros y gráficos
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
+
+                    dbc.Label("r mínimo:", className="small"),
+                    dcc.Input(id='logmap-r-min-input', type='number', value=2.5, min=0, max=4, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("r máximo:", className="small"),
+                    dcc.Input(id='logmap-r-max-input', type='number', value=4, min=0, max=4, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("Iteraciones de Transitorio:", className="small"),
+                    dcc.Input(id='logmap-transient-input', type='number', value=500, min=0, max=10000, step=100,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("Iteraciones Registradas:", className="small"),
+                    dcc.Input(id='logmap-keep-input', type='number', value=300, min=10, max=5000, step=50,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("r para la Serie Temporal:", className="small"),
+                    dcc.Input(id='logmap-r-input', type='number', value=3.7, min=0, max=4, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    html.Div(id='logmap-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
+
+                dbc.Col([
+                    dcc.Tabs([
+                        dcc.Tab(label='Diagrama de Bifurcación', children=[
+                            dcc.Graph(id='logmap-bifurcation-graph', style={'height': '100%'}),
+                            # Ventana dibujada [r_lo, r_hi, x_lo, x_hi], para los ejes que un zoom no menciona
+                            dcc.Store(id='logmap-window-store'),
+                        ]),
+                        dcc.Tab(label='Serie Temporal', children=[
+                            dcc.Graph(id='logmap-series-graph', style={'height': '100%'})
+                        ])
+                    ])
+                ], md=9),
+            ], align="start", className="mt-4"),
+        ]),
+        className="m-4",
+    )
+
+    return URL_STATE.apply(html.Div(
+        page_content,
+        style={'fontFamily': 'Outfit, sans-serif'}
+    ), kwargs)
+
+
+def _axis_range(relayout, axis, previous, full):
+    # Plotly envía 'xaxis.range[0]'/'xaxis.range[1]' o, en algunos relayouts,
+    # la lista 'xaxis.range'; autorange restablece el eje a la vista completa.
+    # Un eje que el relayout no menciona conserva la ventana anterior
+    if relayout.get(f'{axis}.autorange'):
+        return full
+    low, high = relayout.get(f'{axis}.range') or previous
+    return relayout.get(f'{axis}.range[0]', low), relayout.get(f'{axis}.range[1]', high)
+
+
+def _zoom_window(relayout, window, r_min, r_max):
+    # Ventana visible tras un zoom; `window` es la dibujada antes (None: la completa)
+    r_lo, r_hi, x_lo, x_hi = window or (r_min, r_max, 0.0, 1.0)
+    r_lo, r_hi = _axis_range(relayout, 'xaxis', (r_lo, r_hi), (r_min, r_max))
+    x_lo, x_hi = _axis_range(relayout, 'yaxis', (x_lo, x_hi), (0.0, 1.0))
+    return max(r_lo, 0.0), min(r_hi, 4.0), max(x_lo, 0.0), min(x_hi, 1.0)
+
+
+@callback(
+    [Output('logmap-bifurcation-graph', 'figure'),
+     Output('logmap-result', 'children'),
+     Output('logmap-window-store', 'data')],
+    [Input('logmap-r-min-input', 'value'),
+     Input('logmap-r-max-input', 'value'),
+     Input('logmap-transient-input', 'value'),
+     Input('logmap-keep-input', 'value'),
+     Input('logmap-bifurcation-graph', 'relayoutData')],
+    State('logmap-window-store', 'data')
+)
+@timed
+def update_bifurcation_graph(r_min, r_max, n_transient, n_keep, relayout, window=None):
+    if None in (r_min, r_max, n_transient, n_keep):
+        return dash.no_update, "", dash.no_update
+
+    if not 0 <= r_min < r_max <= 4:
+        return dash.no_update, "⚠️ Asegúrate de que 0 ≤ r mínimo < r máximo ≤ 4", dash.no_update
+
+    # Solo el zoom usa la ventana visible; cambiar un parámetro restablece la vista
+    if relayout and ctx.triggered_id == 'logmap-bifurcation-graph':
+        if not any(key.startswith(('xaxis', 'yaxis')) for key in relayout):
+            return dash.no_update, dash.no_update, dash.no_update
+        r_lo, r_hi, x_lo, x_hi = _zoom_window(relayout, window, r_min, r_max)
+    else:
+        r_lo, r_hi, x_lo, x_hi = r_min, r_max, 0.0, 1.0
+
+    if r_lo >= r_hi or x_lo >= x_hi:
+        return dash.no_update, dash.no_update, dash.no_update
+    checkpoint('validation')
+
+    r, x, density = bifurcation_density(
+        float(r_lo), float(r_hi), float(x_lo), float(x_hi),
+        n_transient=int(n_transient), n_keep=int(n_keep)
+    )
+
+    # Densidad en escala logarítmica cuantizada a 8 bits: Plotly serializa los
+    # arreglos uint8 como binario, lo que reduce el JSON unas ocho veces
+    level = np.log1p(density)
+    z = np.round(255 * level / max(level.max(), 1e-12)).astype(np.uint8)
+    checkpoint('compute')
+
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=r, y=x, z=z,
+        colorscale='Inferno', reversescale=True, showscale=False,
+        hovertemplate="r = %{x:.4f}<br>x = %{y:.4f}<extra></extra>"
+    ))
+
+    fig.update_layout(
+        title_text="Diagrama de Bifurcación: xₙ₊₁ = r xₙ (1 − xₙ)",
+        title_x=0.5,
+        xaxis_title="Tasa de crecimiento (r)",
+        yaxis_title="Valores visitados (x)",
+        template="plotly_white",
+        height=550,
+        font=dict(family="Outfit, sans-serif"),
+        margin=dict(l=40, r=20, t=60, b=40),
+        plot_bgcolor='white'
+    )
+
+    fig.update_xaxes(showline=True, linewidth=2, linecolor='black', range=[r_lo, r_hi])
+    fig.update_yaxes(showline=True, linewidth=2, linecolor='black', range=[x_lo, x_hi])
+
+    checkpoint('figure')
+
+    total = len(r) * (int(n_transient) + int(n_keep))
+    return fig, f" {total:,} iteraciones en r ∈ [{r_lo:.4f}, {r_hi:.4f}]", [r_lo, r_hi, x_lo, x_hi]
+
+
+@callback(
+    Output('logmap-series-graph', 'figure'),
+    Input('logmap-r-input', 'value')
+)
+@timed
+def update_series_graph(r):
+    if r is None or not 0 <= r <= 4:
+        return dash.no_update
+
+    x = iterate_logistic_map(np.array([r]), n_transient=0, n_keep=100)[:, 0]
+    n = np.arange(1, len(x) + 1)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=n, y=x, mode='lines+markers',
+        line=dict(color='purple', width=1),
+        marker=dict(size=5),
+        name='xₙ'
+    ))
+
+    fig.update_layout(
+        title_text=f"Serie Temporal para r = {r}",
+        title_x=0.5,
+        xaxis_title="Generación (n)",
+        yaxis_title="Población relativa (xₙ)",
+        template="plotly_white",
+        height=550,
+        font=dict(family="Outfit, sans-serif"),
+        margin=dict(l=40, r=20, t=60, b=40),
+        plot_bgcolor='lavender'
+    )
+
+    fig.update_xaxes(showline=True, linewidth=2, linecolor='black', gridcolor='lightgray')
+    fig.update_yaxes(showline=True, linewidth=2, linecolor='black', gridcolor='lightgray', range=[0, 1])
+
+    return fig
+
+
+URL_STATE = register(__name__, {
+    'r_min': 'logmap-r-min-input',
+    'r_max': 'logmap-r-max-input',
+    'transient': 'logmap-transient-input',
+    'keep': 'logmap-keep-input',
+    'r': 'logmap-r-input',
+}, figure=lambda v: update_bifurcation_graph(v['r_min'], v['r_max'], v['transient'], v['keep'], None))
@@ -0,0 +1,218 @@
+import dash
+from dash import dcc, html, Input, Output, callback
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+import numpy as np
+from itertools import combinations
+from kernels import MODEL_PARAMETERS, compare_models, time_to_fraction, to_linear
+from metrics import checkpoint, timed
+from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
+
+dash.register_page(__name__, name='Comparación de Modelos')
+
+MODEL_COLORS = {
+    'Exponencial': 'blue',
+    'Logístico': 'orange',
+    'Gompertz': 'green',
+    'Richards': 'purple',
+}
+
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Comparación de Modelos de Crecimiento", className="card-title text-center mb-4"),
+            html.P(
+                "Superpone los modelos exponencial, logístico, de Gompertz y de Richards con los mismos P₀, r y K para ver cuándo y cuánto difieren.",
+                className="text-center"
+            ),
+            html.Hr(),
+
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("¿Qué se compara?", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Curvas:** P(t) de cada modelo en la misma malla de tiempo.
+                        * **Diferencias:** Pᵢ(t) − Pⱼ(t) para cada par de modelos.
+                        * **Tiempos característicos:** Instante en que cada curva alcanza una fracción de K.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Descripción de Variables", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **P₀:** Población inicial (en t=0).
+                        * **r:** Tasa de crecimiento intrínseca.
+                        * **K:** Capacidad de carga (no aplica al exponencial).
+                        * **ν:** Parámetro de forma (solo Richards).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+
+            html.Hr(className="my-4"),
+
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
+
+                    dbc.Label("Población Inicial (P₀):", className="small"),
+                    dcc.Input(id='compare-initial-pop-input', type='number', value=10, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("Tasa de Crecimiento (r):", className="small"),
+                    dcc.Input(id='compare-rate-input', type='number', value=0.3, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("Capacidad de Carga (K):", className="small"),
+                    dcc.Input(id='compare-k-input', type='number', value=100, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("Parámetro de Forma (ν):", className="small"),
+                    dcc.Input(id='compare-nu-input', type='number', value=0.5, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
+                    dcc.Input(id='compare-time-max-input', type='number', value=30, min=1, step=0.5,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    dbc.Label("Fracciones de K (separadas por comas):", className="small"),
+                    dcc.Input(id='compare-fractions-input', type='text', value="0.1, 0.5, 0.9", debounce=True,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    html.Div(id='compare-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
+
+                dbc.Col([
+                    dcc.Tabs([
+                        dcc.Tab(label='Curvas', children=[
+                            dcc.Graph(id='compare-curves-graph', style={'height': '100%'})
+                        ]),
+                        dcc.Tab(label='Diferencias por Pares', children=[
+                            dcc.Graph(id='compare-diff-graph', style={'height': '100%'})
+                        ]),
+                        dcc.Tab(label='Tiempos hasta f·K', children=[
+                            html.Div(id='compare-times-table', className="p-3")
+                        ])
+                    ])
+                ], md=9),
+            ], align="start", className="mt-4"),
+        ]),
+        className="m-4",
+    )
+
+    return URL_STATE.apply(html.Div(
+        page_content,
+        style={'fontFamily': 'Outfit, sans-serif'}
+    ), kwargs)
+
+
+def _parse_fractions(text):
+    try:
+        fractions = sorted({float(v) for v in (text or "").replace(';', ',').split(',') if v.strip()})
+    except ValueError:
+        return None
+    if not fractions or any(not 0 < f < 1 for f in fractions):
+        return None
+    return fractions
+
+
+def _style_figure(fig, title, yaxis_title, bgcolor):
+    fig.update_layout(
+        title_text=title,
+        title_x=0.5,
+        xaxis_title="Tiempo (t)",
+        yaxis_title=yaxis_title,
+        template="plotly_white",
+        height=550,
+        font=dict(family="Outfit, sans-serif"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=20, t=60, b=40),
+        plot_bgcolor=bgcolor
+    )
+    fig.update_xaxes(showline=True, linewidth=2, linecolor='black', gridcolor='lightgray')
+    fig.update_yaxes(showline=True, linewidth=2, linecolor='black', gridcolor='lightgray')
+    return fig
+
+
+@callback(
+    [Output('compare-curves-graph', 'figure'),
+     Output('compare-diff-graph', 'figure'),
+     Output('compare-times-table', 'children'),
+     Output('compare-result', 'children')],
+    [Input('compare-initial-pop-input', 'value'),
+     Input('compare-rate-input', 'value'),
+     Input('compare-k-input', 'value'),
+     Input('compare-nu-input', 'value'),
+     Input('compare-time-max-input', 'value'),
+     Input('compare-fractions-input', 'value')]
+)
+@timed
+def update_comparison_graph(p0, r, k, nu, t_max, fractions_text):
+    if None in (p0, r, k, nu, t_max):
+        return dash.no_update, dash.no_update, dash.no_update, ""
+
+    if p0 <= 0 or k <= 0 or p0 >= k:
+        return dash.no_update, dash.no_update, dash.no_update, "⚠️ Asegúrate de que 0 < P₀ < K"
+    if r <= 0 or nu <= 0:
+        return dash.no_update, dash.no_update, dash.no_update, "⚠️ r y ν deben ser > 0"
+
+    fractions = _parse_fractions(fractions_text)
+    if fractions is None:
+        return dash.no_update, dash.no_update, dash.no_update, "⚠️ Las fracciones deben estar entre 0 y 1"
+
+    checkpoint('validation')
+
+    params = {'p0': p0, 'r': r, 'k': k, 'nu': nu}
+    t, log_curves = compare_models(params, t_max)
+    curves = {model: to_linear(log_p) for model, log_p in log_curves.items()}
+    checkpoint('compute')
+
+    fig_curves = go.Figure()
+    for model, P in curves.items():
+        fig_curves.add_trace(go.Scatter(
+            x=t, y=P, mode='lines',
+            line=dict(color=MODEL_COLORS[model], width=2),
+            name=model
+        ))
+    fig_curves.add_hline(y=k, line_dash="dot", line_color="gray", annotation_text="K (capacidad)",
+                         annotation_position="bottom right")
+    _style_figure(fig_curves, "Modelos de crecimiento con P₀, r y K comunes", "Población (P)", 'lightblue')
+    # El exponencial supera a K muy pronto: se recorta el eje para que los
+    # modelos acotados sigan siendo legibles
+    fig_curves.update_yaxes(range=[0, 1.2 * k])
+    fig_curves.update_xaxes(range=[0, t_max])
+
+    fig_diff = go.Figure()
+    for a, b in combinations(curves, 2):
+        diff = curves[a] - curves[b]
+        fig_diff.add_trace(go.Scatter(
+            x=t, y=np.where(np.isfinite(diff), diff, np.nan), mode='lines',
+            line=dict(width=2, dash='solid' if 'Exponencial' not in (a, b) else 'dot'),
+            name=f"{a} − {b}"
+        ))
+    _style_figure(fig_diff, "Diferencias por pares: Pᵢ(t) − Pⱼ(t)", "Diferencia de población", 'lavender')
+    fig_diff.update_yaxes(range=[-k, k])
+    fig_diff.update_xaxes(range=[0, t_max])
+
+    header = html.Thead(html.Tr([html.Th("Modelo")] + [html.Th(f"t({f:g}·K)") for f in fractions]))
+    rows = []
+    for model in MODEL_PARAMETERS:
+        times = time_to_fraction(model, fractions, p0, r, k, nu)
+        rows.append(html.Tr([html.Td(model)] + [
+            html.Td("—" if np.isnan(value) else f"{value:.2f}") for value in times
+        ]))
+    table = dbc.Table([header, html.Tbody(rows)], bordered=True, hover=True, striped=True,
+                      className="text-center")
+
+    checkpoint('figure')
+
+    return fig_curves, fig_diff, table, f" Modelos evaluados hasta t = {t_max}"
+
+
+URL_STATE = register(__name__, {
+    'p0': 'compare-initial-pop-input',
+    'r': 'compare-rate-input',
+    'K': 'compare-k-input',
+    'nu': 'compare-nu-input',
+    't_max': 'compare-time-max-input',
+    'fractions': 'compare-fractions-input',
+}, figure=lambda v: update_comparison_graph(v['p0'], v['r'], v['K'], v['nu'], v['t_max'], v['fractions']))
@@ -0,0 +1,400 @@
+import dash
+from dash import dcc, html, Input, Output, callback
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+import numpy as np
+from equations import equation_src
+from metrics import checkpoint, timed
+from simulation import integrate
+from stability import KIND_LABELS, STABLE, STABLE_FOCUS, analyze, analyze_arrays, describe, field
+from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
+
+dash.register_page(__name__, name='Modelo de Competencia')
+
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Modelo de Competencia (Lotka-Volterra)", className="card-title text-center mb-4"),
+            html.P(
+                "Modelo que describe cómo dos especies compiten por recursos limitados. El resultado puede ser coexistencia, exclusión competitiva o dependencia de las condiciones iniciales.",
+                className="text-center"
+            ),
+            html.Hr(),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Ecuaciones Diferenciales", className="card-title text-center"),
+                    html.Div(
+                        html.Img(
+                            src=equation_src(r"\begin{cases}\frac{dN_1}{dt}=r_1N_1\left(1-\frac{N_1+\alpha_{12}N_2}{K_1}\right)\\\frac{dN_2}{dt}=r_2N_2\left(1-\frac{N_2+\alpha_{21}N_1}{K_2}\right)\end{cases}"),
+                            style={'height': '80px', 'display': 'block', 'margin': '10px auto'}
+                        ),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Posibles Resultados", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Especie 1 gana:** N₂ → 0.
+                        * **Especie 2 gana:** N₁ → 0.
+                        * **Coexistencia estable:** ambas persisten.
+                        * **Depende de las condiciones iniciales** (biestabilidad).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("¿Cuándo se usa?", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Ecología:** Plantas compitiendo por luz y suelo.
+                        * **Microbiología:** Cepas bacterianas en cultivo.
+                        * **Conservación:** Especies invasoras frente a nativas.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Puntos de Equilibrio", className="card-title text-center"),
+                    dcc.Markdown(id='comp-critical-points', children="""
+                        * **(0, 0):** Extinción de ambas (inestable).
+                        * **(K₁, 0), (0, K₂):** Exclusión competitiva.
+                        * **Coexistencia:** estable si α₁₂ < K₁/K₂ y α₂₁ < K₂/K₁.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+
+            dbc.Row([
+                dbc.Col(
+                    dbc.Card(dbc.CardBody([
+                        html.H5("Descripción de Variables", className="card-title text-center"),
+                        dcc.Markdown("""
+                            * **N₁(t), N₂(t):** Poblaciones de cada especie en el tiempo t.
+                            * **r₁, r₂:** Tasas de crecimiento intrínsecas.
+                            * **K₁, K₂:** Capacidades de carga.
+                            * **α₁₂:** Efecto de la especie 2 sobre la especie 1.
+                            * **α₂₁:** Efecto de la especie 1 sobre la especie 2.
+                        """, style={'paddingLeft': '20px'})
+                    ]), style=INFO_CARD_STYLE)
+                ),
+            ], className="mb-4"),
+
+            html.Hr(className="my-4"),
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
+
+                    html.H6("Especie 1", className="fw-bold mt-2"),
+                    dbc.Label("Población Inicial (N₁₀):", className="small"),
+                    dcc.Input(id='comp-n10-input', type='number', value=10, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("r₁ (crecimiento):", className="small"),
+                    dcc.Input(id='comp-r1-input', type='number', value=1.0, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("K₁ (capacidad de carga):", className="small"),
+                    dcc.Input(id='comp-k1-input', type='number', value=100, min=1, step=1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    html.H6("Especie 2", className="fw-bold mt-2"),
+                    dbc.Label("Población Inicial (N₂₀):", className="small"),
+                    dcc.Input(id='comp-n20-input', type='number', value=15, min=0.1, step=0.1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("r₂ (crecimiento):", className="small"),
+                    dcc.Input(id='comp-r2-input', type='number', value=0.8, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("K₂ (capacidad de carga):", className="small"),
+                    dcc.Input(id='comp-k2-input', type='number', value=80, min=1, step=1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    html.H6("Coeficientes de Competencia", className="fw-bold mt-2"),
+                    dbc.Label("α₁₂ (efecto de 2 en 1):", className="small"),
+                    dcc.Input(id='comp-alpha12-input', type='number', value=0.5, min=0, step=0.05,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("α₂₁ (efecto de 1 en 2):", className="small"),
+                    dcc.Input(id='comp-alpha21-input', type='number', value=0.6, min=0, step=0.05,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
+                    dcc.Input(id='comp-time-max-input', type='number', value=50, min=1, step=1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    html.Div(id='comp-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
+                dbc.Col([
+                    dcc.Tabs([
+                        dcc.Tab(label='Poblaciones vs Tiempo', children=[
+                            dcc.Graph(id='comp-time-graph', style={'height': '100%'})
+                        ]),
+                        dcc.Tab(label='Fase (N₁ vs N₂)', children=[
+                            dcc.Graph(id='comp-phase-graph', style={'height': '100%'})
+                        ]),
+                        dcc.Tab(label='Resultado según α₁₂ y α₂₁', children=[
+                            dcc.Graph(id='comp-outcome-graph', style={'height': '100%'})
+                        ])
+                    ])
+                ], md=9),
+            ], align="start", className="mt-4"),
+        ]),
+        className="m-4",
+    )
+
+    return URL_STATE.apply(html.Div(
+        page_content,
+        style={'fontFamily': 'Outfit, sans-serif'}
+    ), kwargs)
+
+# Opciones del integrador; los benchmarks las endurecen para medir el peor caso.
+# Las trayectorias terminan en un nodo estable: con tasas altas el tramo final
+# es rígido y LSODA cambia solo a BDF (RK45 tarda segundos con r = 50)
+SOLVER_OPTIONS = {'method': 'LSODA', 'rtol': 1e-6}
+
+# Plano de fase: flechas del campo en una malla FIELD_GRID × FIELD_GRID y
+# trayectorias desde ENSEMBLE_GRID × ENSEMBLE_GRID condiciones iniciales,
+# integradas juntas en una sola llamada
+FIELD_GRID = 15
+ENSEMBLE_GRID = 4
+OUTCOME_GRID = 120
+
+# Resultados de la competencia, en el orden de OUTCOME_LABELS
+COEXISTENCE, SPECIES_1, SPECIES_2, BISTABLE, UNDETERMINED = range(5)
+OUTCOME_LABELS = [
+    'Coexistencia estable',
+    'Gana la especie 1',
+    'Gana la especie 2',
+    'Biestabilidad (depende de N₀)',
+    'Caso límite',
+]
+OUTCOME_COLORS = ['#2A9D8F', '#E76F51', '#264653', '#E9C46A', '#BBBBBB']
+
+
+def outcome(equilibria, kinds):
+    # Vectorizado sobre cualquier malla: equilibrios (..., 4, 2) y tipos (..., 4)
+    # en el orden (0, 0), (K₁, 0), (0, K₂), coexistencia
+    stable = (kinds == STABLE) | (kinds == STABLE_FOCUS)
+    feasible = np.all(np.isfinite(equilibria) & (equilibria > 0), axis=-1)
+    coexistence = stable[..., 3] & feasible[..., 3]
+    species_1, species_2 = stable[..., 1], stable[..., 2]
+    return np.select(
+        [coexistence, species_1 & species_2, species_1, species_2],
+        [COEXISTENCE, BISTABLE, SPECIES_1, SPECIES_2],
+        UNDETERMINED
+    )
+
+
+@callback(
+    [Output('comp-time-graph', 'figure'),
+     Output('comp-phase-graph', 'figure'),
+     Output('comp-result', 'children')],
+    [Input('comp-n10-input', 'value'),
+     Input('comp-r1-input', 'value'),
+     Input('comp-k1-input', 'value'),
+     Input('comp-n20-input', 'value'),
+     Input('comp-r2-input', 'value'),
+     Input('comp-k2-input', 'value'),
+     Input('comp-alpha12-input', 'value'),
+     Input('comp-alpha21-input', 'value'),
+     Input('comp-time-max-input', 'value')]
+)
+@timed
+def update_competition_graph(n10, r1, k1, n20, r2, k2, alpha12, alpha21, t_max):
+    if None in (n10, r1, k1, n20, r2, k2, alpha12, alpha21, t_max):
+        return dash.no_update, dash.no_update, ""
+
+    if any(v <= 0 for v in [n10, r1, k1, n20, r2, k2, t_max]) or alpha12 < 0 or alpha21 < 0:
+        return dash.no_update, dash.no_update, "⚠️ Poblaciones, tasas y capacidades deben ser > 0 y α ≥ 0"
+
+    checkpoint('validation')
+
+    params = (r1, k1, r2, k2, alpha12, alpha21)
+    try:
+        trajectory = integrate('competencia', [n10, n20], t_max, params, **SOLVER_OPTIONS)
+        if not trajectory.success:
+            return dash.no_update, dash.no_update, "⚠️ La integración falló. Intenta con otros parámetros."
+        t, (n1, n2) = trajectory.sample(500)
+
+        # Ventana del plano de fase y trayectorias desde una malla de condiciones iniciales
+        x_max = 1.15 * max(k1, n10, n1.max())
+        y_max = 1.15 * max(k2, n20, n2.max())
+        fractions = np.linspace(0.05, 0.95, ENSEMBLE_GRID)
+        starts = np.stack(np.meshgrid(fractions * x_max, fractions * y_max), axis=-1).reshape(-1, 2)
+        ensemble = integrate('competencia', starts, t_max, params, **SOLVER_OPTIONS)
+        _, (ensemble_n1, ensemble_n2) = ensemble.sample(120)
+    except Exception as e:
+        return dash.no_update, dash.no_update, f"⚠️ Error en integración: {str(e)}"
+
+    equilibria, _, _, kinds = analyze('competencia', tuple(float(p) for p in params))
+    result = OUTCOME_LABELS[int(outcome(equilibria, kinds))]
+
+    # Campo de direcciones: segmentos de largo fijo en pantalla, normalizados por eje
+    grid_x, grid_y = np.meshgrid(np.linspace(0, x_max, FIELD_GRID), np.linspace(0, y_max, FIELD_GRID))
+    flow = field('competencia', np.stack([grid_x, grid_y], axis=-1), *params)
+    dx, dy = flow[..., 0] / x_max, flow[..., 1] / y_max
+    norm = np.hypot(dx, dy)
+    norm[norm == 0] = np.inf
+    scale = 0.6 / (FIELD_GRID - 1) / norm
+    tips_x, tips_y = grid_x + dx * scale * x_max, grid_y + dy * scale * y_max
+    # Los huecos son NaN y no None: así los arreglos siguen siendo float y
+    # Plotly los envía codificados en binario
+    gaps = np.full(grid_x.size, np.nan)
+    arrows_x = np.column_stack([grid_x.ravel(), tips_x.ravel(), gaps]).ravel()
+    arrows_y = np.column_stack([grid_y.ravel(), tips_y.ravel(), gaps]).ravel()
+
+    checkpoint('compute')
+
+    fig_time = go.Figure()
+    fig_time.add_trace(go.Scatter(x=t, y=n1, mode='lines', name='Especie 1 (N₁)', line=dict(color='#E76F51', width=2)))
+    fig_time.add_trace(go.Scatter(x=t, y=n2, mode='lines', name='Especie 2 (N₂)', line=dict(color='#264653', width=2)))
+    fig_time.add_hline(y=k1, line_dash="dot", line_color='#E76F51', annotation_text="K₁", annotation_position="top left")
+    fig_time.add_hline(y=k2, line_dash="dot", line_color='#264653', annotation_text="K₂", annotation_position="bottom left")
+    fig_time.update_layout(
+        title="Poblaciones a lo largo del tiempo",
+        xaxis_title="Tiempo (t)",
+        yaxis_title="Población",
+        template="plotly_white",
+        font=dict(family="Outfit, sans-serif"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=20, t=50, b=40),
+        plot_bgcolor='lightyellow'
+    )
+    fig_time.update_xaxes(showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+    fig_time.update_yaxes(showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+
+    fig_phase = go.Figure()
+    fig_phase.add_trace(go.Scatter(
+        x=arrows_x, y=arrows_y, mode='lines+markers',
+        line=dict(color='gray', width=1),
+        marker=dict(symbol='arrow', size=np.tile([0, 7, 0], grid_x.size), angleref='previous', color='gray'),
+        hoverinfo='skip', name='Campo de direcciones'
+    ))
+
+    # Trayectorias del conjunto en una sola traza, separadas por huecos
+    gaps = np.full((ensemble_n1.shape[0], 1), np.nan)
+    fig_phase.add_trace(go.Scatter(
+        x=np.hstack([ensemble_n1, gaps]).ravel(), y=np.hstack([ensemble_n2, gaps]).ravel(), mode='lines',
+        line=dict(color='lightslategray', width=1), opacity=0.6,
+        hoverinfo='skip', name='Otras condiciones iniciales'
+    ))
+
+    # Isoclinas no triviales: N₁ + α₁₂N₂ = K₁ (dN₁/dt = 0) y N₂ + α₂₁N₁ = K₂ (dN₂/dt = 0)
+    with np.errstate(divide='ignore'):
+        fig_phase.add_trace(go.Scatter(
+            x=[k1, 0], y=[0, k1 / alpha12 if alpha12 > 0 else 2 * y_max], mode='lines',
+            line=dict(color='#E76F51', width=2, dash='dash'), name='Isoclina dN₁/dt = 0'
+        ))
+        fig_phase.add_trace(go.Scatter(
+            x=[k2 / alpha21 if alpha21 > 0 else 2 * x_max, 0], y=[0, k2], mode='lines',
+            line=dict(color='#264653', width=2, dash='dash'), name='Isoclina dN₂/dt = 0'
+        ))
+
+    fig_phase.add_trace(go.Scatter(x=n1, y=n2, mode='lines', line=dict(color='purple', width=3), name='Trayectoria'))
+    fig_phase.add_trace(go.Scatter(x=[n10], y=[n20], mode='markers', marker=dict(color='blue', size=8), name='Inicio'))
+
+    # Equilibrios con poblaciones no negativas y su clasificación
+    shown = np.all(np.isfinite(equilibria) & (equilibria >= 0), axis=-1)
+    fig_phase.add_trace(go.Scatter(
+        x=equilibria[shown, 0], y=equilibria[shown, 1], mode='markers',
+        marker=dict(color='black', size=10, symbol='x'),
+        text=[KIND_LABELS[int(kind)] for kind in kinds[shown]],
+        hovertemplate="(%{x:.3g}, %{y:.3g})<br>%{text}<extra></extra>",
+        name='Equilibrios'
+    ))
+    fig_phase.update_layout(
+        title=f"Plano de Fase: {result}",
+        xaxis_title="Especie 1 (N₁)",
+        yaxis_title="Especie 2 (N₂)",
+        template="plotly_white",
+        font=dict(family="Outfit, sans-serif"),
+        margin=dict(l=40, r=20, t=50, b=40),
+        plot_bgcolor='lightcyan'
+    )
+    fig_phase.update_xaxes(range=[0, x_max], showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+    fig_phase.update_yaxes(range=[0, y_max], showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+
+    checkpoint('figure')
+
+    text = f" Simulación completada hasta t = {t_max} · N₁ = {n1[-1]:.4g}, N₂ = {n2[-1]:.4g} · {result}"
+    return fig_time, fig_phase, text
+
+
+@callback(
+    Output('comp-outcome-graph', 'figure'),
+    [Input('comp-r1-input', 'value'),
+     Input('comp-k1-input', 'value'),
+     Input('comp-r2-input', 'value'),
+     Input('comp-k2-input', 'value'),
+     Input('comp-alpha12-input', 'value'),
+     Input('comp-alpha21-input', 'value')]
+)
+@timed
+def update_competition_outcome_graph(r1, k1, r2, k2, alpha12, alpha21):
+    if None in (r1, k1, r2, k2, alpha12, alpha21):
+        return dash.no_update
+    if min(r1, k1, r2, k2) <= 0 or alpha12 < 0 or alpha21 < 0:
+        return dash.no_update
+    checkpoint('validation')
+
+    # Toda la malla (α₁₂, α₂₁) se clasifica en una sola llamada vectorizada
+    a12 = np.linspace(0, max(2.0, 1.5 * alpha12, 1.5 * k1 / k2), OUTCOME_GRID)
+    a21 = np.linspace(0, max(2.0, 1.5 * alpha21, 1.5 * k2 / k1), OUTCOME_GRID)
+    grid_12, grid_21 = np.meshgrid(a12, a21)
+    equilibria, _, _, kinds = analyze_arrays('competencia', r1, k1, r2, k2, grid_12, grid_21)
+    outcomes = outcome(equilibria, kinds).astype(np.int8)
+    checkpoint('compute')
+
+    n = len(OUTCOME_LABELS)
+    colorscale = [[bound, color] for i, color in enumerate(OUTCOME_COLORS) for bound in (i / n, (i + 1) / n)]
+    fig = go.Figure(go.Heatmap(
+        x=a12, y=a21, z=outcomes, zmin=-0.5, zmax=n - 0.5,
+        colorscale=colorscale,
+        hovertemplate="α₁₂ = %{x:.3g}<br>α₂₁ = %{y:.3g}<extra></extra>",
+        colorbar=dict(tickvals=list(range(n)), ticktext=OUTCOME_LABELS, len=0.8)
+    ))
+    fig.add_vline(x=k1 / k2, line_dash="dot", line_color='black', annotation_text="α₁₂ = K₁/K₂")
+    fig.add_hline(y=k2 / k1, line_dash="dot", line_color='black', annotation_text="α₂₁ = K₂/K₁")
+    fig.add_trace(go.Scatter(
+        x=[alpha12], y=[alpha21], mode='markers',
+        marker=dict(color='white', size=12, symbol='star', line=dict(color='black', width=1)),
+        name='Parámetros actuales', showlegend=False
+    ))
+    fig.update_layout(
+        title="Resultado de la competencia según α₁₂ y α₂₁",
+        xaxis_title="α₁₂ (efecto de 2 en 1)",
+        yaxis_title="α₂₁ (efecto de 1 en 2)",
+        template="plotly_white",
+        font=dict(family="Outfit, sans-serif"),
+        margin=dict(l=40, r=20, t=50, b=40)
+    )
+    fig.update_xaxes(showline=True, linewidth=1, linecolor='black')
+    fig.update_yaxes(showline=True, linewidth=1, linecolor='black')
+    checkpoint('figure')
+    return fig
+
+
+@callback(
+    Output('comp-critical-points', 'children'),
+    [Input('comp-r1-input', 'value'),
+     Input('comp-k1-input', 'value'),
+     Input('comp-r2-input', 'value'),
+     Input('comp-k2-input', 'value'),
+     Input('comp-alpha12-input', 'value'),
+     Input('comp-alpha21-input', 'value')]
+)
+@timed
+def update_competition_critical_points(r1, k1, r2, k2, alpha12, alpha21):
+    if None in (r1, k1, r2, k2, alpha12, alpha21) or min(r1, k1, r2, k2) <= 0 or min(alpha12, alpha21) < 0:
+        return dash.no_update
+    return describe('competencia', (r1, k1, r2, k2, alpha12, alpha21), '(N₁, N₂)')
+
+
+URL_STATE = register(__name__, {
+    'n10': 'comp-n10-input',
+    'r1': 'comp-r1-input',
+    'k1': 'comp-k1-input',
+    'n20': 'comp-n20-input',
+    'r2': 'comp-r2-input',
+    'k2': 'comp-k2-input',
+    'alpha12': 'comp-alpha12-input',
+    'alpha21': 'comp-alpha21-input',
+    't_max': 'comp-time-max-input',
+}, figure=lambda v: update_competition_graph(v['n10'], v['r1'], v['k1'], v['n20'], v['r2'], v['k2'], v['alpha12'], v['alpha21'], v['t_max']))
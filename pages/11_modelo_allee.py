@@ -0,0 +1,291 @@
+import dash
+from dash import dcc, html, Input, Output, callback
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+import numpy as np
+from equations import equation_src
+from metrics import checkpoint, timed
+from simulation import integrate
+from stability import (
+    ALLEE_ESTABLISHMENT_FRACTION, ALLEE_EXTINCTION_FRACTION, KIND_LABELS, STABLE, analyze, describe, field
+)
+from styles import INPUT_STYLE_COMPACT, INFO_CARD_STYLE
+from url_state import register
+
+dash.register_page(__name__, name='Efecto Allee')
+
+def layout(**kwargs):
+    page_content = dbc.Card(
+        dbc.CardBody([
+            html.H2("Modelo con Efecto Allee", className="card-title text-center mb-4"),
+            html.P(
+                "Extiende el modelo logístico con un umbral crítico A: por debajo de él los individuos no logran encontrarse o cooperar lo suficiente, la tasa de crecimiento se vuelve negativa y la población colapsa hacia la extinción.",
+                className="text-center"
+            ),
+            html.Hr(),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Ecuación Diferencial", className="card-title text-center"),
+                    html.Div(
+                        html.Img(
+                            src=equation_src(r"\frac{dN}{dt}=rN\left(\frac{N}{A}-1\right)\left(1-\frac{N}{K}\right)"),
+                            style={'height': '50px', 'display': 'block', 'margin': '10px auto'}
+                        ),
+                    ),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Comportamiento", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Si N₀ < A:** la población decrece hacia la **extinción**.
+                        * **Si A < N₀ < K:** crece hasta la capacidad de carga.
+                        * **Si N₀ > K:** decrece hasta K.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("¿Cuándo se usa?", className="card-title text-center"),
+                    dcc.Markdown("""
+                        * **Conservación:** Tamaño mínimo viable de especies amenazadas.
+                        * **Pesquerías:** Colapso de poblaciones sobreexplotadas.
+                        * **Invasiones biológicas:** Introducciones que no logran establecerse.
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+                dbc.Col(dbc.Card(dbc.CardBody([
+                    html.H5("Puntos de Equilibrio", className="card-title text-center"),
+                    dcc.Markdown(id='allee-critical-points', children="""
+                        * **N = 0:** Extinción (estable).
+                        * **N = A:** Umbral crítico (inestable).
+                        * **N = K:** Capacidad de carga (estable).
+                    """, style={'paddingLeft': '20px'}),
+                ]), style=INFO_CARD_STYLE), md=6, className="mb-4"),
+            ]),
+
+            dbc.Row([
+                dbc.Col(
+                    dbc.Card(dbc.CardBody([
+                        html.H5("Descripción de Variables", className="card-title text-center"),
+                        dcc.Markdown(f"""
+                            * **N(t):** Población en el tiempo t.
+                            * **r:** Tasa de crecimiento intrínseca.
+                            * **A:** Umbral crítico de Allee (0 < A < K).
+                            * **K:** Capacidad de carga.
+                            * **Cuasi-extinción:** N cae por debajo del {ALLEE_EXTINCTION_FRACTION:.0%} de A.
+                            * **Establecimiento:** N supera el {ALLEE_ESTABLISHMENT_FRACTION:.0%} de K.
+                        """, style={'paddingLeft': '20px'})
+                    ]), style=INFO_CARD_STYLE)
+                ),
+            ], className="mb-4"),
+
+            html.Hr(className="my-4"),
+            dbc.Row([
+                dbc.Col([
+                    html.H4("Parámetros", className="text-center fw-bold mb-3"),
+
+                    dbc.Label("Población Inicial (N₀):", className="small"),
+                    dcc.Input(id='allee-n0-input', type='number', value=25, min=0.01, step=0.5,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("Tasa de Crecimiento (r):", className="small"),
+                    dcc.Input(id='allee-rate-input', type='number', value=0.5, min=0.01, step=0.01,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("Umbral Crítico (A):", className="small"),
+                    dcc.Input(id='allee-threshold-input', type='number', value=20, min=0.01, step=1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("Capacidad de Carga (K):", className="small"),
+                    dcc.Input(id='allee-capacity-input', type='number', value=100, min=1, step=1,
+                              style=INPUT_STYLE_COMPACT, className="mb-2"),
+
+                    dbc.Label("Tiempo Final (tₘₐₓ):", className="small"),
+                    dcc.Input(id='allee-time-max-input', type='number', value=40, min=1, step=1,
+                              style=INPUT_STYLE_COMPACT, className="mb-3"),
+
+                    html.Div(id='allee-result', className="text-center fw-bold mt-3 text-primary"),
+                ], md=3),
+                dbc.Col([
+                    dcc.Tabs([
+                        dcc.Tab(label='Población vs Tiempo', children=[
+                            dcc.Graph(id='allee-time-graph', style={'height': '100%'})
+                        ]),
+                        dcc.Tab(label='Línea de Fase (dN/dt vs N)', children=[
+                            dcc.Graph(id='allee-phase-graph', style={'height': '100%'})
+                        ])
+                    ])
+                ], md=9),
+            ], align="start", className="mt-4"),
+        ]),
+        className="m-4",
+    )
+
+    return URL_STATE.apply(html.Div(
+        page_content,
+        style={'fontFamily': 'Outfit, sans-serif'}
+    ), kwargs)
+
+# Opciones del integrador; los benchmarks las endurecen para medir el peor caso.
+# LSODA pasa a un método implícito cuando la solución se asienta en 0 o K:
+# con r grande y tₘₐₓ largo el problema es rígido y RK45 tarda segundos
+SOLVER_OPTIONS = {'method': 'LSODA', 'rtol': 1e-6}
+
+# Abanico de FAN_SIZE condiciones iniciales entre 5 % y 130 % de K, integradas
+# juntas en una sola llamada
+FAN_SIZE = 16
+
+EVENTS = ('extincion', 'establecimiento')
+EVENT_LABELS = {
+    'extincion': f"Cuasi-extinción (N < {ALLEE_EXTINCTION_FRACTION:.0%} de A)",
+    'establecimiento': f"Establecimiento (N > {ALLEE_ESTABLISHMENT_FRACTION:.0%} de K)",
+}
+EVENT_COLORS = {'extincion': 'red', 'establecimiento': 'green'}
+
+
+def fan_trace(t, values, color, name):
+    # Todas las trayectorias en una sola traza, separadas por huecos (NaN)
+    gaps = np.full((values.shape[0], 1), np.nan)
+    return go.Scatter(
+        x=np.tile(np.append(t, np.nan), values.shape[0]), y=np.hstack([values, gaps]).ravel(), mode='lines',
+        line=dict(color=color, width=1), opacity=0.35, hoverinfo='skip', name=name
+    )
+
+
+@callback(
+    [Output('allee-time-graph', 'figure'),
+     Output('allee-phase-graph', 'figure'),
+     Output('allee-result', 'children')],
+    [Input('allee-n0-input', 'value'),
+     Input('allee-rate-input', 'value'),
+     Input('allee-threshold-input', 'value'),
+     Input('allee-capacity-input', 'value'),
+     Input('allee-time-max-input', 'value')]
+)
+@timed
+def update_allee_graph(n0, r, a, k, t_max):
+    if None in (n0, r, a, k, t_max):
+        return dash.no_update, dash.no_update, ""
+
+    if any(v <= 0 for v in [n0, r, a, k, t_max]):
+        return dash.no_update, dash.no_update, "⚠️ Todos los parámetros deben ser > 0"
+
+    if a >= k:
+        return dash.no_update, dash.no_update, "⚠️ El umbral A debe ser menor que la capacidad de carga K"
+
+    checkpoint('validation')
+
+    params = (r, a, k)
+    try:
+        trajectory = integrate('allee', [n0], t_max, params, events=EVENTS, **SOLVER_OPTIONS)
+        if not trajectory.success:
+            return dash.no_update, dash.no_update, "⚠️ La integración falló. Intenta con otros parámetros."
+        t, (n,) = trajectory.sample(500)
+
+        starts = np.linspace(0.05, 1.3, FAN_SIZE)[:, None] * k
+        fan = integrate('allee', starts, t_max, params, **SOLVER_OPTIONS)
+        t_fan, (fan_n,) = fan.sample(150)
+    except Exception as e:
+        return dash.no_update, dash.no_update, f"⚠️ Error en integración: {str(e)}"
+
+    # Primer cruce de cada umbral, si lo hay
+    crossings = {name: trajectory.events[name][0][0] for name in EVENTS if trajectory.events[name][0].size}
+
+    # Línea de fase: dN/dt sobre N, con los equilibrios y su estabilidad
+    n_max = 1.3 * max(k, n0)
+    n_axis = np.linspace(0, n_max, 400)
+    rate = field('allee', n_axis[:, None], *params)[:, 0]
+    equilibria, _, _, kinds = analyze('allee', tuple(float(p) for p in params))
+    equilibria = equilibria[:, 0]
+
+    checkpoint('compute')
+
+    fig_time = go.Figure()
+    survives = starts[:, 0] > a
+    fig_time.add_trace(fan_trace(t_fan, fan_n[survives], 'green', 'N₀ > A (se establece)'))
+    fig_time.add_trace(fan_trace(t_fan, fan_n[~survives], 'red', 'N₀ < A (se extingue)'))
+    fig_time.add_trace(go.Scatter(x=t, y=n, mode='lines', name='Población (N)', line=dict(color='purple', width=3)))
+    for name, t_event in crossings.items():
+        fig_time.add_trace(go.Scatter(
+            x=[t_event], y=trajectory.events[name][1][0], mode='markers',
+            marker=dict(color=EVENT_COLORS[name], size=11, symbol='diamond'),
+            name=EVENT_LABELS[name], hovertemplate="t = %{x:.4g}<br>N = %{y:.4g}<extra></extra>"
+        ))
+    fig_time.add_hline(y=a, line_dash="dash", line_color="red", annotation_text="Umbral crítico (A)", annotation_position="bottom right")
+    fig_time.add_hline(y=k, line_dash="dash", line_color="green", annotation_text="Capacidad de carga (K)", annotation_position="top right")
+    fig_time.update_layout(
+        title="Población a lo largo del tiempo",
+        xaxis_title="Tiempo (t)",
+        yaxis_title="Población (N)",
+        template="plotly_white",
+        font=dict(family="Outfit, sans-serif"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=20, t=50, b=40),
+        plot_bgcolor='lightyellow'
+    )
+    fig_time.update_xaxes(showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+    fig_time.update_yaxes(range=[0, n_max], showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+
+    fig_phase = go.Figure()
+    fig_phase.add_trace(go.Scatter(x=n_axis, y=rate, mode='lines', line=dict(color='purple', width=2), name='dN/dt'))
+
+    # Sentido del flujo entre equilibrios consecutivos
+    bounds = np.append(np.sort(equilibria), n_max)
+    middles = (bounds[:-1] + bounds[1:]) / 2
+    growing = field('allee', middles[:, None], *params)[:, 0] > 0
+    fig_phase.add_trace(go.Scatter(
+        x=middles, y=np.zeros_like(middles), mode='markers',
+        marker=dict(symbol=np.where(growing, 'triangle-right', 'triangle-left'),
+                    color=np.where(growing, 'green', 'red'), size=14),
+        hoverinfo='skip', name='Sentido del flujo'
+    ))
+    stable = kinds == STABLE
+    fig_phase.add_trace(go.Scatter(
+        x=equilibria, y=np.zeros_like(equilibria), mode='markers',
+        marker=dict(color=np.where(stable, 'black', 'white'), size=12, line=dict(color='black', width=2)),
+        text=[KIND_LABELS[int(kind)] for kind in kinds],
+        hovertemplate="N = %{x:.4g}<br>%{text}<extra></extra>",
+        name='Equilibrios (relleno = estable)'
+    ))
+    fig_phase.add_trace(go.Scatter(x=[n0], y=[0], mode='markers', marker=dict(color='blue', size=9), name='N₀'))
+    fig_phase.add_hline(y=0, line_color="black", line_width=1)
+    fig_phase.update_layout(
+        title="Línea de Fase: dN/dt = rN(N/A − 1)(1 − N/K)",
+        xaxis_title="Población (N)",
+        yaxis_title="dN/dt",
+        template="plotly_white",
+        font=dict(family="Outfit, sans-serif"),
+        margin=dict(l=40, r=20, t=50, b=40),
+        plot_bgcolor='lightcyan'
+    )
+    fig_phase.update_xaxes(showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+    fig_phase.update_yaxes(showline=True, linewidth=1, linecolor='black', gridcolor='lightgray')
+
+    checkpoint('figure')
+
+    text = f" Simulación completada hasta t = {t_max}"
+    for name, t_event in crossings.items():
+        text += f" · {EVENT_LABELS[name]} en t = {t_event:.4g}"
+    if not crossings:
+        text += " · Sin cruces de umbral"
+    return fig_time, fig_phase, text
+
+
+@callback(
+    Output('allee-critical-points', 'children'),
+    [Input('allee-rate-input', 'value'),
+     Input('allee-threshold-input', 'value'),
+     Input('allee-capacity-input', 'value')]
+)
+@timed
+def update_allee_critical_points(r, a, k):
+    if None in (r, a, k) or min(r, a, k) <= 0 or a >= k:
+        return dash.no_update
+    return describe('allee', (r, a, k), 'N')
+
+
+URL_STATE = register(__name__, {
+    'n0': 'allee-n0-input',
+    'r': 'allee-rate-input',
+    'A': 'allee-threshold-input',
+    'K': 'allee-capacity-input',
+    't_max': 'allee-time-max-input',
+}, figure=lambda v: update_allee_graph(v['n0'], v['r'], v['A'], v['K'], v['t_max']))
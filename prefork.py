@@ -0,0 +1,82 @@
+import gc
+
+from dash.development.base_component import Component
+
+from metrics import reset as reset_metrics
+
+# Precalentamiento en el proceso maestro de gunicorn (preload_app): todo lo que
+# se construye aquí (SciPy, plantillas de Plotly, mapas de callbacks de Dash,
+# cachés lru de kernels/bifurcation/stability con los valores por defecto) se
+# comparte con los workers por copy-on-write en lugar de rehacerse en cada uno.
+
+DISPATCH_PATH = '/_dash-update-component'
+
+
+def _default_values():
+    import dash
+
+    values = {}
+    for page in dash.page_registry.values():
+        layout = page['layout']
+        tree = layout() if callable(layout) else layout
+        for component in [tree, *tree._traverse()]:
+            if isinstance(component, Component) and isinstance(getattr(component, 'id', None), str):
+                for prop in component._prop_names:
+                    value = getattr(component, prop, None)
+                    if value is not None:
+                        values[(component.id, prop)] = value
+    return values
+
+
+def _payload(output, spec, values):
+    declared = spec['output'] if isinstance(spec['output'], list) else [spec['output']]
+    outputs = [{'id': o.component_id, 'property': o.component_property} for o in declared]
+    items = [dict(item, value=values.get((item['id'], item['property']))) for item in spec['inputs']]
+    return {
+        'output': output,
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': items,
+        'state': [dict(item, value=values.get((item['id'], item['property']))) for item in spec['state']],
+        'changedPropIds': [],
+    }
+
+
+def warm_up(dash_app):
+    # SciPy se difiere al primer uso en cada página; en producción se carga aquí
+    import plotly.io as pio
+    import scipy.integrate  # noqa: F401
+
+    import sensitivity
+
+    pio.templates[pio.templates.default]
+    pio.templates['plotly_white']
+
+    client = dash_app.server.test_client()
+    client.get('/')  # la primera petición prepara los mapas de callbacks de Dash
+
+    values = _default_values()
+    page_ids = {component_id for component_id, _ in values}
+    warmed = 0
+    # Sobol en serie: un pool de procesos creado en el maestro (con su
+    # forkserver, resource_tracker e hilos) lo heredarían todos los workers
+    workers, sensitivity.WORKERS = sensitivity.WORKERS, 1
+    try:
+        for output, spec in dash_app.callback_map.items():
+            # Los callbacks de cliente (sin 'callback') no se ejecutan en el servidor
+            if 'callback' not in spec or not all(item['id'] in page_ids for item in spec['inputs']):
+                continue
+            response = client.post(DISPATCH_PATH, json=_payload(output, spec, values))
+            warmed += response.status_code in (200, 204)
+    finally:
+        sensitivity.WORKERS = workers
+
+    # Las peticiones de calentamiento no deben aparecer en /metrics
+    reset_metrics()
+    return warmed
+
+
+def freeze():
+    # Los objetos creados hasta ahora pasan a la generación permanente: el GC de
+    # los workers ya no los recorre y no ensucia sus páginas de memoria
+    gc.collect()
+    gc.freeze()
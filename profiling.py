@@ -0,0 +1,235 @@
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from html import escape
+
+from flask import g, request
+
+# Perfilado bajo demanda de una sola petición a /_dash-update-component, para
+# ver en producción dónde se va el tiempo con unos parámetros concretos.
+#
+# Se activa definiendo PROFILE_DIR (directorio de salida) y PROFILE_TOKEN. Sin
+# ambas variables profiling(server) no registra nada: cero coste. Con ellas,
+# solo se perfila la petición que envía la cabecera X-Profile-Token con el
+# token; X-Profile-Mode elige el perfilador:
+#
+# * sample (por defecto): un hilo muestrea la pila del hilo de la petición
+#   cada SAMPLE_INTERVAL_S y guarda las pilas plegadas (.folded, el formato de
+#   flamegraph.pl/speedscope) y un flame graph .svg autocontenido;
+# * cprofile: perfil determinista, guardado como .prof (pstats, snakeviz) y un
+#   resumen .txt con las funciones de mayor tiempo acumulado.
+#
+# Cada perfil lleva un .json con el callback, sus entradas y la duración; el
+# nombre base de los archivos vuelve en la cabecera X-Profile-Id.
+#
+#     curl -H "X-Profile-Token: $PROFILE_TOKEN" -H "Content-Type: application/json" \
+#          -d @payload.json http://localhost:8000/_dash-update-component
+
+DISPATCH_PATH = '/_dash-update-component'
+
+TOKEN_HEADER = 'X-Profile-Token'
+MODE_HEADER = 'X-Profile-Mode'
+MODES = ('sample', 'cprofile')
+
+# El muestreador necesita el GIL para leer la pila: con un callback que lo
+# retiene, la resolución real es el intervalo de cambio de hilo (5 ms)
+SAMPLE_INTERVAL_S = 0.001
+SUMMARY_LINES = 40
+
+FLAME_WIDTH = 1200
+FLAME_ROW = 17
+
+
+class Sampler(threading.Thread):
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL_S):
+        super().__init__(name='profiling-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+def folded(stacks):
+    return ''.join(f'{stack} {count}\n' for stack, count in sorted(stacks.items()))
+
+
+def _tree(stacks):
+    root = {'name': 'todo', 'count': 0, 'children': {}}
+    for stack, count in stacks.items():
+        root['count'] += count
+        node = root
+        for name in stack.split(';'):
+            node = node['children'].setdefault(name, {'name': name, 'count': 0, 'children': {}})
+            node['count'] += count
+    return root
+
+
+def _color(name):
+    # Tonos cálidos estables por función, como en flamegraph.pl
+    value = zlib.crc32(name.encode())
+    return f'rgb({205 + value % 50},{(value >> 8) % 180 + 40},{(value >> 16) % 55})'
+
+
+def flame_graph(stacks, title):
+    root = _tree(stacks)
+    total = max(root['count'], 1)
+    rects = []
+
+    def layout(node, x, depth):
+        width = node['count'] / total * FLAME_WIDTH
+        if width < 0.5:
+            return
+        rects.append((x, depth, width, node))
+        for child in sorted(node['children'].values(), key=lambda child: child['name']):
+            layout(child, x, depth + 1)
+            x += child['count'] / total * FLAME_WIDTH
+
+    layout(root, 0.0, 0)
+    depth = max((d for _, d, _, _ in rects), default=0) + 1
+    height = (depth + 2) * FLAME_ROW
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{FLAME_WIDTH}" height="{height}" '
+        f'font-family="monospace" font-size="11">',
+        f'<text x="4" y="{FLAME_ROW - 4}" font-size="13">{escape(title)}</text>',
+    ]
+    for x, d, width, node in rects:
+        # Las raíces abajo, como en los flame graphs clásicos
+        y = height - (d + 1) * FLAME_ROW
+        label = f"{node['name']} — {node['count']} muestras ({node['count'] / total:.1%})"
+        parts.append(
+            f'<g><title>{escape(label)}</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{FLAME_ROW - 1}" fill="{_color(node["name"])}"/>'
+        )
+        characters = int(width / 7)
+        if characters >= 3:
+            text = node['name'] if len(node['name']) <= characters else node['name'][:characters - 2] + '..'
+            parts.append(f'<text x="{x + 2:.1f}" y="{y + FLAME_ROW - 5}">{escape(text)}</text>')
+        parts.append('</g>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def _inputs(payload):
+    # {'id.propiedad': valor} de las entradas y el State del callback
+    items = (payload or {}).get('inputs', []) + (payload or {}).get('state', [])
+    return {f"{item.get('id')}.{item.get('property')}": item.get('value') for item in items if isinstance(item, dict)}
+
+
+class RequestProfiler:
+    def __init__(self, directory, token):
+        self.directory = directory
+        self.token = token.encode()
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def requested(self):
+        token = request.headers.get(TOKEN_HEADER)
+        return (
+            request.path == DISPATCH_PATH and token is not None
+            and hmac.compare_digest(token.encode(), self.token)
+        )
+
+    def before_request(self):
+        if not self.requested():
+            return
+        mode = request.headers.get(MODE_HEADER, MODES[0])
+        g.profile_mode = mode if mode in MODES else MODES[0]
+        if g.profile_mode == 'cprofile':
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+        else:
+            g.profiler = Sampler(threading.get_ident())
+            g.profiler.start()
+        g.profile_start = time.perf_counter()
+
+    def _stop(self):
+        profiler = g.pop('profiler', None)
+        if isinstance(profiler, Sampler):
+            return profiler.stop()
+        if profiler is not None:
+            profiler.disable()
+        return profiler
+
+    def after_request(self, response):
+        if 'profiler' not in g:
+            return response
+        result = self._stop()
+        duration = time.perf_counter() - g.profile_start
+
+        callback = g.get('callback_name', 'desconocido')
+        with self._lock:
+            self._counter += 1
+            stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{callback}-{os.getpid()}-{self._counter}"
+        meta = {
+            'callback': callback,
+            'inputs': _inputs(request.get_json(silent=True)),
+            'mode': g.profile_mode,
+            'duration_s': duration,
+            'status': response.status_code,
+            'pid': os.getpid(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        }
+        self.save(stem, result, meta)
+        response.headers['X-Profile-Id'] = stem
+        return response
+
+    def teardown_request(self, exception):
+        # Si el callback lanzó una excepción after_request no se ejecuta: el
+        # muestreador no debe quedar vivo
+        if 'profiler' in g:
+            self._stop()
+
+    def save(self, stem, result, meta):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, stem)
+        if meta['mode'] == 'cprofile':
+            result.dump_stats(path + '.prof')
+            summary = io.StringIO()
+            pstats.Stats(result, stream=summary).sort_stats('cumulative').print_stats(SUMMARY_LINES)
+            with open(path + '.txt', 'w', encoding='utf-8') as f:
+                f.write(summary.getvalue())
+        else:
+            meta['samples'] = sum(result.values())
+            with open(path + '.folded', 'w', encoding='utf-8') as f:
+                f.write(folded(result))
+            title = f"{meta['callback']} · {meta['duration_s'] * 1000:.0f} ms · {meta['samples']} muestras"
+            with open(path + '.svg', 'w', encoding='utf-8') as f:
+                f.write(flame_graph(result, title))
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False, default=str)
+
+
+def profiling(server, directory=None, token=None):
+    directory = directory or os.environ.get('PROFILE_DIR')
+    token = token or os.environ.get('PROFILE_TOKEN')
+    if not directory or not token:
+        return server
+    profiler = RequestProfiler(directory, token)
+    server.before_request(profiler.before_request)
+    server.after_request(profiler.after_request)
+    server.teardown_request(profiler.teardown_request)
+    return server
@@ -0,0 +1,246 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+import numpy as np
+
+from kernels import MODEL_PARAMETERS, log_gompertz, log_logistic, log_richards, to_linear
+
+# Sensibilidad de P(t) a los parámetros de los modelos con solución cerrada.
+#
+# Local: elasticidades E_θ(t) = (θ/P) ∂P/∂θ = θ ∂ln P/∂θ a partir de las
+# derivadas analíticas de ln P, en una sola pasada vectorizada sobre t. Son
+# adimensionales, así que r, K y ν se comparan en la misma escala; la derivada
+# ∂P/∂θ = P E_θ / θ se obtiene de ellas.
+#
+# Global: índices de Sobol de primer orden (S₁) y totales (S_T) de P(t) con
+# cada parámetro uniforme en [θ(1 - d), θ(1 + d)]. Muestreo cuasi-aleatorio
+# de Sobol' (scipy.stats.qmc) con el esquema de Saltelli: N (d + 2) evaluaciones
+# con los estimadores de Saltelli (S₁) y Jansen (S_T). Las filas se evalúan por
+# bloques de CHUNK_ROWS; si hay más de un bloque y WORKERS > 1, en un pool de
+# procesos. Con gunicorn, gunicorn.conf.py reparte los núcleos entre sus
+# workers (SENSITIVITY_WORKERS = núcleos // workers) para no sobresuscribir la
+# máquina; con la configuración por defecto queda en 1 y no hay pool. Si un
+# proceso del pool muere, el pool se descarta y ese cálculo termina en serie.
+#
+# El diagnóstico de convergencia repite la estimación en t evaluado con los
+# prefijos N/8, N/4, N/2 y N de la secuencia (cada prefijo de 2^m puntos es
+# también un conjunto equilibrado) e intervalos bootstrap del 95 %: se da por
+# suficiente N cuando los intervalos de S_T miden menos de TOLERANCE y la
+# estimación ya no cambia más que eso al duplicar N. El bootstrap trata las
+# muestras como independientes; con puntos cuasi-aleatorios el error real es
+# menor, así que el criterio es conservador.
+
+SENSITIVITY_MODELS = ('Logístico', 'Gompertz', 'Richards')
+
+PARAMETER_LABELS = {'p0': 'P₀', 'r': 'r', 'k': 'K', 'nu': 'ν'}
+
+_LOG_KERNELS = {
+    'Logístico': log_logistic,
+    'Gompertz': log_gompertz,
+    'Richards': log_richards,
+}
+
+# Filas por bloque: los temporales del núcleo (~10 arreglos de filas × instantes)
+# quedan en unos MB; con bloques de 16384 filas el pico de memoria casi se duplica
+CHUNK_ROWS = 4096
+WORKERS = int(os.environ.get('SENSITIVITY_WORKERS', os.cpu_count() or 1))
+
+TOLERANCE = 0.05
+BOOTSTRAP_SAMPLES = 100
+CONFIDENCE = 0.95
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def parameters(model):
+    return MODEL_PARAMETERS[model]
+
+
+def elasticities(model, t, p0, r, k, nu=1.0):
+    # Devuelve ln P(t) y {parámetro: E_θ(t)}; todo se difunde con t
+    log_p = _LOG_KERNELS[model](p0, r, k, nu, t) if model == 'Richards' else _LOG_KERNELS[model](p0, r, k, t)
+    log_ratio = np.log(k) - np.log(p0)
+    with np.errstate(over='ignore', invalid='ignore'):
+        if model == 'Gompertz':
+            # ln P = ln K - ln(K/P₀) e^(-rt)
+            decay = np.exp(-r * t)
+            result = {
+                'p0': decay,
+                'r': r * t * log_ratio * decay,
+                'k': 1 - decay,
+            }
+        else:
+            # Logístico como Richards con ν = 1:
+            # ln P = ln K - (1/ν) ln(1 + B e^(-rνt)), B = (K/P₀)^ν - 1
+            nu = 1.0 if model == 'Logístico' else nu
+            # g = (P/P₀)^ν e^(-rνt) y w = 1 - (P/K)^ν, sin salir de escala log
+            g = np.exp(nu * (log_p - np.log(p0)) - r * nu * t)
+            w = -np.expm1(nu * (log_p - np.log(k)))
+            result = {
+                'p0': g,
+                'r': r * t * w,
+                'k': 1 - g,
+            }
+            if model == 'Richards':
+                result['nu'] = (np.log(k) - log_p) - g * log_ratio + r * t * w
+    return log_p, {name: np.broadcast_to(result[name], np.shape(log_p)) for name in parameters(model)}
+
+
+def derivatives(model, t, p0, r, k, nu=1.0):
+    # ∂P/∂θ = P E_θ / θ
+    log_p, elasticity = elasticities(model, t, p0, r, k, nu)
+    p = to_linear(log_p)
+    values = {'p0': p0, 'r': r, 'k': k, 'nu': nu}
+    return p, {name: p * e / values[name] for name, e in elasticity.items()}
+
+
+def _evaluate_chunk(model, rows, t):
+    # Una fila por conjunto de parámetros, una columna por instante
+    columns = [rows[:, [j]] for j in range(rows.shape[1])]
+    return to_linear(_LOG_KERNELS[model](*columns, t[None, :]))
+
+
+def _executor(workers):
+    # Un pool por proceso: si gunicorn hace fork después de crearlo, el worker
+    # crea el suyo. forkserver evita heredar los hilos del servidor
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _discard(pool):
+    # El siguiente cálculo crea un pool nuevo en lugar de reutilizar uno roto
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def evaluate(model, rows, t, workers=None):
+    workers = WORKERS if workers is None else workers
+    starts = range(0, len(rows), CHUNK_ROWS)
+    chunks = [rows[i:i + CHUNK_ROWS] for i in starts]
+    # Cada bloque se copia en su sitio: la salida completa existe una sola vez
+    y = np.empty((len(rows), len(t)))
+    if len(chunks) > 1 and workers > 1:
+        pool = _executor(workers)
+        try:
+            results = pool.map(_evaluate_chunk, [model] * len(chunks), chunks, [t] * len(chunks))
+            for start, values in zip(starts, results):
+                y[start:start + len(values)] = values
+            return y
+        except BrokenProcessPool:
+            _discard(pool)
+    for start, chunk in zip(starts, chunks):
+        y[start:start + len(chunk)] = _evaluate_chunk(model, chunk, t)
+    return y
+
+
+def saltelli_sample(bounds, n_samples, seed=0):
+    # Matrices A y B (N × d) de una secuencia de Sobol' de dimensión 2d y las
+    # d matrices A_B^(i): A con la columna i tomada de B
+    from scipy.stats import qmc
+
+    d = len(bounds)
+    m = int(np.ceil(np.log2(n_samples)))
+    base = qmc.Sobol(2 * d, scramble=True, seed=seed).random_base2(m)
+    low, high = np.array(bounds, dtype=float).T
+    a = qmc.scale(base[:, :d], low, high)
+    b = qmc.scale(base[:, d:], low, high)
+    ab = np.repeat(a[None], d, axis=0)
+    for i in range(d):
+        ab[i, :, i] = b[:, i]
+    return a, b, ab
+
+
+def estimate(y_a, y_b, y_ab):
+    # y_a, y_b: (N, ...); y_ab: (d, N, ...). Devuelve S₁ y S_T con forma (d, ...)
+    variance = np.var(np.concatenate([y_a, y_b]), axis=0)
+    # Un parámetro a la vez: los temporales son de N × T, no de d × N × T
+    first = np.empty((len(y_ab),) + variance.shape)
+    total = np.empty_like(first)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i, y_i in enumerate(y_ab):
+            difference = y_i - y_a
+            first[i] = np.mean(y_b * difference, axis=0) / variance
+            total[i] = 0.5 * np.mean(difference ** 2, axis=0) / variance
+    # Sin varianza (p. ej. t = 0 con P₀ fijo) los índices no están definidos
+    first = np.where(variance > 0, first, np.nan)
+    total = np.where(variance > 0, total, np.nan)
+    return first, total
+
+
+def _bootstrap(y_a, y_b, y_ab, seed):
+    rng = np.random.default_rng(seed)
+    n = len(y_a)
+    first, total = [], []
+    for _ in range(BOOTSTRAP_SAMPLES):
+        rows = rng.integers(0, n, n)
+        s1, st = estimate(y_a[rows], y_b[rows], y_ab[:, rows])
+        first.append(s1)
+        total.append(st)
+    tail = (1 - CONFIDENCE) / 2 * 100
+    return (
+        np.nanpercentile(first, [tail, 100 - tail], axis=0),
+        np.nanpercentile(total, [tail, 100 - tail], axis=0),
+    )
+
+
+def convergence(y_a, y_b, y_ab, seed=0):
+    # Estimaciones de una salida escalar con los prefijos N/8 ... N
+    n = len(y_a)
+    sizes = [n // 8, n // 4, n // 2, n]
+    steps = []
+    for size in sizes:
+        s1, st = estimate(y_a[:size], y_b[:size], y_ab[:, :size])
+        s1_ci, st_ci = _bootstrap(y_a[:size], y_b[:size], y_ab[:, :size], seed)
+        steps.append({'n': size, 'S1': s1, 'ST': st, 'S1_ci': s1_ci, 'ST_ci': st_ci})
+
+    width = float(np.nanmax(steps[-1]['ST_ci'][1] - steps[-1]['ST_ci'][0]))
+    change = float(np.nanmax(np.abs(steps[-1]['ST'] - steps[-2]['ST'])))
+    return {
+        'steps': steps,
+        'ci_width': width,
+        'change': change,
+        'converged': width <= TOLERANCE and change <= TOLERANCE,
+    }
+
+
+@lru_cache(maxsize=32)
+def sobol_indices(model, nominal, spread, t_max, t_eval, n_samples, n_points=60, seed=0, workers=None):
+    # nominal: valores de parameters(model) en orden; spread: fracción d
+    bounds = [(value * (1 - spread), value * (1 + spread)) for value in nominal]
+    d = len(bounds)
+    a, b, ab = saltelli_sample(bounds, n_samples, seed)
+    n = len(a)
+
+    # El último instante es t evaluado, para el diagnóstico de convergencia
+    t = np.append(np.linspace(0, t_max, n_points), t_eval)
+    y = evaluate(model, np.vstack([a, b, ab.reshape(-1, d)]), t, workers)
+    y_a, y_b, y_ab = y[:n], y[n:2 * n], y[2 * n:].reshape(d, n, -1)
+
+    first, total = estimate(y_a[..., :-1], y_b[..., :-1], y_ab[..., :-1])
+    result = {
+        'names': parameters(model),
+        't': t[:-1],
+        'S1': first,
+        'ST': total,
+        'n_samples': n,
+        'evaluations': len(y),
+        'convergence': convergence(y_a[:, -1], y_b[:, -1], y_ab[:, :, -1], seed),
+    }
+    for value in (result['t'], result['S1'], result['ST']):
+        value.setflags(write=False)
+    return result
@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from stability import MODELS
+
+# Simulación de los modelos de EDO registrados en stability.MODELS. Un modelo
+# nuevo solo necesita su rhs (y, si se conoce, su jacobiano); desde aquí
+# recibe:
+#
+# * en los métodos implícitos (Radau, BDF, LSODA), jacobiano analítico o, si
+#   no lo hay, diferencias finitas con el rhs vectorizado (vectorized=True).
+#   En los explícitos no se activa: SciPy pasaría el estado como (n, 1) y cada
+#   evaluación sería más lenta;
+# * caché LRU por proceso, segura entre hilos, de la solución con salida densa:
+#   x(t) en cualquier t se obtiene del interpolante sin volver a integrar;
+# * eventos con nombre (cruces de umbrales) definidos en el propio modelo;
+# * conjuntos de condiciones iniciales integrados como un solo sistema;
+# * muestreo del interpolante a un número fijo de puntos, independiente de los
+#   pasos que haya dado el integrador.
+#
+#     trajectory = integrate('lotka_volterra', [x0, y0], t_max, (alpha, beta, gamma, delta))
+#     trajectory(5.0)                 # -> array de forma (n,)
+#     t, z = trajectory.sample(500)   # -> (500,), (n, 500)
+#
+# advance() integra por tramos acotados en tiempo de reloj, para el modo en
+# vivo: el estado para continuar (t, y, paso, índice de muestra) se devuelve
+# como dict serializable y viaja en el navegador, así que cualquier worker
+# puede atender el siguiente tramo.
+
+CACHE_SIZE = 64
+
+IMPLICIT_METHODS = ('Radau', 'BDF', 'LSODA')
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+class Trajectory:
+    def __init__(self, solution, shape, events=()):
+        self.success = solution.success
+        self.message = solution.message
+        self.shape = shape
+        self.t = solution.t
+        self.y = solution.y.reshape(shape + (-1,))
+        self.t_max = solution.t[-1]
+        self.events = {
+            name: (t_events, y_events.reshape((-1,) + shape))
+            for name, t_events, y_events in zip(events, solution.t_events or (), solution.y_events or ())
+        }
+        self._interpolant = solution.sol
+
+    def __call__(self, t):
+        t = np.clip(np.asarray(t, dtype=float), self.t[0], self.t_max)
+        return self._interpolant(t).reshape(self.shape + t.shape)
+
+    def sample(self, n_points, t_start=None, t_end=None):
+        t = np.linspace(self.t[0] if t_start is None else t_start, self.t_max if t_end is None else t_end, n_points)
+        return t, self(t)
+
+
+def _system(model, params, shape):
+    spec = MODELS[model]
+    rhs = spec['rhs']
+    if len(shape) == 1:
+        fun = lambda t, z: rhs(z, *params)
+        jacobian = spec.get('jacobian')
+        jac = (lambda t, z: jacobian(z, *params)) if jacobian is not None else None
+        return fun, jac
+
+    # Conjunto de m condiciones iniciales: el estado plano se ordena por
+    # componente, (n, m), y cada componente del rhs es un bloque de m valores
+    m, n = shape
+
+    def fun(t, z):
+        return np.concatenate(rhs(z.reshape((n, m) + z.shape[1:]), *params))
+
+    return fun, None
+
+
+def _event(model, name, params):
+    function, direction = MODELS[model]['events'][name]
+    event = lambda t, z: function(z, *params)
+    event.direction = direction
+    return event
+
+
+def _key(model, z0, t_max, params, events, options):
+    return (
+        model,
+        z0.shape,
+        tuple(z0.ravel().tolist()),
+        float(t_max),
+        tuple(float(v) for v in params),
+        tuple(events),
+        tuple(sorted(options.items())),
+    )
+
+
+def integrate(model, z0, t_max, params, events=(), **options):
+    # z0 con forma (n,) integra una trayectoria; con forma (m, n), m a la vez y
+    # el resultado tiene forma (n, m, ...). Los eventos solo con una trayectoria
+    z0 = np.asarray(z0, dtype=float)
+    if events and z0.ndim != 1:
+        raise ValueError('Los eventos solo se admiten para una trayectoria')
+    key = _key(model, z0, t_max, params, events, options)
+    with _lock:
+        trajectory = _cache.get(key)
+        if trajectory is not None:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return trajectory
+        _stats['misses'] += 1
+
+    # SciPy se importa en el primer uso: cuesta ~0.4 s y solo lo necesitan las EDOs
+    from scipy.integrate import solve_ivp
+
+    shape = z0.shape[::-1] if z0.ndim == 2 else z0.shape
+    fun, jac = _system(model, params, z0.shape)
+    if options.get('method') in IMPLICIT_METHODS:
+        options = dict(options, vectorized=True)
+        if jac is not None:
+            options['jac'] = jac
+    solution = solve_ivp(
+        fun, [0, t_max], z0.T.ravel(), dense_output=True,
+        events=[_event(model, name, params) for name in events] or None,
+        **options
+    )
+    trajectory = Trajectory(solution, shape, events)
+    if trajectory.success:
+        with _lock:
+            _cache[key] = trajectory
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return trajectory
+
+
+def advance(model, state, t_bound, sample_dt, params, budget=0.04, **options):
+    from scipy import integrate as scipy_integrate
+
+    options = dict(options)
+    solver_class = getattr(scipy_integrate, options.pop('method', 'RK45'))
+    fun, jac = _system(model, params, (len(state['y']),))
+    if solver_class.__name__ in IMPLICIT_METHODS:
+        options['vectorized'] = True
+        if jac is not None:
+            options['jac'] = jac
+    solver = solver_class(
+        fun, state['t'], np.asarray(state['y'], dtype=float), t_bound,
+        first_step=state.get('step'), **options
+    )
+
+    # Las muestras están en la rejilla fija k * sample_dt, sin acumular errores de redondeo
+    index = state.get('index', 0)
+    times, values = [], []
+    deadline = time.perf_counter() + budget
+    while solver.status == 'running' and time.perf_counter() < deadline:
+        message = solver.step()
+        if solver.status == 'failed':
+            raise RuntimeError(message)
+        last = int(np.floor(solver.t / sample_dt + 1e-9))
+        if solver.status == 'finished':
+            last = max(last, int(np.ceil(t_bound / sample_dt - 1e-9)))
+        if last >= index:
+            grid = np.minimum(np.arange(index, last + 1) * sample_dt, solver.t)
+            times.append(grid)
+            values.append(solver.dense_output()(grid))
+            index = last + 1
+
+    t = np.concatenate(times) if times else np.empty(0)
+    y = np.hstack(values) if values else np.empty((len(state['y']), 0))
+    return t, y, {
+        't': float(solver.t),
+        'y': [float(v) for v in solver.y],
+        'step': float(solver.step_size) if solver.step_size else None,
+        'index': index,
+        'done': solver.status == 'finished',
+    }
+
+
+def cache_info():
+    with _lock:
+        return dict(_stats, size=len(_cache), maxsize=CACHE_SIZE)
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+        _stats.update(hits=0, misses=0)
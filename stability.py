@@ -0,0 +1,299 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Análisis de equilibrios: cada modelo se describe con su campo vectorial
+# (rhs), sus equilibrios y, si se conoce, su jacobiano analítico. Todas las
+# funciones aceptan parámetros escalares o arreglos que se difunden entre sí,
+# de modo que un barrido de parámetros se evalúa en una sola pasada.
+# Convención de formas: el estado tiene la última dimensión n; los equilibrios
+# se devuelven como (..., m, n) y los jacobianos como (..., n, n).
+#
+# El rhs de cada modelo recibe el estado con las componentes en el primer eje
+# (z[0], z[1], ...) y devuelve una tupla de componentes: es la convención de
+# solve_ivp con vectorized=True, así simulation.py lo usa sin adaptadores.
+# field() lo lleva a la convención (..., n) de este módulo.
+
+STABLE, UNSTABLE, SADDLE, CENTER, NON_HYPERBOLIC = range(5)
+STABLE_FOCUS, UNSTABLE_FOCUS = 5, 6
+
+KIND_LABELS = {
+    STABLE: 'estable',
+    UNSTABLE: 'inestable',
+    SADDLE: 'punto silla (inestable)',
+    CENTER: 'centro (neutro estable)',
+    NON_HYPERBOLIC: 'no hiperbólico',
+    STABLE_FOCUS: 'foco estable',
+    UNSTABLE_FOCUS: 'foco inestable',
+}
+
+
+def _stack(*columns):
+    columns = np.broadcast_arrays(*map(np.asarray, columns))
+    return np.stack(columns, axis=-1)
+
+
+def _jacobian_1d(derivative):
+    def jacobian(z, *params):
+        return derivative(z[..., 0], *params)[..., None, None]
+    return jacobian
+
+
+def _exponential_rhs(z, r):
+    return (r * z[0],)
+
+
+def _exponential_equilibria(r):
+    return np.zeros(np.shape(r) + (1, 1))
+
+
+def _logistic_rhs(z, r, k):
+    return (r * z[0] * (1 - z[0] / k),)
+
+
+def _logistic_equilibria(r, k):
+    r, k = np.broadcast_arrays(r, k)
+    return _stack(np.zeros_like(k), k)[..., None]
+
+
+def _gompertz_rhs(z, r, k):
+    return (r * z[0] * np.log(k / z[0]),)
+
+
+def _gompertz_equilibria(r, k):
+    # P = 0 no es equilibrio: ln(K/P) diverge y la solución nunca llega a 0
+    r, k = np.broadcast_arrays(r, k)
+    return k[..., None, None]
+
+
+def _richards_rhs(z, r, k, nu):
+    return (r * z[0] * (1 - (z[0] / k) ** nu),)
+
+
+def _richards_equilibria(r, k, nu):
+    r, k, nu = np.broadcast_arrays(r, k, nu)
+    return _stack(np.zeros_like(k), k)[..., None]
+
+
+def _lotka_volterra_rhs(z, alpha, beta, gamma, delta):
+    x, y = z[0], z[1]
+    return (alpha * x - beta * x * y, delta * x * y - gamma * y)
+
+
+def _lotka_volterra_equilibria(alpha, beta, gamma, delta):
+    alpha, beta, gamma, delta = np.broadcast_arrays(alpha, beta, gamma, delta)
+    zero = np.zeros_like(alpha)
+    return np.stack([_stack(zero, zero), _stack(gamma / delta, alpha / beta)], axis=-2)
+
+
+def _lotka_volterra_jacobian(z, alpha, beta, gamma, delta):
+    x, y = z[..., 0], z[..., 1]
+    return np.stack([
+        _stack(alpha - beta * y, -beta * x),
+        _stack(delta * y, delta * x - gamma),
+    ], axis=-2)
+
+
+def _competition_rhs(z, r1, k1, r2, k2, alpha12, alpha21):
+    n1, n2 = z[0], z[1]
+    return (r1 * n1 * (1 - (n1 + alpha12 * n2) / k1), r2 * n2 * (1 - (n2 + alpha21 * n1) / k2))
+
+
+def _competition_equilibria(r1, k1, r2, k2, alpha12, alpha21):
+    r1, k1, r2, k2, alpha12, alpha21 = np.broadcast_arrays(r1, k1, r2, k2, alpha12, alpha21)
+    zero = np.zeros_like(k1)
+    # Coexistencia: intersección de las isoclinas no triviales (NaN si son paralelas)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        determinant = np.where(alpha12 * alpha21 == 1, np.nan, 1 - alpha12 * alpha21)
+        n1 = (k1 - alpha12 * k2) / determinant
+        n2 = (k2 - alpha21 * k1) / determinant
+    return np.stack([_stack(zero, zero), _stack(k1, zero), _stack(zero, k2), _stack(n1, n2)], axis=-2)
+
+
+def _competition_jacobian(z, r1, k1, r2, k2, alpha12, alpha21):
+    n1, n2 = z[..., 0], z[..., 1]
+    return np.stack([
+        _stack(r1 * (1 - (2 * n1 + alpha12 * n2) / k1), -r1 * alpha12 * n1 / k1),
+        _stack(-r2 * alpha21 * n2 / k2, r2 * (1 - (2 * n2 + alpha21 * n1) / k2)),
+    ], axis=-2)
+
+
+def _allee_rhs(z, r, a, k):
+    return (r * z[0] * (z[0] / a - 1) * (1 - z[0] / k),)
+
+
+def _allee_equilibria(r, a, k):
+    r, a, k = np.broadcast_arrays(r, a, k)
+    return _stack(np.zeros_like(k), a, k)[..., None]
+
+
+# Umbrales del efecto Allee: cuasi-extinción (N < 1 % del umbral A) y
+# establecimiento (N > 90 % de K)
+ALLEE_EXTINCTION_FRACTION = 0.01
+ALLEE_ESTABLISHMENT_FRACTION = 0.9
+
+
+MODELS = {
+    'exponencial': {
+        'params': ('r',),
+        'rhs': _exponential_rhs,
+        'equilibria': _exponential_equilibria,
+        'jacobian': _jacobian_1d(lambda P, r: r + 0 * P),
+    },
+    'logistico': {
+        'params': ('r', 'k'),
+        'rhs': _logistic_rhs,
+        'equilibria': _logistic_equilibria,
+        'jacobian': _jacobian_1d(lambda P, r, k: r * (1 - 2 * P / k)),
+    },
+    'gompertz': {
+        'params': ('r', 'k'),
+        'rhs': _gompertz_rhs,
+        'equilibria': _gompertz_equilibria,
+        'jacobian': _jacobian_1d(lambda P, r, k: r * (np.log(k / P) - 1)),
+    },
+    'richards': {
+        'params': ('r', 'k', 'nu'),
+        'rhs': _richards_rhs,
+        'equilibria': _richards_equilibria,
+        'jacobian': _jacobian_1d(lambda P, r, k, nu: r * (1 - (1 + nu) * (P / k) ** nu)),
+    },
+    'lotka_volterra': {
+        'params': ('alpha', 'beta', 'gamma', 'delta'),
+        'rhs': _lotka_volterra_rhs,
+        'equilibria': _lotka_volterra_equilibria,
+        'jacobian': _lotka_volterra_jacobian,
+    },
+    'competencia': {
+        'params': ('r1', 'k1', 'r2', 'k2', 'alpha12', 'alpha21'),
+        'rhs': _competition_rhs,
+        'equilibria': _competition_equilibria,
+        'jacobian': _competition_jacobian,
+    },
+    'allee': {
+        'params': ('r', 'a', 'k'),
+        'rhs': _allee_rhs,
+        'equilibria': _allee_equilibria,
+        'jacobian': _jacobian_1d(
+            lambda N, r, a, k: r * ((N / a - 1) * (1 - N / k) + N / a * (1 - N / k) - N / k * (N / a - 1))
+        ),
+        # Eventos para simulation.integrate: nombre -> (función que cruza 0, dirección)
+        'events': {
+            'extincion': (lambda z, r, a, k: z[0] - ALLEE_EXTINCTION_FRACTION * a, -1),
+            'establecimiento': (lambda z, r, a, k: z[0] - ALLEE_ESTABLISHMENT_FRACTION * k, 1),
+        },
+    },
+}
+
+
+def field(model, z, *params):
+    # Campo vectorial en la convención (..., n) de este módulo
+    z = np.asarray(z, dtype=float)
+    return _stack(*MODELS[model]['rhs'](np.moveaxis(z, -1, 0), *params))
+
+
+def numerical_jacobian(rhs, z, *params, eps=1e-6):
+    # Diferencias centradas, vectorizadas sobre todos los puntos a la vez
+    z = np.asarray(z, dtype=float)
+    n = z.shape[-1]
+    h = eps * np.maximum(np.abs(z), 1.0)
+    columns = []
+    for j in range(n):
+        step = np.zeros_like(z)
+        step[..., j] = h[..., j]
+        forward = np.asarray(rhs(z + step, *params)).reshape(z.shape)
+        backward = np.asarray(rhs(z - step, *params)).reshape(z.shape)
+        columns.append((forward - backward) / (2 * h[..., j:j + 1]))
+    return np.stack(columns, axis=-1)
+
+
+def classify(eigenvalues, rtol=1e-9):
+    eigenvalues = np.asarray(eigenvalues)
+    real, imag = eigenvalues.real, eigenvalues.imag
+    scale = np.maximum(np.abs(eigenvalues).max(axis=-1, keepdims=True), 1e-300)
+    zero = np.abs(real) <= rtol * scale
+
+    negative = np.all((real < 0) & ~zero, axis=-1)
+    positive = np.all((real > 0) & ~zero, axis=-1)
+    oscillating = np.any(np.abs(imag) > rtol * scale, axis=-1)
+    mixed = np.any((real < 0) & ~zero, axis=-1) & np.any((real > 0) & ~zero, axis=-1)
+
+    kind = np.full(eigenvalues.shape[:-1], NON_HYPERBOLIC)
+    kind[negative] = STABLE
+    kind[positive] = UNSTABLE
+    kind[negative & oscillating] = STABLE_FOCUS
+    kind[positive & oscillating] = UNSTABLE_FOCUS
+    kind[mixed] = SADDLE
+    kind[np.all(zero, axis=-1) & oscillating] = CENTER
+    return kind
+
+
+def analyze_arrays(model, *params):
+    spec = MODELS[model]
+    params = [np.asarray(p, dtype=float) for p in params]
+    equilibria = spec['equilibria'](*params)
+    # Cada parámetro gana un eje para difundirse sobre los m equilibrios
+    expanded = [p[..., None] for p in params]
+    if spec.get('jacobian') is not None:
+        jacobians = spec['jacobian'](equilibria, *expanded)
+    else:
+        jacobians = numerical_jacobian(lambda z, *p: field(model, z, *p), equilibria, *expanded)
+    # Los equilibrios que no existen para estos parámetros (NaN) no se clasifican
+    finite = np.isfinite(jacobians).all(axis=(-2, -1))
+    eigenvalues = np.linalg.eigvals(np.where(finite[..., None, None], jacobians, 0.0))
+    eigenvalues[~finite] = np.nan
+    kinds = classify(eigenvalues)
+    kinds[~finite] = NON_HYPERBOLIC
+    return equilibria, jacobians, eigenvalues, kinds
+
+
+@lru_cache(maxsize=256)
+def analyze(model, params):
+    results = analyze_arrays(model, *params)
+    for array in results:
+        array.setflags(write=False)
+    return results
+
+
+def stability_map(model, equilibrium, **params):
+    # Clasificación de un equilibrio sobre una malla de parámetros: pasar
+    # arreglos (p. ej. de np.meshgrid) para los ejes barridos y escalares para
+    # el resto; todo se resuelve en una sola llamada vectorizada
+    spec = MODELS[model]
+    values = [params[name] for name in spec['params']]
+    equilibria, _, eigenvalues, kinds = analyze_arrays(model, *values)
+    return equilibria[..., equilibrium, :], eigenvalues[..., equilibrium, :], kinds[..., equilibrium]
+
+
+def linearized_orbit(jacobian, equilibrium, offset, t):
+    # z(t) ≈ z* + exp(J t) (z₀ - z*), usando la descomposición espectral de J
+    eigenvalues, vectors = np.linalg.eig(jacobian)
+    coefficients = np.linalg.solve(vectors, np.asarray(offset, dtype=complex))
+    modes = np.exp(np.multiply.outer(t, eigenvalues)) * coefficients
+    return (np.asarray(equilibrium) + (modes @ vectors.T)).real
+
+
+def _format_spectrum(eigenvalues, fmt):
+    # Un par complejo conjugado se muestra una sola vez como a ± bi
+    if np.any(np.abs(eigenvalues.imag) > 1e-12):
+        value = eigenvalues[np.argmax(eigenvalues.imag)]
+        return f"{fmt.format(value.real)} ± {fmt.format(value.imag)}i"
+    return ", ".join(fmt.format(v) for v in eigenvalues.real)
+
+
+def describe(model, params, names, fmt="{:.4g}"):
+    # Líneas en Markdown para la tarjeta de puntos críticos de cada página
+    equilibria, _, eigenvalues, kinds = analyze(model, tuple(float(p) for p in params))
+    lines = []
+    for point, values, kind in zip(equilibria, eigenvalues, kinds):
+        # Solo equilibrios con poblaciones reales (finitas y no negativas)
+        if not np.all(np.isfinite(point)) or np.any(point < 0):
+            continue
+        coordinates = ", ".join(fmt.format(c) for c in point)
+        if len(point) > 1:
+            coordinates = f"({coordinates})"
+        lines.append(
+            f"* **{names} = {coordinates}:** Equilibrio **{KIND_LABELS[int(kind)]}** "
+            f"(λ = {_format_spectrum(values, fmt)})."
+        )
+    return "\n".join(lines)
@@ -0,0 +1,193 @@
+import hashlib
+import io
+import json
+import os
+import re
+
+from dash import get_asset_url, html
+from flask import request
+
+# Assets estáticos: fuente Outfit local, imágenes responsivas en WebP/JPEG y
+# cabeceras de caché. `python static.py` genera en assets/ los archivos con el
+# hash de su contenido en el nombre, que se versionan con el repositorio; las
+# dependencias de ese paso (Pillow, fontTools y la fuente, del paquete
+# fontpkg-outfit) están en requirements-build.txt, no en las de ejecución.
+#
+# La fuente son subconjuntos woff2 de la Outfit variable (pesos 100-900) con
+# los rangos unicode de Google Fonts: el navegador solo descarga latin-ext si
+# la página usa alguno de sus caracteres. Dash enlaza assets/fonts/outfit.css
+# como cualquier otro .css de assets/, sin peticiones a terceros.
+#
+# Los archivos con hash no cambian nunca: si cambia el contenido cambia el
+# nombre y la página apunta al nuevo, así que el navegador puede guardarlos un
+# año sin revalidar. Lo mismo vale para los .css/.js de assets, que Dash enlaza
+# con ?m=<fecha de modificación>.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(ROOT, 'assets')
+FONTS_DIR = os.path.join(ASSETS_DIR, 'fonts')
+IMAGES_DIR = os.path.join(ASSETS_DIR, 'img')
+FONT_CSS_PATH = os.path.join(FONTS_DIR, 'outfit.css')
+IMAGES_MANIFEST_PATH = os.path.join(IMAGES_DIR, 'manifest.json')
+
+# Rangos de los subconjuntos de Google Fonts; latin suma las flechas que usan las páginas
+FONT_SUBSETS = {
+    'latin': (
+        'U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, U+0304, U+0308, '
+        'U+0329, U+2000-206F, U+20AC, U+2122, U+2190-2199, U+2212, U+2215, U+FEFF, U+FFFD'
+    ),
+    'latin-ext': (
+        'U+0100-02BA, U+02BD-02C5, U+02C7-02CC, U+02CE-02D7, U+02DD-02FF, U+0304, U+0308, U+0329, '
+        'U+1D00-1DBF, U+1E00-1E9F, U+1EF2-1EFF, U+2020, U+20A0-20AB, U+20AD-20C0, U+2113, '
+        'U+2C60-2C7F, U+A720-A7FF'
+    ),
+}
+FONT_WEIGHTS = '100 900'
+
+# Imágenes de assets/ con versiones responsivas y anchos generados (px)
+RESPONSIVE_IMAGES = ('profile.jpg',)
+IMAGE_WIDTHS = (240, 480, 720)
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+FINGERPRINTED = re.compile(r'^/assets/.*[0-9a-f]{16}\.\w+$')
+
+
+def _load_images_manifest():
+    if not os.path.exists(IMAGES_MANIFEST_PATH):
+        return {}
+    with open(IMAGES_MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+_images = _load_images_manifest()
+
+
+def responsive_image(name, sizes, **props):
+    entry = _images.get(name)
+    if not entry:
+        return html.Img(src=get_asset_url(name), **props)
+
+    def srcset(kind):
+        return ', '.join(f"{get_asset_url('img/' + filename)} {width}w" for width, filename in entry[kind])
+
+    return html.Picture([
+        html.Source(srcSet=srcset('webp'), sizes=sizes, type='image/webp'),
+        html.Img(
+            src=get_asset_url('img/' + entry['jpeg'][-1][1]),
+            srcSet=srcset('jpeg'),
+            sizes=sizes,
+            width=entry['width'],
+            height=entry['height'],
+            **props
+        ),
+    ], style={'display': 'block', 'width': '100%'})
+
+
+def _after_request(response):
+    if response.status_code == 200 and request.path.startswith('/assets/'):
+        if FINGERPRINTED.match(request.path) or request.args.get('m'):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE
+    return response
+
+
+def cache_headers(server):
+    server.after_request(_after_request)
+    return server
+
+
+def _fingerprint(stem, data, extension):
+    return f'{stem}-{hashlib.sha256(data).hexdigest()[:16]}{extension}'
+
+
+def _write_all(directory, files, keep=()):
+    os.makedirs(directory, exist_ok=True)
+    for filename, data in files.items():
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(data)
+    # Los archivos generados antes que ya no se usan se eliminan
+    for filename in os.listdir(directory):
+        if FINGERPRINTED.match('/assets/' + filename) and filename not in files and filename not in keep:
+            os.remove(os.path.join(directory, filename))
+
+
+def build_images():
+    from PIL import Image
+
+    manifest, files = {}, {}
+    for name in RESPONSIVE_IMAGES:
+        stem = os.path.splitext(name)[0]
+        with Image.open(os.path.join(ASSETS_DIR, name)) as original:
+            image = original.convert('RGB')
+        widths = [width for width in IMAGE_WIDTHS if width < image.width] + [min(IMAGE_WIDTHS[-1], image.width)]
+        entry = {'width': widths[-1], 'height': round(image.height * widths[-1] / image.width), 'webp': [], 'jpeg': []}
+        for width in sorted(set(widths)):
+            resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            for kind, extension, options in (
+                ('webp', '.webp', {'quality': 80, 'method': 6}),
+                ('jpeg', '.jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+            ):
+                buffer = io.BytesIO()
+                resized.save(buffer, kind.upper(), **options)
+                filename = _fingerprint(f'{stem}-{width}', buffer.getvalue(), extension)
+                files[filename] = buffer.getvalue()
+                entry[kind].append([width, filename])
+        manifest[name] = entry
+
+    _write_all(IMAGES_DIR, files)
+    with open(IMAGES_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    for filename, data in sorted(files.items()):
+        print(f'{len(data):>8,}  img/{filename}')
+    return manifest
+
+
+def _unicodes(ranges):
+    codes = []
+    for item in ranges.split(','):
+        low, _, high = item.strip()[2:].partition('-')
+        codes.extend(range(int(low, 16), int(high or low, 16) + 1))
+    return codes
+
+
+def build_font():
+    from importlib.resources import files as package_files
+
+    from fontTools import subset
+
+    source = package_files('fontpkg_outfit') / 'files' / 'Outfit[wght].ttf'
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+
+    rules, files = [], {}
+    for name, ranges in FONT_SUBSETS.items():
+        font = subset.load_font(str(source), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=_unicodes(ranges))
+        subsetter.subset(font)
+        buffer = io.BytesIO()
+        subset.save_font(font, buffer, options)
+        filename = _fingerprint(f'outfit-{name}', buffer.getvalue(), '.woff2')
+        files[filename] = buffer.getvalue()
+        rules.append(
+            f"/* {name} */\n@font-face {{\n  font-family: 'Outfit';\n  font-style: normal;\n"
+            f"  font-weight: {FONT_WEIGHTS};\n  font-display: swap;\n"
+            f"  src: url({filename}) format('woff2');\n  unicode-range: {ranges};\n}}\n"
+        )
+
+    _write_all(FONTS_DIR, files)
+    # La licencia OFL acompaña a la fuente redistribuida
+    files['OFL.txt'] = (package_files('fontpkg_outfit') / 'LICENSE').read_bytes()
+    with open(os.path.join(FONTS_DIR, 'OFL.txt'), 'wb') as f:
+        f.write(files['OFL.txt'])
+    with open(FONT_CSS_PATH, 'w', encoding='utf-8') as f:
+        f.write(''.join(rules))
+    for filename, data in sorted(files.items()):
+        print(f'{len(data):>8,}  fonts/{filename}')
+    return files
+
+
+if __name__ == '__main__':
+    build_images()
+    build_font()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Las pruebas importan los módulos de la raíz del repositorio (kernels, ...)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
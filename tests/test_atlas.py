@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+import atlas
+from simulation import integrate
+
+# Atlas pequeño alrededor de los valores por defecto de la página 07
+# (ρ = 1.5, u₀ = 2, v₀ = 0.9): 5 × 5 × 5 órbitas en pocos segundos
+BOX = {'RHO_RANGE': (1.3, 1.7), 'U_RANGE': (1.7, 2.3), 'V_RANGE': (0.75, 1.05), 'NODES': (5, 5, 5), 'PHASES': 128}
+
+
+@pytest.fixture(scope='module')
+def tiny_atlas(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('atlas')
+    with pytest.MonkeyPatch.context() as patch:
+        for name, value in BOX.items():
+            patch.setattr(atlas, name, value)
+        atlas.build(str(directory), workers=1)
+    return atlas.Atlas(str(directory))
+
+
+@pytest.fixture
+def loaded(tiny_atlas, monkeypatch):
+    monkeypatch.setattr(atlas, '_atlas', tiny_atlas)
+    return tiny_atlas
+
+
+def parameters(rho, u0, v0, alpha=1.0, beta=0.1, delta=0.075):
+    # Tasas y condiciones iniciales con las coordenadas adimensionales dadas
+    gamma = alpha * rho
+    return u0 * gamma / delta, v0 * alpha / beta, alpha, beta, gamma, delta
+
+
+@pytest.mark.parametrize('point, t_max', [
+    ((1.5, 2.0, 0.9), 15),
+    ((1.5, 2.0, 0.9), 60),
+    ((1.35, 1.75, 0.8, 0.7), 20),
+    ((1.62, 2.2, 1.0, 1.3, 0.12, 0.06), 30),
+])
+def test_lookup_matches_integration(loaded, point, t_max):
+    x0, y0, alpha, beta, gamma, delta = parameters(*point)
+    trajectory = atlas.lookup(x0, y0, alpha, beta, gamma, delta, t_max, atlas.SOLVER_OPTIONS)
+    assert isinstance(trajectory, atlas.Orbit)
+    assert trajectory.error <= atlas.TOLERANCE
+
+    exact = integrate('lotka_volterra', [x0, y0], t_max, (alpha, beta, gamma, delta), **atlas.BUILD_OPTIONS)
+    t = np.linspace(0, t_max, 1000)
+    actual = np.abs(np.log(trajectory(t)) - np.log(exact(t))).max()
+    assert actual <= atlas.TOLERANCE
+    # La estimación a posteriori no queda por debajo del error real
+    assert actual <= trajectory.error
+
+
+@pytest.mark.parametrize('point', [
+    (3.0, 2.0, 0.9),  # ρ fuera de la caja
+    (1.5, 2.5, 0.9),  # u₀ fuera
+    (1.5, 2.0, 0.5),  # v₀ fuera
+])
+def test_lookup_outside_box(loaded, point):
+    assert atlas.lookup(*parameters(*point), 15, atlas.SOLVER_OPTIONS) is None
+
+
+def test_lookup_long_t_max(loaded):
+    # El error del periodo desplaza la fase en proporción a tₘₐₓ
+    assert atlas.lookup(*parameters(1.5, 2.0, 0.9), 1e6, atlas.SOLVER_OPTIONS) is None
+
+
+def test_lookup_other_solver_options(loaded):
+    options = {'method': 'RK45', 'rtol': 1e-10, 'atol': 1e-12}
+    assert atlas.lookup(*parameters(1.5, 2.0, 0.9), 15, options) is None
+
+
+def test_lookup_without_atlas(monkeypatch, tmp_path):
+    monkeypatch.setattr(atlas, '_atlas', None)
+    monkeypatch.setattr(atlas, 'ATLAS_DIR', str(tmp_path))
+    assert atlas.lookup(*parameters(1.5, 2.0, 0.9), 15, atlas.SOLVER_OPTIONS) is None
+
+
+def test_interpolate_is_exact_on_cubics():
+    # Producto de cúbicas en cada eje: Lagrange cúbico en cada eje lo reproduce,
+    # también en los bordes, donde el bloque de 4 nodos se desplaza hacia dentro
+    low, step, nodes = np.array([-0.5, 0.2, 1.0]), np.array([0.25, 0.1, 0.3]), np.array([6, 7, 5])
+
+    def cubic(a, b, c):
+        return (1 + a - 2 * a ** 3) * (2 - b ** 2 + b ** 3) * (c ** 3 - c + 0.5)
+
+    axes = [low[i] + step[i] * np.arange(nodes[i]) for i in range(3)]
+    grid = cubic(*np.meshgrid(*axes, indexing='ij'))
+    scale = np.arange(1, 7, dtype=float).reshape(2, 3)
+    orbits = grid[..., None, None] * scale
+    high = low + step * (nodes - 1)
+    points = np.random.default_rng(0).uniform(low, high, size=(50, 3))
+    for point in [*points, low, high]:
+        z, period, cell = atlas._interpolate(orbits, grid, low, step, nodes, point)
+        np.testing.assert_allclose(period, cubic(*point), rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(z, cubic(*point) * scale, rtol=1e-12, atol=1e-12)
+        assert all(0 <= c <= n - 2 for c, n in zip(cell, nodes))
+
+    assert atlas._interpolate(orbits, grid, low, step, nodes, high + step) is None
@@ -0,0 +1,121 @@
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import batch
+
+# Dos bloques de dos escenarios; cada bloque tiene uno que falla
+SCENARIOS = [
+    {'id': 'log-base', 'model': 'logistico', 'z0': 10, 't_max': 60, 'params': {'r': 0.15, 'k': 150}, 'n_points': 50},
+    {'id': 'log-sin-k', 'model': 'logistico', 'z0': 10, 't_max': 60, 'params': {'r': 0.15}},
+    {'id': 'lv-base', 'model': 'lotka_volterra', 'z0': [40, 9], 't_max': 15,
+     'params': {'alpha': 1.0, 'beta': 0.1, 'gamma': 1.5, 'delta': 0.075}, 'n_points': 30},
+    {'id': 'lv-metodo', 'model': 'lotka_volterra', 'z0': [40, 9], 't_max': 15,
+     'params': {'alpha': 1.0, 'beta': 0.1, 'gamma': 1.5, 'delta': 0.075}, 'options': {'method': 'NoExiste'}},
+]
+
+TRAJECTORY_SCHEMA = pa.schema([
+    ('scenario', pa.string()), ('model', pa.string()), ('t', pa.float64()),
+    ('variable', pa.string()), ('value', pa.float64()),
+])
+SUMMARY_SCHEMA = pa.schema([
+    ('scenario', pa.string()), ('model', pa.string()), ('status', pa.string()), ('message', pa.string()),
+    ('final', pa.list_(pa.float64())), ('events', pa.string()), ('duration_s', pa.float64()),
+])
+
+
+@pytest.fixture
+def scenarios_path(tmp_path):
+    path = tmp_path / 'escenarios.jsonl'
+    path.write_text(''.join(json.dumps(scenario) + '\n' for scenario in SCENARIOS), encoding='utf-8')
+    return str(path)
+
+
+def _run(path, directory):
+    messages = []
+    errors = batch.run(path, directory, workers=1, chunk_size=2, log=messages.append)
+    return errors, messages
+
+
+def _stamps(directory):
+    return {
+        os.path.join(kind, name): os.stat(os.path.join(directory, kind, name)).st_mtime_ns
+        for kind in ('trajectories', 'summary')
+        for name in os.listdir(os.path.join(directory, kind))
+    }
+
+
+def test_resume_recomputes_only_missing_chunk(scenarios_path, tmp_path):
+    directory = str(tmp_path / 'salida')
+    errors, messages = _run(scenarios_path, directory)
+    assert errors == 0
+    assert sum(message.startswith('Bloque ') for message in messages) == 2
+    before = _stamps(directory)
+    assert len(before) == 4
+
+    os.remove(os.path.join(directory, 'summary', 'part-00001.parquet'))
+    errors, messages = _run(scenarios_path, directory)
+    assert errors == 0
+    assert 'Retomando: 1 de 2 bloques ya terminados' in messages
+    recomputed = [message for message in messages if message.startswith('Bloque ')]
+    assert len(recomputed) == 1
+    assert recomputed[0].startswith('Bloque 2/2: 2 escenarios (1 fallidos), 60 filas')
+    after = _stamps(directory)
+    # El bloque 0 no se tocó; los dos archivos del bloque 1 se reescribieron
+    assert after[os.path.join('summary', 'part-00000.parquet')] == before[os.path.join('summary', 'part-00000.parquet')]
+    assert after[os.path.join('trajectories', 'part-00000.parquet')] == before[os.path.join('trajectories', 'part-00000.parquet')]
+    assert after[os.path.join('trajectories', 'part-00001.parquet')] != before[os.path.join('trajectories', 'part-00001.parquet')]
+    assert os.path.exists(os.path.join(directory, 'summary', 'part-00001.parquet'))
+
+    with open(os.path.join(directory, batch.MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert sorted(manifest['chunks']) == ['0', '1']
+
+    # Con todo en su sitio no se recalcula nada
+    errors, messages = _run(scenarios_path, directory)
+    assert not [message for message in messages if message.startswith('Bloque ')]
+    assert _stamps(directory) == after
+
+
+def test_failed_rows_are_kept_with_status(scenarios_path, tmp_path):
+    directory = str(tmp_path / 'salida')
+    _run(scenarios_path, directory)
+    summary = pq.read_table(os.path.join(directory, 'summary')).to_pylist()
+    rows = {row['scenario']: row for row in summary}
+    assert list(rows) == [scenario['id'] for scenario in SCENARIOS]
+
+    assert rows['log-base']['status'] == 'ok' and rows['lv-base']['status'] == 'ok'
+    assert rows['log-sin-k']['status'] == 'failed'
+    assert 'Faltan parámetros: k' in rows['log-sin-k']['message']
+    assert rows['lv-metodo']['status'] == 'failed'
+    assert rows['lv-metodo']['message'].startswith('`method` must be one of')
+    for failed in ('log-sin-k', 'lv-metodo'):
+        assert rows[failed]['final'] is None
+
+    # Los fallidos no tienen trayectoria; los correctos, n_points por variable
+    trajectories = pq.read_table(os.path.join(directory, 'trajectories'))
+    counts = {}
+    for scenario, variable in zip(trajectories['scenario'].to_pylist(), trajectories['variable'].to_pylist()):
+        counts[scenario, variable] = counts.get((scenario, variable), 0) + 1
+    assert counts == {('log-base', 'P'): 50, ('lv-base', 'x'): 30, ('lv-base', 'y'): 30}
+
+
+def test_parquet_schema(scenarios_path, tmp_path):
+    directory = str(tmp_path / 'salida')
+    _run(scenarios_path, directory)
+    # Un bloque en el que todo falla (sin modelo siquiera) escribe el mismo esquema
+    batch.run_chunk(7, [{'id': 'vacío'}], directory)
+    for index in (0, 1, 7):
+        name = f'part-{index:05d}.parquet'
+        assert pq.read_schema(os.path.join(directory, 'trajectories', name)).remove_metadata() == TRAJECTORY_SCHEMA
+        assert pq.read_schema(os.path.join(directory, 'summary', name)).remove_metadata() == SUMMARY_SCHEMA
+
+
+def test_manifest_from_other_scenarios_is_rejected(scenarios_path, tmp_path):
+    directory = str(tmp_path / 'salida')
+    _run(scenarios_path, directory)
+    with pytest.raises(SystemExit):
+        batch.run(scenarios_path, directory, workers=1, chunk_size=3, log=lambda message: None)
@@ -0,0 +1,171 @@
+"""Pruebas basadas en propiedades de los núcleos en escala logarítmica.
+
+Cada núcleo se compara con la misma solución cerrada evaluada con mpmath a
+80 dígitos a partir de los mismos floats de entrada, así que la referencia es
+exacta a efectos prácticos y toda la diferencia es error del núcleo.
+
+Tolerancia: |ln P - ln P_ref| <= RTOL · max(1, |ln P_ref|) con RTOL = 1e-12.
+Para |ln P| <= 1 esto acota el error relativo de P(t); por encima acota el
+error relativo de ln P (P puede no caber en un float). El peor caso medido
+sobre el dominio de las estrategias es ~2.5e-14.
+
+Las estrategias cubren el dominio válido (P₀ > 0, K > 0, r > 0, ν > 0, t >= 0)
+con los extremos que motivaron la escala logarítmica: N₀/K cerca de 0
+(hasta e^-600) y cerca de 1 (|ln(N₀/K)| <= 1e-9), N₀ > K, y r·t desde 1e-30
+hasta 1e6. Las pruebas de `_log_denominator` fuerzan cada una de sus ramas,
+con |x| hasta 1e5 (ν ln(K/N₀) en Richards), donde e^x ya no cabe en un float.
+"""
+import mpmath
+import numpy as np
+import pytest
+from hypothesis import assume, example, given, settings
+from hypothesis import strategies as st
+
+from kernels import _log_denominator, log_exponential, log_gompertz, log_logistic, log_richards
+
+mpmath.mp.dps = 80
+
+RTOL = 1e-12
+SETTINGS = settings(max_examples=300, deadline=None)
+
+
+def _log_uniform(low, high):
+    # 10^u con u uniforme: recorre todos los órdenes de magnitud
+    return st.floats(min_value=low, max_value=high).map(lambda u: float(10.0 ** u))
+
+
+log_capacity = st.floats(min_value=-50, max_value=50)
+# ln(N₀/K): N₀/K cerca de 0, cerca de 1 (por ambos lados) y por encima de 1
+log_ratio = st.one_of(
+    st.floats(min_value=-600, max_value=-1),
+    st.floats(min_value=-1e-9, max_value=1e-9),
+    st.floats(min_value=-1, max_value=20),
+)
+rates = _log_uniform(-6, 3)
+exposures = _log_uniform(-30, 6)  # r·t
+shapes = _log_uniform(-6, 2)  # ν
+
+
+@st.composite
+def parameters(draw):
+    log_k = draw(log_capacity)
+    k = float(np.exp(log_k))
+    p0 = float(np.exp(log_k + draw(log_ratio)))
+    r = draw(rates)
+    t = draw(exposures) / r
+    return p0, r, k, t
+
+
+def _mp(*values):
+    return [mpmath.mpf(float(v)) for v in values]
+
+
+def _assert_close(got, want):
+    got = float(got)
+    assert np.isfinite(got)
+    error = abs(mpmath.mpf(got) - want)
+    assert error <= RTOL * max(1, abs(want)), (got, float(want), float(error))
+
+
+def reference_logistic(p0, r, k, t):
+    p0, r, k, t = _mp(p0, r, k, t)
+    return mpmath.log(k) - mpmath.log(1 + (k / p0 - 1) * mpmath.exp(-r * t))
+
+
+def reference_gompertz(p0, r, k, t):
+    p0, r, k, t = _mp(p0, r, k, t)
+    return mpmath.log(k) - mpmath.log(k / p0) * mpmath.exp(-r * t)
+
+
+def reference_richards(p0, r, k, nu, t):
+    p0, r, k, nu, t = _mp(p0, r, k, nu, t)
+    return mpmath.log(k) - mpmath.log(1 + ((k / p0) ** nu - 1) * mpmath.exp(-r * nu * t)) / nu
+
+
+def reference_denominator(x, s):
+    x, s = _mp(x, s)
+    return mpmath.log(1 + mpmath.expm1(x) * mpmath.exp(-s))
+
+
+@SETTINGS
+@given(parameters())
+def test_logistic(values):
+    _assert_close(log_logistic(*values), reference_logistic(*values))
+
+
+@SETTINGS
+@given(parameters())
+def test_gompertz(values):
+    _assert_close(log_gompertz(*values), reference_gompertz(*values))
+
+
+@SETTINGS
+@given(parameters(), shapes)
+@example((1e-250, 0.5, 1e10, 1e4), 1e-6)
+@example((3.0, 2.0, 1.0, 1e-20), 50.0)
+def test_richards(values, nu):
+    p0, r, k, t = values
+    _assert_close(log_richards(p0, r, k, nu, t), reference_richards(p0, r, k, nu, t))
+
+
+@SETTINGS
+@given(parameters())
+def test_richards_with_unit_shape_is_logistic(values):
+    p0, r, k, t = values
+    np.testing.assert_allclose(log_richards(p0, r, k, 1.0, t), log_logistic(p0, r, k, t), rtol=RTOL, atol=RTOL)
+
+
+@SETTINGS
+@given(st.floats(min_value=-600, max_value=600), rates, _log_uniform(-30, 2))
+def test_exponential(log_p0, r, t):
+    p0 = float(np.exp(log_p0))
+    want = mpmath.log(mpmath.mpf(p0)) + mpmath.mpf(r) * mpmath.mpf(t)
+    _assert_close(log_exponential(p0, r, t), want)
+
+
+@SETTINGS
+@given(parameters())
+def test_vectorized_matches_scalar(values):
+    # La misma curva evaluada de una vez con un vector de tiempos
+    p0, r, k, t = values
+    times = np.array([0.0, t / 2, t])
+    curve = log_logistic(p0, r, k, times)
+    for time, value in zip(times, curve):
+        assert value == log_logistic(p0, r, k, time)
+
+
+# Ramas de _log_denominator(x, s) = ln(1 + (e^x - 1) e^(-s))
+
+@SETTINGS
+@given(st.floats(min_value=1e-12, max_value=1e5), exposures)
+@example(6e4, 1e-30)
+@example(1e-12, 1e6)
+def test_denominator_growing(x, s):
+    # x > 0 (N₀ < K): suma en escala log con logaddexp
+    _assert_close(_log_denominator(x, s), reference_denominator(x, s))
+
+
+@SETTINGS
+@given(st.floats(min_value=-1e5, max_value=-1e-12), exposures)
+@example(-1e-12, 1e-30)
+@example(-0.69, 1e-30)
+def test_denominator_declining_log1p(x, s):
+    # x < 0 con (e^x - 1) e^(-s) > -0.5: log1p
+    assume(np.expm1(x) * np.exp(-s) > -0.5)
+    _assert_close(_log_denominator(x, s), reference_denominator(x, s))
+
+
+@SETTINGS
+@given(st.floats(min_value=-1e5, max_value=-0.7), _log_uniform(-30, -0.5))
+@example(-6e4, 1e-30)
+@example(-0.7, 0.3)
+def test_denominator_declining_near_minus_one(x, s):
+    # x < 0 con (e^x - 1) e^(-s) <= -0.5: (1 - e^(-s)) + e^(x - s) con expm1
+    assume(np.expm1(x) * np.exp(-s) <= -0.5)
+    _assert_close(_log_denominator(x, s), reference_denominator(x, s))
+
+
+@pytest.mark.parametrize('s', [0.0, 1e-30, 1.0, 1e6])
+def test_denominator_at_capacity(s):
+    # x = 0 (N₀ = K): P(t) = K para todo t
+    assert _log_denominator(0.0, s) == 0.0
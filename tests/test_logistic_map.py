@@ -0,0 +1,77 @@
+import importlib
+import json
+
+import pytest
+
+import app
+
+page = importlib.import_module('pages.08_mapa_logistico')
+
+WINDOW = [3.2, 3.6, 0.3, 0.9]
+
+
+@pytest.mark.parametrize('relayout, window, expected', [
+    # Zoom con los dos ejes, en la forma indexada
+    ({'xaxis.range[0]': 3.4, 'xaxis.range[1]': 3.5, 'yaxis.range[0]': 0.4, 'yaxis.range[1]': 0.6}, WINDOW,
+     (3.4, 3.5, 0.4, 0.6)),
+    # Solo y: r conserva la ventana dibujada, no los valores del formulario
+    ({'yaxis.range[0]': 0.4, 'yaxis.range[1]': 0.6}, WINDOW, (3.2, 3.6, 0.4, 0.6)),
+    # Solo x: y conserva la ventana dibujada
+    ({'xaxis.range[0]': 3.3, 'xaxis.range[1]': 3.4}, WINDOW, (3.3, 3.4, 0.3, 0.9)),
+    # Forma de lista
+    ({'xaxis.range': [3.3, 3.4], 'yaxis.range': [0.5, 0.7]}, WINDOW, (3.3, 3.4, 0.5, 0.7)),
+    ({'yaxis.range': [0.5, 0.7]}, WINDOW, (3.2, 3.6, 0.5, 0.7)),
+    # Autorange restablece solo el eje que nombra
+    ({'xaxis.autorange': True, 'yaxis.autorange': True}, WINDOW, (2.5, 4.0, 0.0, 1.0)),
+    ({'yaxis.autorange': True}, WINDOW, (3.2, 3.6, 0.0, 1.0)),
+    # Sin ventana previa se parte de la vista completa
+    ({'yaxis.range[0]': 0.4, 'yaxis.range[1]': 0.6}, None, (2.5, 4.0, 0.4, 0.6)),
+    # Fuera del dominio del mapa se recorta
+    ({'xaxis.range': [-1, 5], 'yaxis.range': [-0.2, 1.3]}, WINDOW, (0.0, 4.0, 0.0, 1.0)),
+])
+def test_zoom_window(relayout, window, expected):
+    assert page._zoom_window(relayout, window, 2.5, 4.0) == pytest.approx(expected)
+
+
+@pytest.fixture(scope='module')
+def client():
+    client = app.server.test_client()
+    client.get('/')
+    return client
+
+
+def _dispatch(client, relayout, window):
+    inputs = [
+        {'id': 'logmap-r-min-input', 'property': 'value', 'value': 2.5},
+        {'id': 'logmap-r-max-input', 'property': 'value', 'value': 4},
+        {'id': 'logmap-transient-input', 'property': 'value', 'value': 100},
+        {'id': 'logmap-keep-input', 'property': 'value', 'value': 50},
+        {'id': 'logmap-bifurcation-graph', 'property': 'relayoutData', 'value': relayout},
+    ]
+    outputs = [
+        {'id': 'logmap-bifurcation-graph', 'property': 'figure'},
+        {'id': 'logmap-result', 'property': 'children'},
+        {'id': 'logmap-window-store', 'property': 'data'},
+    ]
+    response = client.post('/_dash-update-component', json={
+        'output': '..' + '...'.join(f"{o['id']}.{o['property']}" for o in outputs) + '..',
+        'outputs': outputs,
+        'inputs': inputs,
+        'state': [{'id': 'logmap-window-store', 'property': 'data', 'value': window}],
+        'changedPropIds': ['logmap-bifurcation-graph.relayoutData'],
+    })
+    assert response.status_code == 200
+    return json.loads(response.data)['response']
+
+
+def test_y_zoom_keeps_drawn_r_window(client):
+    result = _dispatch(client, {'yaxis.range[0]': 0.4, 'yaxis.range[1]': 0.6}, WINDOW)
+    layout = result['logmap-bifurcation-graph']['figure']['layout']
+    assert layout['xaxis']['range'] == pytest.approx([3.2, 3.6])
+    assert layout['yaxis']['range'] == pytest.approx([0.4, 0.6])
+    assert result['logmap-window-store']['data'] == pytest.approx([3.2, 3.6, 0.4, 0.6])
+
+
+def test_relayout_without_axes_is_ignored(client):
+    # Un relayout sin ejes (p. ej. autosize) no cambia ninguna salida
+    assert _dispatch(client, {'autosize': True}, WINDOW) == {}
@@ -0,0 +1,95 @@
+import importlib
+import json
+import shutil
+import subprocess
+
+import dash
+import pytest
+
+import app
+
+page = importlib.import_module('pages.07_modelo_depredador-presa')
+
+PARAMS = [40, 9, 1.0, 0.1, 1.5, 0.075]
+
+
+def _start(run=None, alpha=1.0, t_max=5000):
+    x0, y0, _, beta, gamma, delta = PARAMS
+    *_, live_state, disabled, run = page.update_predprey_graph(
+        x0, y0, alpha, beta, gamma, delta, t_max, ['live'], 5, run)
+    assert disabled == live_state['done']
+    return live_state, run
+
+
+def test_run_id_changes_on_every_call():
+    first = page.live_run_id(None, PARAMS)
+    again = page.live_run_id(first, PARAMS)
+    other = page.live_run_id(first, PARAMS[:-1] + [0.08])
+    assert first.startswith('1:') and again.startswith('2:') and other.startswith('2:')
+    # Mismos parámetros: distinto contador, misma huella
+    assert again.split(':')[1] == first.split(':')[1] != other.split(':')[1]
+
+
+def test_live_state_carries_run_id():
+    live_state, run = _start()
+    assert live_state['run'] == run
+    chunk = page.advance_predprey_live(1, live_state, run, None)
+    assert chunk['run'] == run
+    assert chunk['state']['run'] == run and chunk['state']['t'] > live_state['t']
+    assert chunk['time'][1] == [0, 1] and chunk['phase'][1] == [0]
+
+
+def test_static_render_starts_a_new_run():
+    _, run = _start()
+    *_, live_state, disabled, new_run = page.update_predprey_graph(*PARAMS, 15, [], 5, run)
+    assert live_state is None and disabled
+    assert new_run.startswith('2:')
+
+
+def test_chunk_from_previous_run_is_ignored():
+    old_state, old_run = _start()
+    # Cambian los parámetros: el store guarda la ejecución nueva, pero un tick
+    # (o un tramo en vuelo que devolvió su estado) aún trae el estado viejo
+    _, new_run = _start(old_run, alpha=1.2)
+    assert new_run != old_run
+    assert page.advance_predprey_live(2, old_state, new_run, None) is dash.no_update
+
+
+def test_finished_run_is_not_advanced():
+    # Con t_max = 1 el primer tramo ya termina
+    live_state, run = _start(t_max=1)
+    assert live_state['done']
+    assert page.advance_predprey_live(1, live_state, run, None) is dash.no_update
+    assert page.advance_predprey_live(1, None, run, None) is dash.no_update
+
+
+def _apply(chunk, run):
+    # Ejecuta APPLY_LIVE_CHUNK como lo haría el navegador
+    script = (
+        'const window = {dash_clientside: {no_update: "NO_UPDATE"}};\n'
+        f'const apply = {page.APPLY_LIVE_CHUNK};\n'
+        f'console.log(JSON.stringify(apply({json.dumps(chunk)}, {json.dumps(run)})));\n'
+    )
+    output = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node no está instalado')
+def test_browser_discards_chunk_in_flight():
+    old_state, old_run = _start()
+    chunk = page.advance_predprey_live(1, old_state, old_run, None)
+    _, new_run = _start(old_run, alpha=1.2)
+
+    # El tramo llega después del cambio: no extiende nada ni pisa el estado nuevo
+    assert _apply(chunk, new_run) == ['NO_UPDATE'] * 5
+
+    time_data, phase_data, state, disabled, text = _apply(chunk, old_run)
+    assert time_data == chunk['time'] and phase_data == chunk['phase']
+    assert state == chunk['state'] and disabled is False and text == chunk['text']
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node no está instalado')
+def test_browser_applies_error_chunk():
+    chunk = {'run': '3:abc', 'time': None, 'phase': None, 'state': None, 'text': '⚠️ Error en integración: x'}
+    assert _apply(chunk, '3:abc') == ['NO_UPDATE', 'NO_UPDATE', None, True, chunk['text']]
+    assert _apply(None, '3:abc') == ['NO_UPDATE'] * 5
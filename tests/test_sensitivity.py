@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import sensitivity
+from kernels import log_gompertz, log_logistic, log_richards
+
+
+def _indices(func, bounds, n_samples=2 ** 14, seed=1):
+    a, b, ab = sensitivity.saltelli_sample(bounds, n_samples, seed)
+    return sensitivity.estimate(func(a), func(b), np.stack([func(rows) for rows in ab]))
+
+
+def test_estimate_ishigami():
+    # f = sin x₁ + a sin² x₂ + b x₃⁴ sin x₁ con x uniforme en [-π, π]³: índices
+    # analíticos (Ishigami y Homma, 1990)
+    a, b = 7.0, 0.1
+
+    def ishigami(x):
+        return np.sin(x[:, 0]) + a * np.sin(x[:, 1]) ** 2 + b * x[:, 2] ** 4 * np.sin(x[:, 0])
+
+    variance = a ** 2 / 8 + b * np.pi ** 4 / 5 + b ** 2 * np.pi ** 8 / 18 + 0.5
+    v1 = 0.5 * (1 + b * np.pi ** 4 / 5) ** 2
+    v2 = a ** 2 / 8
+    v13 = b ** 2 * np.pi ** 8 * (1 / 18 - 1 / 50)
+    first, total = _indices(ishigami, [(-np.pi, np.pi)] * 3)
+    np.testing.assert_allclose(first, [v1 / variance, v2 / variance, 0.0], atol=0.03)
+    np.testing.assert_allclose(total, [(v1 + v13) / variance, v2 / variance, v13 / variance], atol=0.03)
+
+
+def test_estimate_additive_linear_model():
+    # y = Σ cᵢ xᵢ, xᵢ uniforme en [0, 1]: sin interacciones, S₁ = S_T = cᵢ² / Σ cⱼ².
+    # La salida tiene un eje extra (como los instantes de t) con la misma forma
+    weights = np.array([1.0, 2.0, 3.0])
+    scales = np.array([1.0, -0.5, 4.0])
+
+    def linear(x):
+        return (x @ weights)[:, None] * scales
+
+    first, total = _indices(linear, [(0.0, 1.0)] * 3)
+    expected = np.repeat((weights ** 2 / (weights ** 2).sum())[:, None], len(scales), axis=1)
+    np.testing.assert_allclose(first, expected, atol=0.02)
+    np.testing.assert_allclose(total, expected, atol=0.02)
+
+
+def test_estimate_without_variance_is_nan():
+    y = np.ones((16, 2))
+    first, total = sensitivity.estimate(y, y, np.stack([y, y]))
+    assert np.isnan(first).all() and np.isnan(total).all()
+
+
+T = np.linspace(0, 60, 31)
+STEP = 1e-5
+
+
+def _log_p(model, values):
+    if model == 'Richards':
+        return log_richards(values['p0'], values['r'], values['k'], values['nu'], T)
+    kernel = log_logistic if model == 'Logístico' else log_gompertz
+    return kernel(values['p0'], values['r'], values['k'], T)
+
+
+@pytest.mark.parametrize('model', sensitivity.SENSITIVITY_MODELS)
+@pytest.mark.parametrize('nominal', [
+    {'p0': 10.0, 'r': 0.15, 'k': 150.0, 'nu': 0.8},
+    {'p0': 300.0, 'r': 0.4, 'k': 150.0, 'nu': 2.5},
+    {'p0': 1e-3, 'r': 1.2, 'k': 1e4, 'nu': 0.05},
+])
+def test_elasticities_match_finite_differences(model, nominal):
+    # E_θ = θ ∂ln P/∂θ ≈ [ln P(θ(1 + h)) - ln P(θ(1 - h))] / 2h
+    log_p, elasticity = sensitivity.elasticities(model, T, **nominal)
+    np.testing.assert_allclose(log_p, _log_p(model, nominal))
+    assert set(elasticity) == set(sensitivity.parameters(model))
+    for name, value in elasticity.items():
+        up = _log_p(model, dict(nominal, **{name: nominal[name] * (1 + STEP)}))
+        down = _log_p(model, dict(nominal, **{name: nominal[name] * (1 - STEP)}))
+        np.testing.assert_allclose(value, (up - down) / (2 * STEP), rtol=1e-5, atol=1e-6, err_msg=name)
+
+
+def test_derivatives_are_scaled_elasticities():
+    nominal = {'p0': 10.0, 'r': 0.15, 'k': 150.0, 'nu': 0.8}
+    p, derivative = sensitivity.derivatives('Richards', T, **nominal)
+    for name, value in derivative.items():
+        step = nominal[name] * STEP
+        up = np.exp(_log_p('Richards', dict(nominal, **{name: nominal[name] + step})))
+        down = np.exp(_log_p('Richards', dict(nominal, **{name: nominal[name] - step})))
+        np.testing.assert_allclose(value, (up - down) / (2 * step), rtol=1e-5, atol=1e-6 * p.max(), err_msg=name)
+
+
+@pytest.fixture
+def broken_pool(monkeypatch):
+    # Un pool real cuyo único proceso murió: el siguiente map lanza BrokenProcessPool
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=context)
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()
+    monkeypatch.setattr(sensitivity, '_pool', pool)
+    monkeypatch.setattr(sensitivity, '_pool_pid', os.getpid())
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def test_evaluate_falls_back_to_serial_on_broken_pool(broken_pool, monkeypatch):
+    monkeypatch.setattr(sensitivity, 'CHUNK_ROWS', 64)
+    a, b, ab = sensitivity.saltelli_sample([(5, 15), (0.1, 0.2), (100, 200)], 256)
+    rows = np.vstack([a, b, ab.reshape(-1, 3)])
+    t = np.linspace(0, 60, 20)
+
+    y = sensitivity.evaluate('Logístico', rows, t, workers=2)
+
+    np.testing.assert_array_equal(y, sensitivity.evaluate('Logístico', rows, t, workers=1))
+    # El pool roto se descarta: el siguiente cálculo crea uno nuevo
+    assert sensitivity._pool is None
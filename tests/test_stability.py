@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from stability import (
+    CENTER, MODELS, NON_HYPERBOLIC, SADDLE, STABLE, STABLE_FOCUS, UNSTABLE, UNSTABLE_FOCUS,
+    analyze, classify, describe, field, numerical_jacobian, stability_map,
+)
+
+
+@pytest.mark.parametrize('jacobian, kind', [
+    ([[-1.0, 0.0], [0.0, -2.0]], STABLE),
+    ([[1.0, 0.0], [0.0, 3.0]], UNSTABLE),
+    ([[1.0, 0.0], [0.0, -1.0]], SADDLE),
+    ([[0.0, 1.0], [-4.0, 0.0]], CENTER),
+    ([[-0.5, 2.0], [-2.0, -0.5]], STABLE_FOCUS),
+    ([[0.5, 2.0], [-2.0, 0.5]], UNSTABLE_FOCUS),
+    ([[0.0, 0.0], [0.0, -1.0]], NON_HYPERBOLIC),
+    ([[0.0, 1.0], [0.0, 0.0]], NON_HYPERBOLIC),
+    ([[-0.3]], STABLE),
+    ([[0.3]], UNSTABLE),
+    ([[0.0]], NON_HYPERBOLIC),
+    # Escalas muy distintas: la tolerancia (1e-9) es relativa al mayor |λ|
+    ([[-1e6, 0.0], [0.0, -1e-2]], STABLE),
+    ([[-1e6, 0.0], [0.0, -1e-4]], NON_HYPERBOLIC),
+    ([[0.0, 1e-6], [-1e-6, 0.0]], CENTER),
+])
+def test_classify_known_jacobians(jacobian, kind):
+    assert classify(np.linalg.eigvals(np.array(jacobian))) == kind
+
+
+def test_classify_broadcasts():
+    eigenvalues = np.array([[[-1, -2], [1, -1]], [[1j, -1j], [2, 3]]], dtype=complex)
+    np.testing.assert_array_equal(classify(eigenvalues), [[STABLE, SADDLE], [CENTER, UNSTABLE]])
+
+
+@pytest.mark.parametrize('model, params, equilibria, kinds', [
+    # Lotka-Volterra: silla en el origen, centro en (γ/δ, α/β)
+    ('lotka_volterra', (1.0, 0.1, 1.5, 0.075), [[0, 0], [20, 10]], [SADDLE, CENTER]),
+    ('lotka_volterra', (2.0, 0.5, 0.3, 0.01), [[0, 0], [30, 4]], [SADDLE, CENTER]),
+    # Logístico y Richards: 0 inestable, K estable
+    ('logistico', (0.15, 150.0), [[0], [150]], [UNSTABLE, STABLE]),
+    ('richards', (0.2, 100.0, 0.8), [[0], [100]], [UNSTABLE, STABLE]),
+    ('gompertz', (0.3, 100.0), [[100]], [STABLE]),
+    ('exponencial', (0.2,), [[0]], [UNSTABLE]),
+    ('exponencial', (-0.2,), [[0]], [STABLE]),
+    # Allee: 0 y K estables, el umbral A inestable
+    ('allee', (0.5, 20.0, 100.0), [[0], [20], [100]], [STABLE, UNSTABLE, STABLE]),
+    # Competencia débil (α₁₂ α₂₁ < 1): coexistencia estable, exclusiones silla
+    ('competencia', (1.0, 100.0, 0.8, 80.0, 0.5, 0.6), [[0, 0], [100, 0], [0, 80], [60 / 0.7, 20 / 0.7]],
+     [UNSTABLE, SADDLE, SADDLE, STABLE]),
+    # Competencia fuerte: coexistencia silla, las dos exclusiones estables
+    ('competencia', (1.0, 100.0, 0.8, 100.0, 2.0, 2.0), [[0, 0], [100, 0], [0, 100], [100 / 3, 100 / 3]],
+     [UNSTABLE, STABLE, STABLE, SADDLE]),
+])
+def test_analyze_known_equilibria(model, params, equilibria, kinds):
+    points, jacobians, eigenvalues, found = analyze(model, params)
+    np.testing.assert_allclose(points, equilibria, rtol=1e-12, atol=1e-12)
+    np.testing.assert_array_equal(found, kinds)
+    # En un equilibrio el campo se anula
+    np.testing.assert_allclose(field(model, points, *params), 0, atol=1e-9)
+
+
+def test_lotka_volterra_center_frequency():
+    # λ = ±i √(αγ) en la coexistencia
+    alpha, beta, gamma, delta = 1.0, 0.1, 1.5, 0.075
+    _, _, eigenvalues, _ = analyze('lotka_volterra', (alpha, beta, gamma, delta))
+    np.testing.assert_allclose(sorted(eigenvalues[1].imag), [-np.sqrt(alpha * gamma), np.sqrt(alpha * gamma)])
+    np.testing.assert_allclose(eigenvalues[1].real, 0, atol=1e-12)
+    np.testing.assert_allclose(sorted(eigenvalues[0].real), [-gamma, alpha])
+
+
+def test_parallel_isoclines_have_no_coexistence():
+    _, _, eigenvalues, kinds = analyze('competencia', (1.0, 100.0, 1.0, 80.0, 1.0, 1.0))
+    assert np.isnan(eigenvalues[3]).all()
+    assert kinds[3] == NON_HYPERBOLIC
+
+
+@pytest.mark.parametrize('model, params, state', [
+    ('lotka_volterra', (1.0, 0.1, 1.5, 0.075), [[40, 9], [5, 30]]),
+    ('competencia', (1.0, 100.0, 0.8, 80.0, 0.5, 0.6), [[10, 15], [120, 3]]),
+    ('logistico', (0.15, 150.0), [[10], [200]]),
+    ('gompertz', (0.3, 100.0), [[10], [200]]),
+    ('richards', (0.2, 100.0, 0.8), [[10], [200]]),
+    ('allee', (0.5, 20.0, 100.0), [[5], [50], [150]]),
+])
+def test_analytic_jacobian_matches_numerical(model, params, state):
+    state = np.array(state, dtype=float)
+    analytic = MODELS[model]['jacobian'](state, *params)
+    numerical = numerical_jacobian(lambda z, *p: field(model, z, *p), state, *params)
+    np.testing.assert_allclose(analytic, numerical, rtol=1e-6, atol=1e-8)
+
+
+def test_stability_map_matches_scalar_analysis():
+    k1, k2 = np.meshgrid([60.0, 100.0, 140.0], [50.0, 80.0])
+    alpha12, alpha21 = 0.9, 1.3
+    _, _, kinds = stability_map('competencia', 3, r1=1.0, k1=k1, r2=0.8, k2=k2, alpha12=alpha12, alpha21=alpha21)
+    assert kinds.shape == k1.shape
+    for index in np.ndindex(k1.shape):
+        expected = analyze('competencia', (1.0, k1[index], 0.8, k2[index], alpha12, alpha21))[3][3]
+        assert kinds[index] == expected
+
+
+def test_describe_lotka_volterra():
+    # Un par complejo conjugado se muestra una sola vez, como a ± bi
+    assert describe('lotka_volterra', (1.0, 0.1, 1.5, 0.075), '(x, y)').splitlines() == [
+        '* **(x, y) = (0, 0):** Equilibrio **punto silla (inestable)** (λ = 1, -1.5).',
+        '* **(x, y) = (20, 10):** Equilibrio **centro (neutro estable)** (λ = 0 ± 1.225i).',
+    ]
+
+
+def test_describe_logistic():
+    assert describe('logistico', (0.15, 150.0), 'P').splitlines() == [
+        '* **P = 0:** Equilibrio **inestable** (λ = 0.15).',
+        '* **P = 150:** Equilibrio **estable** (λ = -0.15).',
+    ]
+
+
+def test_describe_skips_negative_populations():
+    # α₁₂ K₂ > K₁: la coexistencia tendría n₁ < 0 y no se muestra
+    assert describe('competencia', (1.0, 50.0, 0.8, 80.0, 0.9, 0.6), '(n₁, n₂)').splitlines() == [
+        '* **(n₁, n₂) = (0, 0):** Equilibrio **inestable** (λ = 1, 0.8).',
+        '* **(n₁, n₂) = (50, 0):** Equilibrio **punto silla (inestable)** (λ = -1, 0.5).',
+        '* **(n₁, n₂) = (0, 80):** Equilibrio **estable** (λ = -0.8, -0.44).',
+    ]
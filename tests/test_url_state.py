@@ -0,0 +1,130 @@
+import json
+from urllib.parse import parse_qsl
+
+import pytest
+from dash import dcc, html
+
+import url_state
+
+LOGISTIC = '/figure/04-logistico'
+CANONICAL = 'p0=10&r=0.15&K=150&t_max=60&t=20'
+
+
+@pytest.fixture(scope='module')
+def client():
+    import app
+
+    return app.server.test_client()
+
+
+def test_figure_canonical(client):
+    response = client.get(f'{LOGISTIC}?{CANONICAL}')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert response.headers['Cache-Control'] == url_state.FIGURE_CACHE
+    assert response.headers['ETag']
+    figure = json.loads(response.data)
+    assert figure['data'] and figure['layout']['yaxis']['title']['text'] == 'Población (P)'
+
+
+def test_figure_not_modified(client):
+    etag = client.get(f'{LOGISTIC}?{CANONICAL}').headers['ETag']
+    response = client.get(f'{LOGISTIC}?{CANONICAL}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert not response.data
+    assert response.headers['ETag'] == etag
+
+    other = client.get(f'{LOGISTIC}?{CANONICAL}', headers={'If-None-Match': '"otra"'})
+    assert other.status_code == 200
+
+
+@pytest.mark.parametrize('query, location', [
+    # Otro orden, parámetros que faltan (toman el valor del layout), decimales
+    # superfluos y casillas desconocidas o repetidas redirigen a la URL canónica
+    ('r=0.15&p0=10&K=150&t_max=60&t=20', CANONICAL),
+    ('', CANONICAL),
+    ('p0=10.0&r=0.15&K=150&t_max=60&t=20', CANONICAL),
+    (f'{CANONICAL}&scale=', CANONICAL),
+    (f'{CANONICAL}&scale=log,otra,log', f'{CANONICAL}&scale=log'),
+])
+def test_figure_redirects_to_canonical(client, query, location):
+    response = client.get(f'{LOGISTIC}?{query}')
+    assert response.status_code == 308
+    assert response.headers['Location'] == f'{LOGISTIC}?{location}'
+    assert response.headers['Cache-Control'] == url_state.FIGURE_CACHE
+    assert client.get(response.headers['Location']).status_code == 200
+
+
+def test_figure_with_checklist(client):
+    response = client.get(f'{LOGISTIC}?{CANONICAL}&scale=log')
+    assert response.status_code == 200
+    assert json.loads(response.data)['layout']['yaxis']['title']['text'] == 'log₁₀ Población'
+
+
+@pytest.mark.parametrize('query', ['p0=abc', 'p0=0', 'p0=inf', 'r=nan'])
+def test_figure_rejects_invalid_values(client, query):
+    # Los mismos límites que el formulario: p0 ≥ 1, r ≥ 0.01
+    assert client.get(f'{LOGISTIC}?{query}').status_code == 400
+
+
+def test_figure_unprocessable_when_callback_declines(client):
+    # El callback de Allee devuelve no_update con A ≥ K
+    response = client.get('/figure/11-modelo-allee?n0=25&r=0.5&A=200&K=100&t_max=40')
+    assert response.status_code == 422
+    assert 'umbral A' in response.get_data(as_text=True)
+    assert 'ETag' not in response.headers
+
+
+def test_figure_unknown_page(client):
+    assert client.get('/figure/no-existe').status_code == 404
+
+
+# Casillas con valor por defecto no vacío: ninguna página tiene una todavía
+
+def _layout():
+    return html.Div([
+        dcc.Input(id='n-input', type='number', value=3, min=1),
+        dcc.Checklist(id='scale-input', options=[{'label': 'log', 'value': 'log'}, {'label': 'rejilla', 'value': 'grid'}],
+                      value=['log']),
+    ])
+
+
+@pytest.fixture
+def state():
+    state = url_state.UrlState('tests.casillas', {'n': 'n-input', 'scale': 'scale-input'}, None)
+    state.apply(_layout(), {})
+    return state
+
+
+def _by_id(tree):
+    return {getattr(component, 'id', None): component for component in tree._traverse()}
+
+
+def test_checklist_default_when_param_is_omitted(state):
+    assert state.parse({}) == {'n': 3, 'scale': ['log']}
+    tree = state.apply(_layout(), {'n': '5'})
+    assert _by_id(tree)['scale-input'].value == ['log']
+    assert _by_id(tree)['n-input'].value == 5
+    # Sin ninguna marcada, explícitamente
+    assert state.parse({'scale': ''})['scale'] == []
+
+
+@pytest.mark.parametrize('scale, query', [
+    (['log'], 'n=3'),
+    ([], 'n=3&scale='),
+    (['grid'], 'n=3&scale=grid'),
+    (['log', 'grid'], 'n=3&scale=log%2Cgrid'),
+])
+def test_checklist_round_trip(state, scale, query):
+    assert state.canonical_query({'n': 3, 'scale': scale}) == query
+    parsed = state.parse(dict(parse_qsl(query, keep_blank_values=True)))
+    assert parsed == {'n': 3, 'scale': scale}
+
+
+def test_checklist_order_follows_options(state):
+    assert state.parse({'scale': 'grid,log'})['scale'] == ['log', 'grid']
+
+
+def test_layout_carries_checklist_defaults(state):
+    tree = state.apply(_layout(), {})
+    assert _by_id(tree)[state.checklists_id].data == {'scale': {'default': ['log'], 'options': ['log', 'grid']}}
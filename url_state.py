@@ -0,0 +1,194 @@
+import hashlib
+import json
+import math
+from urllib.parse import urlencode
+
+import dash
+from dash import Input, Output, State, clientside_callback, dcc, html
+from flask import Response, abort, redirect, request
+
+# Estado de cada página en la URL. Cada página registra qué parámetros de la
+# query corresponden a qué componentes:
+#
+#     URL_STATE = register(__name__, {'p0': 'log-initial-pop-input', 'r': ...},
+#                          figure=lambda v: update_logistic_graph(v['p0'], ...))
+#
+# y envuelve su layout con URL_STATE.apply(tree, kwargs). Así:
+#
+# * /04-logistico?p0=10&r=0.15&K=150 abre la página con esos valores (los que
+#   falten toman el valor por defecto del layout);
+# * un callback en el navegador mantiene la URL al día con history.replaceState
+#   sin volver a renderizar la página;
+# * GET /figure/04-logistico?p0=10&... devuelve el JSON de la figura principal,
+#   con ETag y Cache-Control para que un proxy o el navegador la sirvan sin
+#   pasar por Python.
+#
+# Las casillas (Checklist) se escriben como sus valores separados por comas, en
+# el orden de las opciones, y se omiten si coinciden con las del layout; si no
+# hay ninguna marcada y el layout sí marca alguna, quedan como `clave=`. Un
+# parámetro ausente siempre es el valor por defecto. La URL canónica tiene los
+# parámetros en el orden del registro; las demás redirigen a ella para que
+# cada estado tenga una sola entrada en la caché.
+
+FIGURE_CACHE = 'public, max-age=3600, stale-while-revalidate=86400'
+
+_states = {}
+
+SYNC_URL = """
+function(...values) {
+    const keys = %s;
+    const checklists = values.pop() || {};
+    const params = new URLSearchParams();
+    keys.forEach((key, i) => {
+        const value = values[i];
+        if (value === null || value === undefined || value === '') return;
+        if (Array.isArray(value)) {
+            const checklist = checklists[key] || {default: [], options: value};
+            const same = value.length === checklist.default.length && value.every(v => checklist.default.includes(v));
+            if (!same) params.set(key, checklist.options.filter(v => value.includes(v)).join(','));
+        } else {
+            params.set(key, value);
+        }
+    });
+    const query = params.toString();
+    const url = window.location.pathname + (query ? '?' + query : '');
+    if (url !== window.location.pathname + window.location.search) {
+        window.history.replaceState(window.history.state, '', url);
+    }
+    return query;
+}
+"""
+
+
+def _format(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+class UrlState:
+    def __init__(self, module, fields, figure):
+        self.module = module
+        self.fields = fields
+        self.figure = figure
+        self.store_id = module.split('.')[-1].replace('_', '-') + '-url-state'
+        self.checklists_id = self.store_id + '-checklists'
+        self._defaults = None
+
+    @property
+    def path(self):
+        return dash.page_registry[self.module]['path']
+
+    def _snapshot(self, tree):
+        # Tipo, valor por defecto y opciones de cada campo, tomados del layout
+        # sin modificar
+        by_id = {getattr(component, 'id', None): component for component in tree._traverse()}
+        defaults = {}
+        for key, component_id in self.fields.items():
+            component = by_id[component_id]
+            if isinstance(component, dcc.Checklist):
+                defaults[key] = ('options', component.value, [option['value'] for option in component.options])
+            elif getattr(component, 'type', None) == 'number':
+                bounds = (getattr(component, 'min', None), getattr(component, 'max', None))
+                defaults[key] = ('number', component.value, bounds)
+            else:
+                defaults[key] = ('text', component.value, None)
+        return defaults
+
+    def defaults(self):
+        if self._defaults is None:
+            dash.page_registry[self.module]['layout']()
+        return self._defaults
+
+    def parse(self, query, strict=False):
+        values = {}
+        for key, (kind, default, extra) in self.defaults().items():
+            raw = query.get(key)
+            if kind == 'options':
+                selected = (default or []) if raw is None else raw.split(',')
+                values[key] = [value for value in extra if value in selected]
+            elif raw is None or raw == '':
+                values[key] = default
+            elif kind == 'number':
+                low, high = extra
+                try:
+                    number = float(raw)
+                    if not math.isfinite(number) or (low is not None and number < low) or (high is not None and number > high):
+                        raise ValueError
+                except ValueError:
+                    # Mismos límites que el formulario (min/max del dcc.Input)
+                    if strict:
+                        abort(400, f'Valor no válido: {key}={raw}')
+                    number = float(default)
+                values[key] = int(number) if number.is_integer() else number
+            else:
+                values[key] = raw
+        return values
+
+    def canonical_query(self, values):
+        defaults = self.defaults()
+        items = []
+        for key, value in values.items():
+            if isinstance(value, list):
+                kind, default, extra = defaults[key]
+                if set(value) != set(default or []):
+                    items.append((key, ','.join(value)))
+            elif value is not None:
+                items.append((key, _format(value)))
+        return urlencode(items)
+
+    def apply(self, tree, query):
+        if self._defaults is None:
+            self._defaults = self._snapshot(tree)
+        values = self.parse(query)
+        by_id = {getattr(component, 'id', None): component for component in tree._traverse()}
+        for key, component_id in self.fields.items():
+            by_id[component_id].value = values[key]
+        # Para el callback del navegador: casillas del layout y orden de las opciones
+        checklists = {
+            key: {'default': list(default or []), 'options': extra}
+            for key, (kind, default, extra) in self._defaults.items() if kind == 'options'
+        }
+        return html.Div([tree, dcc.Store(id=self.store_id), dcc.Store(id=self.checklists_id, data=checklists)])
+
+
+def register(module, fields, figure):
+    state = _states[module] = UrlState(module, fields, figure)
+    clientside_callback(
+        SYNC_URL % json.dumps(list(fields)),
+        Output(state.store_id, 'data'),
+        [Input(component_id, 'value') for component_id in fields.values()],
+        State(state.checklists_id, 'data'),
+    )
+    return state
+
+
+def _figure(page):
+    state = next((state for state in _states.values() if state.path == '/' + page), None)
+    if state is None or state.figure is None:
+        abort(404)
+
+    values = state.parse(request.args, strict=True)
+    query = state.canonical_query(values)
+    if request.query_string.decode() != query:
+        response = redirect(f'{request.path}?{query}', code=308)
+        response.headers['Cache-Control'] = FIGURE_CACHE
+        return response
+
+    result = state.figure(values)
+    figure, *rest = result if isinstance(result, (tuple, list)) else (result,)
+    if figure is dash.no_update:
+        # El mensaje de la página es la primera salida de texto no vacía
+        message = next((item for item in rest if isinstance(item, str) and item), 'Parámetros no válidos')
+        abort(422, message)
+
+    body = figure.to_json().encode()
+    response = Response(body, mimetype='application/json')
+    response.set_etag(hashlib.sha256(body).hexdigest()[:32])
+    response.headers['Cache-Control'] = FIGURE_CACHE
+    return response.make_conditional(request)
+
+
+def routes(server):
+    server.add_url_rule('/figure/<path:page>', 'figure', _figure)
+    return server